@@ -1,15 +1,63 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from routes import api
+from services.dictionary import DictionaryService
+from services.metrics import REGISTRY, REQUEST_SECONDS, profile_report, profile_request
+from services.storage import DEFAULT_DATA_DIR, create_storage
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
 import sys
+import time
+
+# THAIDICT_WORKERS > 1 runs that many worker processes over the same data directory.
+# When starting uvicorn yourself with --workers, set it to the same number.
+workers = int(os.getenv("THAIDICT_WORKERS", "1"))
+shared_storage = workers > 1
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create one dictionary service shared by every request for the app's lifetime."""
+    # THAIDICT_STORAGE selects json (default), journal, snapshot or sqlite storage under backend/data
+    data_dir = os.getenv("THAIDICT_DATA_DIR", DEFAULT_DATA_DIR)
+    # THAIDICT_PERSISTENCE selects sync (default), debounced or on-shutdown writes
+    persistence = os.getenv("THAIDICT_PERSISTENCE", "sync")
+    storage_kind = os.getenv("THAIDICT_STORAGE", "json")
+    if shared_storage and persistence != "sync":
+        print(f"THAIDICT_WORKERS={workers}: using sync persistence instead of {persistence}")
+        persistence = "sync"
+    if storage_kind == "sqlite" and persistence != "sync":
+        # The database is the dictionary; each change is written as it is made
+        print(f"THAIDICT_STORAGE=sqlite: using sync persistence instead of {persistence}")
+        persistence = "sync"
+    if shared_storage and storage_kind == "json":
+        # Without a journal or database there are no per-word changes to pass on
+        print(f"THAIDICT_WORKERS={workers}: every write reloads the whole dictionary in the "
+              "other workers; THAIDICT_STORAGE=journal, snapshot or sqlite avoids that")
+    app.state.dictionary = DictionaryService(
+        storage=create_storage(
+            storage_kind,
+            data_dir,
+            fsync=os.getenv("THAIDICT_FSYNC", "0") == "1"
+        ),
+        persistence=persistence,
+        flush_interval_ms=int(os.getenv("THAIDICT_FLUSH_INTERVAL_MS", "1000")),
+        flush_max_dirty=int(os.getenv("THAIDICT_FLUSH_MAX_DIRTY", "100")),
+        shared=shared_storage
+    )
+    app.state.dictionary.start_writer()
+    REGISTRY.add_collector(app.state.dictionary.metric_samples)
+    yield
+    REGISTRY.remove_collector(app.state.dictionary.metric_samples)
+    app.state.dictionary.close()
 
 app = FastAPI(
     title="Spelling Checker API",
     description="API สำหรับตรวจสอบการแปลคำศัพท์ภาษาอังกฤษเป็นภาษาไทย",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Get the absolute path for static files
@@ -38,8 +86,72 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
 )
 
+# THAIDICT_PROFILING=1 lets any request add ?profile=1 to get a cProfile report instead of its response
+profiling_enabled = os.getenv("THAIDICT_PROFILING", "0") == "1"
+
+class MeasureRequests:
+    """
+    Record request latency per route template and serve ?profile=1 reports.
+
+    A plain ASGI middleware rather than @app.middleware("http"): that one
+    reads from the client while the response streams, which takes upload
+    chunks away from routes that answer while still reading the request
+    body, like /words/import?progress=true.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        def observe() -> None:
+            # The template, not the raw path, so /words/{english_word} is one series
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code)
+            )
+
+        if profiling_enabled and Request(scope).query_params.get("profile") == "1":
+            async def discard(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+
+            # The whole response, streamed body included, is produced inside the profile
+            with profile_request() as profiles:
+                await self.app(scope, receive, discard)
+            observe()
+            report = PlainTextResponse(
+                profile_report(profiles),
+                headers={"X-Profiled-Status": str(status_code)}
+            )
+            await report(scope, receive, send)
+            return
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            # Stop the clock once the last chunk is sent, not when the headers are ready
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        await self.app(scope, receive, send_timed)
+
+app.add_middleware(MeasureRequests)
+
 # Include API routers
 app.include_router(
     api.router,
@@ -47,6 +159,11 @@ app.include_router(
     tags=["dictionary"]
 )
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose request latencies, operation timings and dictionary counters for Prometheus."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 # Serve React app's index.html for all non-API routes
 @app.get("/{full_path:path}")
 async def serve_frontend(full_path: str):
@@ -91,9 +208,11 @@ if __name__ == "__main__":
             reload=False
         )
     else:
+        # Auto-reload only supports a single worker
         uvicorn.run(
             "main:app",
             host="0.0.0.0",
             port=8000,
-            reload=True
+            reload=workers == 1,
+            workers=workers
         )
\ No newline at end of file
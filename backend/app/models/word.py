@@ -1,5 +1,6 @@
 import re
-from pydantic import BaseModel, validator
+from typing import Dict, Iterable, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, validator
 
 class Word(BaseModel):
     """
@@ -82,4 +83,199 @@ class Word(BaseModel):
                 # Normalize internal spaces if category is not empty
                 return ' '.join(v.split())
             return None
-        return v
\ No newline at end of file
+        return v
+
+class WordRecord:
+    """
+    Lightweight read-only view of a stored word.
+    
+    Stored entries were validated by Word when they were added, so the
+    service hands out these instead of re-running the Word validators for
+    every entry of a list response. Routes turn them into JSON with
+    to_dict().
+    
+    Attributes:
+        english: Normalized English key
+        thai: Thai translation
+        category: Category, or None
+    """
+    __slots__ = ("english", "thai", "category")
+
+    def __init__(self, english: str, thai: str, category: Optional[str] = None):
+        self.english = english
+        self.thai = thai
+        self.category = category
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Serialize the record for a response.
+        
+        Args:
+            fields: Optional subset of english, thai and category to include
+            
+        Returns:
+            Dict in the same shape as Word.model_dump()
+        """
+        if fields is None:
+            return {"english": self.english, "thai": self.thai, "category": self.category}
+        return {field: getattr(self, field) for field in ("english", "thai", "category") if field in fields}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WordRecord):
+            return NotImplemented
+        return (self.english, self.thai, self.category) == (other.english, other.thai, other.category)
+
+    def __repr__(self) -> str:
+        return f"WordRecord(english={self.english!r}, thai={self.thai!r}, category={self.category!r})"
+
+
+class BulkImportResult(BaseModel):
+    """
+    Outcome of importing a batch of words.
+    
+    Attributes:
+        added: Number of new words written
+        updated: Number of existing words overwritten
+        skipped: Number of input words that were not written
+        skipped_words: Normalized English keys of the skipped input words
+        conflicts: Normalized English keys that already existed or were repeated in the batch
+    """
+    added: int = 0
+    updated: int = 0
+    skipped: int = 0
+    skipped_words: List[str] = []
+    conflicts: List[str] = []
+
+
+class WordPage(BaseModel):
+    """
+    One page of words ordered by normalized English key.
+    
+    Attributes:
+        items: Words on this page
+        total: Number of words matching the query across all pages
+        next_cursor: English key to pass as cursor for the next page, or None on the last page
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    items: List[WordRecord]
+    total: int
+    next_cursor: str | None = None
+
+
+class CategoryCount(BaseModel):
+    """
+    A category and how many words it holds.
+    
+    Attributes:
+        category: Category name
+        count: Number of words in the category
+    """
+    category: str
+    count: int
+
+
+class FuzzyMatch(Word):
+    """
+    A word found by approximate matching.
+    
+    Attributes:
+        distance: Edit distance between the query and the matched English word or Thai translation
+    """
+    distance: int
+
+
+class WordChange(BaseModel):
+    """
+    One change in the dictionary's change feed.
+    
+    Attributes:
+        version: Dictionary version right after the change
+        op: 'put' for an added or updated word, 'delete' for a removed one
+        english: Normalized English word
+        thai: New Thai translation, for 'put'
+        category: New category, for 'put'
+    """
+    version: int
+    op: Literal["put", "delete"]
+    english: str
+    thai: str | None = None
+    category: str | None = None
+
+
+class ChangeFeed(BaseModel):
+    """
+    Changes since a version the client already has.
+    
+    Attributes:
+        version: Current dictionary version; pass it as since next time
+        reset: True if the changes are no longer available and every word must be reloaded
+        changes: Changes in the order they were made
+    """
+    version: int
+    reset: bool
+    changes: List[WordChange]
+
+
+class QuizQuestion(BaseModel):
+    """
+    One multiple-choice quiz question, without its answer.
+    
+    Answers are graded with /check-translation/batch: for en-th send english
+    with the chosen Thai text, for th-en the chosen English word with prompt.
+    
+    Attributes:
+        english: English word the question is about for en-th; None for th-en,
+            where it is the answer
+        category: Category of the word, or None
+        prompt: Text shown to the player (English for en-th, Thai for th-en)
+        choices: Possible answers in random order, including the correct one
+    """
+    english: str | None = None
+    category: str | None = None
+    prompt: str
+    choices: List[str]
+
+
+class TranslationAnswer(BaseModel):
+    """
+    One answer to grade.
+    
+    Attributes:
+        english_word: English word that was asked
+        thai_translation: Translation given by the player
+    """
+    english_word: str
+    thai_translation: str
+
+
+class TranslationCheck(BaseModel):
+    """
+    Grading result of one answer.
+    
+    Attributes:
+        english_word: English word that was asked
+        thai_translation: Translation given by the player
+        is_correct: Whether the translation is accepted
+        message: Feedback for the player, as returned by /check-translation/
+    """
+    english_word: str
+    thai_translation: str
+    is_correct: bool
+    message: str
+
+
+class TranslationCheckBatch(BaseModel):
+    """
+    Grading result of a whole quiz session.
+    
+    Attributes:
+        results: One result per answer, in request order
+        correct: Number of accepted answers
+        total: Number of answers
+        score: Percentage of accepted answers, 0 for an empty batch
+    """
+    results: List[TranslationCheck]
+    correct: int
+    total: int
+    score: float
@@ -1,75 +1,397 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel
-from typing import List, Dict
-from models.word import Word
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+from typing import Any, AsyncIterator, Callable, Coroutine, List, Dict, Literal, Optional, Set
+import asyncio
+import json
+from models.word import (
+    Word, WordRecord, BulkImportResult, CategoryCount, ChangeFeed, FuzzyMatch, QuizQuestion,
+    TranslationAnswer, TranslationCheckBatch
+)
 from services.dictionary import DictionaryService
+from services.exporter import EXPORT_FORMATS
+from services.fuzzy import MAX_DISTANCE
+from services.importer import iter_lines, parse_csv_row, parse_ndjson_row
+from services.metrics import profile_coroutine, profile_iterator
 
-router = APIRouter()
+class ProfiledRoute(APIRoute):
+    """Route whose handler, including request parsing and serialization, is profiled with ?profile=1."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            response = await profile_coroutine(handler(request))
+            if isinstance(response, StreamingResponse):
+                # The body is produced after the handler returns
+                response.body_iterator = profile_iterator(response.body_iterator)
+            return response
+        return profiled_handler
+
+router = APIRouter(route_class=ProfiledRoute)
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body is produced while the request body is still being read.
+
+    StreamingResponse listens for a disconnect by reading from the client,
+    which would take request body messages away from the generator; here
+    the generator reads them all and sees a disconnect itself.
+    """
+
+    async def listen_for_disconnect(self, receive) -> None:
+        # Cancelled once the body has been sent
+        await asyncio.Event().wait()
 
 class WordImport(BaseModel):
     words: List[Word]
 
+class BulkImportResponse(BulkImportResult):
+    message: str
+
+class TranslationCheckRequest(BaseModel):
+    answers: List[TranslationAnswer] = Field(..., max_length=1000)
+    lenient: bool = False
+
+class StreamImportResponse(BaseModel):
+    message: str
+    rows: int
+    added: int
+    updated: int
+    skipped: int
+    invalid: int
+    chunks: int
+    errors: List[str]
+
+# Page size used when a cursor is given without a limit, and the largest allowed limit
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+WORD_FIELDS = {"english", "thai", "category"}
+
+# Only the first few row errors are reported back so the response stays small
+MAX_IMPORT_ERRORS = 100
+UTF8_REQUIRED = "ไฟล์ต้องเข้ารหัสแบบ UTF-8"
+
 # Dependency
-def get_dictionary_service():
-    return DictionaryService()
+def get_dictionary_service(request: Request) -> DictionaryService:
+    """Return the app-wide dictionary service created in the lifespan hook."""
+    return request.app.state.dictionary
 
 @router.post("/words/", response_model=Dict[str, str])
 async def add_word(word: Word, dictionary: DictionaryService = Depends(get_dictionary_service)):
     """Add a new word to the dictionary."""
     try:
-        dictionary.add_word(word)
+        await dictionary.write_async(dictionary.add_word, word)
         return {"message": f"เพิ่มคำว่า '{word.english}' เรียบร้อยแล้ว"}
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/words/", response_model=List[Word])
-async def get_all_words(dictionary: DictionaryService = Depends(get_dictionary_service)):
-    """Get all words from the dictionary."""
-    return dictionary.get_all_words()
+def _encode_records(words: List[WordRecord], fields: Optional[Set[str]] = None) -> bytes:
+    """Encode stored words as a JSON array, the same way JSONResponse would."""
+    return json.dumps(
+        [word.to_dict(fields) for word in words],
+        ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+def _records_response(words: List[WordRecord], fields: Optional[Set[str]] = None) -> Response:
+    """
+    Serialize stored words directly, skipping response_model validation.
+    
+    The words were validated when they were added, so checking every entry
+    again against Word would only cost time on large lists.
+    """
+    return Response(_encode_records(words, fields), media_type="application/json")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists the given ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+async def _list_words(
+    request: Request,
+    dictionary: DictionaryService,
+    kind: str,
+    get_all: Callable[[], List[WordRecord]],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    options: Optional[Dict[str, str]] = None,
+    **filters
+) -> Response:
+    """
+    Build a word list response, paginated when limit or cursor is given.
+    
+    Without limit or cursor every matching word is returned in dictionary
+    order, as before. Otherwise one page ordered by English word is returned.
+    The total count is sent in X-Total-Count and the next page's cursor,
+    if any, in X-Next-Cursor.
+    
+    The dictionary version is sent as ETag. A request whose If-None-Match
+    still holds the current version gets 304 without a body. Encoded
+    bodies are kept in the service's response cache under kind plus every
+    parameter that shapes the response (filters, options, page and fields).
+    """
+    selected: Optional[Set[str]] = None
+    if fields is not None:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+        if not selected or not selected <= WORD_FIELDS:
+            raise HTTPException(status_code=400, detail="fields ต้องเป็น english, thai หรือ category")
+    
+    # Read through the service so changes made to the file by others are seen first
+    etag = f'"{await dictionary.read_async(dictionary.get_version)}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    def build():
+        if limit is None and cursor is None:
+            words = get_all()
+            headers = {"X-Total-Count": str(len(words))}
+        else:
+            page = dictionary.query_words(limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, **filters)
+            words = page.items
+            headers = {"X-Total-Count": str(page.total)}
+            if page.next_cursor is not None:
+                headers["X-Next-Cursor"] = page.next_cursor
+        return _encode_records(words, selected), headers
+    
+    query = {
+        **filters, **(options or {}),
+        "limit": limit, "cursor": cursor,
+        "fields": tuple(sorted(selected)) if selected else None
+    }
+    version, (body, headers) = await dictionary.read_async(dictionary.cached_response, kind, query, build)
+    return Response(body, media_type="application/json", headers={**headers, "ETag": f'"{version}"'})
+
+@router.get("/words/", response_model=List[Dict[str, Optional[str]]])
+async def get_all_words(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination ordered by English word"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: english,thai,category"),
+    sort: Optional[Literal["english", "thai", "category"]] = Query(None, description="Return every word sorted by this field"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Get all words from the dictionary, or one page of them."""
+    if sort is None:
+        return await _list_words(request, dictionary, "words", dictionary.get_all_words, limit, cursor, fields)
+    if limit is not None or cursor is not None:
+        raise HTTPException(status_code=400, detail="sort ใช้ร่วมกับ limit หรือ cursor ไม่ได้")
+    return await _list_words(
+        request, dictionary, "sorted", lambda: dictionary.sort_words(sort, order), None, None, fields,
+        options={"sort": sort, "order": order}
+    )
 
-@router.post("/words/bulk", response_model=Dict[str, str])
+@router.post("/words/bulk", response_model=BulkImportResponse)
 async def import_words(
     data: WordImport,
+    on_conflict: Literal["skip", "overwrite", "fail"] = Query("skip", description="How to handle words that already exist"),
     dictionary: DictionaryService = Depends(get_dictionary_service)
 ):
-    """Import multiple words at once."""
+    """Import multiple words at once, saving the dictionary a single time."""
     try:
-        added = 0
-        skipped = 0
-        
-        for word in data.words:
-            try:
-                dictionary.add_word(word)
-                added += 1
-            except ValueError:
-                skipped += 1
-                continue
-        
-        return {
-            "message": f"นำเข้าข้อมูลสำเร็จ {added} คำ (ข้ามไป {skipped} คำที่มีอยู่แล้ว)"
-        }
+        result = await dictionary.write_async(dictionary.add_words_bulk, data.words, on_conflict)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    return BulkImportResponse(
+        message=f"นำเข้าข้อมูลสำเร็จ {result.added + result.updated} คำ (ข้ามไป {result.skipped} คำที่มีอยู่แล้ว)",
+        **result.model_dump()
+    )
+
+@router.post("/words/import", response_model=StreamImportResponse)
+async def stream_import_words(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Body format: NDJSON objects or english,thai,category CSV"),
+    on_conflict: Literal["skip", "overwrite"] = Query("skip", description="How to handle words that already exist"),
+    chunk_size: int = Query(1000, ge=1, le=50000, description="Number of rows saved per commit"),
+    progress: bool = Query(False, description="Stream the running totals as NDJSON after every commit"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """
+    Import words from a streamed request body, committing every chunk_size rows.
+    
+    With progress=true the response is NDJSON: one line with the running
+    totals after each committed chunk, then the final summary. An error
+    found after the response has started is sent as a last line with a
+    detail field instead of a status code.
+    """
+    parse_row = parse_csv_row if format == "csv" else parse_ndjson_row
+    result = StreamImportResponse(
+        message="", rows=0, added=0, updated=0, skipped=0, invalid=0, chunks=0, errors=[]
+    )
+    chunk: List[Word] = []
+    
+    async def commit():
+        committed = await dictionary.write_async(dictionary.add_words_bulk, list(chunk), on_conflict)
+        result.added += committed.added
+        result.updated += committed.updated
+        result.skipped += committed.skipped
+        result.chunks += 1
+        result.message = f"กำลังนำเข้าข้อมูล ({result.rows} บรรทัด)"
+        chunk.clear()
+    
+    async def import_chunks() -> AsyncIterator[StreamImportResponse]:
+        """Import the body, yielding the totals after every commit and finally the summary."""
+        line_number = 0
+        async for line in iter_lines(request.stream()):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                word = parse_row(line)
+            except ValueError as e:
+                result.invalid += 1
+                if len(result.errors) < MAX_IMPORT_ERRORS:
+                    result.errors.append(f"บรรทัด {line_number}: {e}")
+                continue
+            if word is None:  # CSV header
+                continue
+            result.rows += 1
+            chunk.append(word)
+            if len(chunk) >= chunk_size:
+                await commit()
+                yield result
+        if chunk:
+            await commit()
+            yield result
+        result.message = (
+            f"นำเข้าข้อมูลสำเร็จ {result.added + result.updated} คำ "
+            f"(ข้ามไป {result.skipped} คำที่มีอยู่แล้ว, ข้อมูลไม่ถูกต้อง {result.invalid} บรรทัด)"
+        )
+        yield result
+    
+    if progress:
+        async def generate() -> AsyncIterator[bytes]:
+            try:
+                async for totals in import_chunks():
+                    yield totals.model_dump_json().encode("utf-8") + b"\n"
+            except UnicodeDecodeError:
+                yield json.dumps({"detail": UTF8_REQUIRED}, ensure_ascii=False).encode("utf-8") + b"\n"
+        return UploadStreamingResponse(generate(), media_type="application/x-ndjson")
+    
+    try:
+        async for _ in import_chunks():
+            pass
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail=UTF8_REQUIRED)
+    return result
 
-@router.get("/words/search", response_model=List[Word])
+# Fixed /words/... paths must be declared before /words/{english_word}, which
+# would otherwise take "search", "suggest", "fuzzy", "changes" or "export" as a word
+@router.get("/words/search", response_model=List[Dict[str, Optional[str]]])
 async def search_words(
+    request: Request,
     term: str = Query(..., description="Search term for filtering words"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination ordered by English word"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: english,thai,category"),
+    k: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Return only the k most relevant words, best first"),
     dictionary: DictionaryService = Depends(get_dictionary_service)
 ):
     """
     Search words by term. Matches partial words in english, thai, and category fields.
     """
+    if k is not None:
+        if limit is not None or cursor is not None:
+            raise HTTPException(status_code=400, detail="k ใช้ร่วมกับ limit หรือ cursor ไม่ได้")
+        return await _list_words(
+            request, dictionary, "search_ranked", lambda: dictionary.search_ranked(term, k),
+            None, None, fields, options={"k": k}, term=term
+        )
     try:
-        return dictionary.search_words(term)
+        return await _list_words(
+            request, dictionary, "search", lambda: dictionary.search_words(term),
+            limit, cursor, fields, term=term
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/words/suggest", response_model=List[Word])
+async def suggest_words(
+    prefix: str = Query(..., min_length=1, description="Beginning of an English word or Thai translation"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of suggestions"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Suggest words for type-ahead by English or Thai prefix."""
+    return _records_response(await dictionary.read_async(dictionary.suggest_words, prefix, limit))
+
+@router.get("/words/fuzzy", response_model=List[FuzzyMatch])
+async def fuzzy_words(
+    term: str = Query(..., min_length=1, description="Possibly misspelled word"),
+    max_distance: int = Query(2, ge=0, le=MAX_DISTANCE, description="Largest number of typos to tolerate"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of candidates"),
+    include_thai: bool = Query(True, description="Also match against Thai translations"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Suggest "did you mean" candidates for a misspelled word."""
+    try:
+        return await dictionary.read_async(dictionary.fuzzy_words, term, max_distance, limit, include_thai)
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail="กำลังสร้างดัชนีใหม่ กรุณาลองอีกครั้ง")
+
+@router.get("/words/changes", response_model=ChangeFeed)
+async def get_changes(
+    since: int = Query(..., description="Dictionary version the client last saw (the ETag or a previous feed's version)"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Get the changes made since a version, so clients can sync without reloading every word."""
+    return await dictionary.read_async(dictionary.changes_since, since)
+
+@router.get("/words/export")
+async def export_words(
+    format: Literal["csv", "ndjson", "json"] = Query("csv", description="Download format"),
+    category: Optional[str] = Query(None, description="Only export words in this category"),
+    chunk_size: int = Query(1000, ge=1, le=50000, description="Number of words read and encoded at a time"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """
+    Download the dictionary ordered by English word, streamed chunk by chunk.
+
+    Words are read with a key cursor and encoded straight from storage, so
+    memory use does not grow with the dictionary and the first bytes are
+    sent right away. The CSV and NDJSON output can be fed back to /words/import.
+    """
+    export_format = EXPORT_FORMATS[format]
+
+    async def generate() -> AsyncIterator[bytes]:
+        if export_format.header:
+            yield export_format.header.encode("utf-8")
+        cursor = None
+        started = False
+        while True:
+            rows, cursor = await dictionary.read_async(dictionary.export_chunk, cursor, chunk_size, category)
+            if rows:
+                encoded = export_format.encode(rows)
+                if started:
+                    encoded = export_format.separator + encoded
+                started = True
+                yield encoded.encode("utf-8")
+            if cursor is None:
+                break
+        if export_format.footer:
+            yield export_format.footer.encode("utf-8")
+
+    return StreamingResponse(
+        generate(),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="dictionary.{export_format.extension}"'}
+    )
+
 @router.get("/words/{english_word}", response_model=Word)
 async def get_word(english_word: str, dictionary: DictionaryService = Depends(get_dictionary_service)):
     """Get a specific word from the dictionary."""
-    word = dictionary.get_word(english_word)
+    word = await dictionary.read_async(dictionary.get_word, english_word)
     if not word:
         raise HTTPException(status_code=404, detail="ไม่พบคำศัพท์นี้")
     return word
@@ -78,12 +400,18 @@ async def get_word(english_word: str, dictionary: DictionaryService = Depends(ge
 async def check_translation(english_word: str, thai_translation: str, 
                           dictionary: DictionaryService = Depends(get_dictionary_service)):
     """Check if the Thai translation is correct."""
-    is_correct, message = dictionary.check_translation(english_word, thai_translation)
+    is_correct, message = await dictionary.read_async(dictionary.check_translation, english_word, thai_translation)
     return {
         "is_correct": is_correct,
         "message": message
     }
 
+@router.post("/check-translation/batch", response_model=TranslationCheckBatch)
+async def check_translations(data: TranslationCheckRequest,
+                             dictionary: DictionaryService = Depends(get_dictionary_service)):
+    """Grade a list of answers in one request and return per-answer results plus a score."""
+    return await dictionary.read_async(dictionary.check_translations, data.answers, data.lenient)
+
 @router.put("/words/{english_word}", response_model=Dict[str, str])
 async def update_word(english_word: str, word: Word, 
                      dictionary: DictionaryService = Depends(get_dictionary_service)):
@@ -91,31 +419,46 @@ async def update_word(english_word: str, word: Word,
     if english_word.lower() != word.english.lower():
         raise HTTPException(status_code=400, detail="คำศัพท์ไม่ตรงกับที่ต้องการอัพเดท")
     
-    if dictionary.update_word(word):
+    if await dictionary.write_async(dictionary.update_word, word):
         return {"message": f"อัพเดทคำว่า '{word.english}' เรียบร้อยแล้ว"}
     raise HTTPException(status_code=404, detail="ไม่พบคำศัพท์นี้")
 
 @router.delete("/words/{english_word}", response_model=Dict[str, str])
 async def delete_word(english_word: str, dictionary: DictionaryService = Depends(get_dictionary_service)):
     """Delete a word from the dictionary."""
-    if dictionary.delete_word(english_word):
+    if await dictionary.write_async(dictionary.delete_word, english_word):
         return {"message": f"ลบคำว่า '{english_word}' เรียบร้อยแล้ว"}
     raise HTTPException(status_code=404, detail="ไม่พบคำศัพท์นี้")
 
-@router.get("/words/category/{category}", response_model=List[Word])
-async def get_words_by_category(category: str, dictionary: DictionaryService = Depends(get_dictionary_service)):
-    """Get all words in a specific category."""
-    return dictionary.get_words_by_category(category)
+@router.get("/words/category/{category}", response_model=List[Dict[str, Optional[str]]])
+async def get_words_by_category(
+    category: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination ordered by English word"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return: english,thai,category"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Get all words in a specific category, or one page of them."""
+    return await _list_words(
+        request, dictionary, "category", lambda: dictionary.get_words_by_category(category),
+        limit, cursor, fields, category=category
+    )
+
+@router.get("/categories", response_model=List[CategoryCount])
+async def get_categories(dictionary: DictionaryService = Depends(get_dictionary_service)):
+    """Get every category with its word count."""
+    return await dictionary.read_async(dictionary.get_categories)
 
 @router.post("/words/sort/", response_model=List[Word])
 async def sort_words(
     sort_by: str,
     dictionary: DictionaryService = Depends(get_dictionary_service)
 ):
-    """Sort all words by specified field and save to dictionary."""
+    """Get all words sorted by the specified field, without changing the stored order."""
     try:
-        sorted_words = dictionary.sort_words(sort_by)
-        return sorted_words
+        sorted_words = await dictionary.read_async(dictionary.sort_words, sort_by)
+        return _records_response(sorted_words)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -123,8 +466,32 @@ async def sort_words(
 async def delete_all_words(dictionary: DictionaryService = Depends(get_dictionary_service)):
     """Delete all words from the dictionary."""
     try:
-        dictionary.delete_all_words()  # ต้องเพิ่มเมธอดนี้ใน DictionaryService
+        await dictionary.write_async(dictionary.delete_all_words)  # ต้องเพิ่มเมธอดนี้ใน DictionaryService
         return {"message": "ลบคำศัพท์ทั้งหมดเรียบร้อยแล้ว"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/quiz", response_model=List[QuizQuestion])
+async def get_quiz(
+    count: int = Query(10, ge=1, le=100, description="Number of questions"),
+    category: Optional[str] = Query(None, description="Only ask about words in this category"),
+    direction: Literal["en-th", "th-en"] = Query("en-th", description="en-th asks for the Thai translation, th-en for the English word"),
+    choices: int = Query(4, ge=2, le=8, description="Number of choices per question"),
+    dictionary: DictionaryService = Depends(get_dictionary_service)
+):
+    """Get a set of multiple-choice questions; grade the answers with /check-translation/batch."""
+    return await dictionary.read_async(dictionary.make_quiz, count, category, direction, choices)
+
+@router.get("/admin/cache", response_model=Dict[str, int])
+async def get_cache_stats(dictionary: DictionaryService = Depends(get_dictionary_service)):
+    """Get the response cache's hit and miss counters."""
+    return dictionary.cache_stats()
+
+@router.post("/admin/flush", response_model=Dict[str, str])
+async def flush_dictionary(dictionary: DictionaryService = Depends(get_dictionary_service)):
+    """Write all pending changes to storage now."""
+    try:
+        await dictionary.write_async(dictionary.flush)
+        return {"message": "บันทึกข้อมูลเรียบร้อยแล้ว"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
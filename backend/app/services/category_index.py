@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class CategoryIndex:
+    """Secondary index from category to the keys of the words in it."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # Keys per category; inner dicts are used as insertion-ordered sets
+        self._keys: Dict[str, Dict[str, None]] = {}
+        self._categories: Dict[str, Optional[str]] = {}
+        # Position of each key in dictionary order, used to order results
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def add(self, key: str, category: Optional[str]) -> None:
+        """
+        Index a key under a category, moving it if it was in another one.
+
+        An existing key keeps its position in the result order.
+
+        Args:
+            key: Normalized English key
+            category: Normalized category, or None for an uncategorized word
+        """
+        if key in self._categories:
+            self._unlink(key)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        self._categories[key] = category
+        if category is not None:
+            self._keys.setdefault(category, {})[key] = None
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key: Normalized English key
+        """
+        if key in self._categories:
+            self._unlink(key)
+            del self._categories[key]
+            del self._order[key]
+
+    def _unlink(self, key: str) -> None:
+        """Drop a key from the key set of its current category."""
+        category = self._categories[key]
+        if category is not None:
+            keys = self._keys[category]
+            del keys[key]
+            if not keys:
+                del self._keys[category]
+
+    def keys(self, category: str) -> List[str]:
+        """
+        Return the keys of the words in a category.
+
+        Args:
+            category: Normalized category
+
+        Returns:
+            Keys in dictionary order
+        """
+        return sorted(self._keys.get(category, ()), key=self._order.__getitem__)
+
+    def counts(self) -> List[Tuple[str, int]]:
+        """
+        Return every category with the number of words in it.
+
+        Returns:
+            List of (category, count) sorted by category
+        """
+        return sorted((category, len(keys)) for category, keys in self._keys.items())
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import time
+
+
+class ChangeLog:
+    """
+    Dictionary version counter with a bounded log of recent changes.
+
+    Every change gets the next version number. Clients that remember the
+    version they last saw can ask for the changes since then instead of
+    downloading the whole dictionary. Only the most recent changes are
+    kept; older versions, and anything before a reset, can no longer be
+    caught up incrementally.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize the log.
+
+        Versions start from the current time in microseconds, so they keep
+        increasing across restarts and a version seen by a client before a
+        restart is never mistaken for a current one.
+
+        Args:
+            capacity: Number of changes to remember
+        """
+        self._changes: Deque[Dict] = deque(maxlen=capacity)
+        self._version = time.time_ns() // 1000
+        # Versions up to this one cannot be caught up from the log
+        self._floor = self._version
+
+    @property
+    def version(self) -> int:
+        """Version of the latest change."""
+        return self._version
+
+    def append(self, op: str, english: str, entry: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a change to one word.
+
+        Args:
+            op: 'put' or 'delete'
+            english: Normalized English key
+            entry: The new entry for 'put'
+        """
+        if len(self._changes) == self._changes.maxlen:
+            # The oldest change is about to be dropped
+            self._floor = self._changes[0]["version"]
+        self._version += 1
+        change = {"version": self._version, "op": op, "english": english}
+        if entry is not None:
+            change["thai"] = entry["thai"]
+            change["category"] = entry.get("category")
+        self._changes.append(change)
+
+    def reset(self, version: Optional[int] = None) -> None:
+        """
+        Start a new version after a change that cannot be described per word, e.g. a reload.
+
+        Args:
+            version: Version to continue from, e.g. one published by another
+                process; by default a new one above every earlier version
+        """
+        if version is None:
+            version = max(self._version + 1, time.time_ns() // 1000)
+        self._version = version
+        self._floor = self._version
+        self._changes.clear()
+
+    def since(self, version: int) -> Optional[List[Dict]]:
+        """
+        Return the changes made after a version.
+
+        Args:
+            version: Version the client last saw
+
+        Returns:
+            Changes in order, or None if the client has to reload everything
+            because the version is too old or unknown
+        """
+        if version < self._floor or version > self._version:
+            return None
+        changes = []
+        for change in reversed(self._changes):
+            if change["version"] <= version:
+                break
+            changes.append(change)
+        changes.reverse()
+        return changes
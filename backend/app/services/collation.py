@@ -0,0 +1,64 @@
+THAI_LEADING_VOWELS = frozenset("เแโใไ")  # เ แ โ ใ ไ
+# Maitaikhu, the four tone marks, thanthakhat and yamakkan
+THAI_SECONDARY_MARKS = frozenset("็่้๊๋์๎")
+# Mai ek, mai tho, mai tri and mai chattawa (U+0E48-U+0E4B)
+THAI_TONE_MARKS = frozenset("่้๊๋")
+
+
+def _is_thai_consonant(char: str) -> bool:
+    return "ก" <= char <= "ฮ"
+
+
+def thai_sort_key(text: str) -> str:
+    """
+    Build a key that sorts text in Thai dictionary order.
+
+    Unicode stores a leading vowel before its consonant, so plain code point
+    order files every เ-word after every ฮ-word. Dictionaries order by the
+    consonant first, so each leading vowel is moved behind the consonant it
+    precedes. Tone marks and other diacritics only break ties: they are left
+    out of the primary key and appended after a NUL, which sorts below every
+    other character so a shorter primary key still comes first.
+
+    Args:
+        text: Text to sort; Latin text is compared case-insensitively
+
+    Returns:
+        Collation key to compare with the usual string operators
+    """
+    text = text.lower()
+    primary = []
+    secondary = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in THAI_LEADING_VOWELS and i + 1 < len(text) and _is_thai_consonant(text[i + 1]):
+            primary.append(text[i + 1])
+            primary.append(char)
+            secondary.append("\x01\x01")
+            i += 2
+            continue
+        if char in THAI_SECONDARY_MARKS:
+            secondary.append(char)
+        else:
+            primary.append(char)
+            # Separates the marks of one base character from the next
+            secondary.append("\x01")
+        i += 1
+    return "".join(primary) + "\x00" + "".join(secondary)
+
+
+def lenient_form(text: str) -> str:
+    """
+    Reduce text to the form compared by lenient answer checking.
+
+    Whitespace and Thai tone marks are dropped, so answers that only differ
+    in spacing or in a misplaced or missing tone mark compare equal.
+
+    Args:
+        text: Answer or stored translation
+
+    Returns:
+        Lowercased text without whitespace and tone marks
+    """
+    return "".join(char for char in text.lower() if not char.isspace() and char not in THAI_TONE_MARKS)
@@ -1,29 +1,196 @@
-from typing import Dict, List, Tuple, Optional
-import json
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, List, Tuple, Optional
+import asyncio
+import functools
+import heapq
+import random
+import threading
 from pathlib import Path
-from models.word import Word
-import os
+from models.word import (
+    Word, WordRecord, BulkImportResult, CategoryCount, ChangeFeed, FuzzyMatch, QuizQuestion,
+    TranslationAnswer, TranslationCheck, TranslationCheckBatch, WordPage
+)
+from services.category_index import CategoryIndex
+from services.changelog import ChangeLog
+from services.collation import lenient_form, thai_sort_key
+from services.normalization import ensure_normalized, make_entry, normalize_text
+from services.fuzzy import MAX_DISTANCE, DeletionIndex
+from services.journal import apply_record
+from services.metrics import OPERATION_SECONDS, profiled
+from services.prefix_index import PrefixIndex
+from services.quiz_index import QuizIndex
+from services.ranking import (
+    CATEGORY_WEIGHT, ENGLISH_WEIGHT, EXACT, PREFIX, WORD, relevance
+)
+from services.response_cache import ResponseCache
+from services.search_index import NgramIndex
+from services.shared import FileLock, VersionStamp
+from services.storage import DEFAULT_DATA_DIR, JsonStorage, StorageBackend
+from services.writer import WriteQueue
+
+# Changes applied to the fuzzy indexes in place, under the lock, before a
+# rebuild without the lock is cheaper; at least this many, or a tenth of the words
+FUZZY_CATCH_UP_LIMIT = 1000
+# Times a fuzzy query rebuilds an index that fell behind again during the build,
+# e.g. under a steady stream of imports, before it settles for the stale one
+FUZZY_REBUILD_ATTEMPTS = 3
+# Fields a fuzzy query can match; each has its own index, built on first use
+FUZZY_FIELDS = ("english", "thai")
+
+
+def _synchronized(method):
+    """
+    Run a service method while holding the instance lock.
+
+    Storage is checked for external changes before the method body
+    runs, so callers always see the latest data on disk.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._process_lock is None:
+            with self._lock:
+                self._reload_if_changed()
+                return method(self, *args, **kwargs)
+        # Shared storage: the file lock must be taken before self._lock, so
+        # only the outermost call of a thread reloads
+        depth = getattr(self._call_depth, "value", 0)
+        if not depth:
+            self._reload_from_other_processes()
+        with self._lock:
+            self._call_depth.value = depth + 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._call_depth.value = depth
+    return wrapper
+
+
+def _mutating(method):
+    """
+    Like _synchronized, for methods that change the dictionary.
+
+    With shared storage the method runs inside batch(), which holds the
+    file lock from reloading other processes' writes until the change is
+    written, so concurrent writers never overwrite each other.
+    """
+    synchronized = _synchronized(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._process_lock is None:
+            return synchronized(self, *args, **kwargs)
+        with self.batch():
+            return synchronized(self, *args, **kwargs)
+    return wrapper
+
 
 class DictionaryService:
     """Service class for managing the dictionary operations."""
 
-    def __init__(self, dictionary_path: str = None):
+    def __init__(self, dictionary_path: str = None, journal: bool = False,
+                 fsync: bool = False, compact_threshold: int = 1000,
+                 storage: Optional[StorageBackend] = None, persistence: str = "sync",
+                 flush_interval_ms: int = 1000, flush_max_dirty: int = 100,
+                 change_log_size: int = 10000, response_cache_size: int = 256,
+                 response_cache_bytes: int = 64 * 1024 * 1024, shared: bool = False):
         """
         Initialize dictionary service.
         
         Args:
             dictionary_path: Optional custom path to dictionary file
+            journal: Append mutations to a log file instead of rewriting the whole file
+            fsync: Force each journal record to disk before the mutation returns
+            compact_threshold: Number of journal records that triggers a background compaction
+            storage: Optional storage backend; overrides the JSON file options above
+            persistence: When mutations reach storage: 'sync' right away, 'debounced'
+                at most every flush_interval_ms or after flush_max_dirty mutations,
+                'on-shutdown' only on flush() or close()
+            flush_interval_ms: Debounce delay for the 'debounced' policy
+            flush_max_dirty: Pending mutations that force a 'debounced' flush right away
+            change_log_size: Number of recent changes kept for changes_since()
+            response_cache_size: Number of encoded responses kept by cached_response(); 0 disables it
+            response_cache_bytes: Total size of the encoded responses kept by cached_response()
+            shared: Other processes serve the same storage, e.g. uvicorn workers.
+                Writes then hold a lock file and first reload what other
+                processes wrote, and versions are published in a stamp file
+                so every process sends the same ETag for the same data
+            
+        Raises:
+            ValueError: If persistence is invalid, or not 'sync' with shared storage
+                or storage that serves the words itself (see StorageBackend.serves_words)
         """
+        if persistence not in ['sync', 'debounced', 'on-shutdown']:
+            raise ValueError("Invalid persistence. Must be 'sync', 'debounced', or 'on-shutdown'")
+        if shared and persistence != 'sync':
+            # Deferred writes would keep changes in memory while another process rewrites the file
+            raise ValueError("Shared storage requires persistence 'sync'")
+        if storage is not None and storage.serves_words and persistence != 'sync':
+            # Every change is written as it is made; there is no copy in memory to defer
+            raise ValueError(f"{type(storage).__name__} requires persistence 'sync'")
+        self.persistence = persistence
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_max_dirty = flush_max_dirty
+
         if dictionary_path is None:
-            # Get the directory where the current file (dictionary.py) is located
-            current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-            # Go up one level to the app root directory and then into data
-            self.dictionary_path = current_dir.parent.parent / "data" / "dictionary.json"
+            self.dictionary_path = DEFAULT_DATA_DIR / "dictionary.json"
         else:
             self.dictionary_path = Path(dictionary_path)
             
+        if storage is None:
+            storage = JsonStorage(
+                self.dictionary_path, journal=journal, fsync=fsync, compact_threshold=compact_threshold
+            )
+        self._storage = storage
+        self._compaction_scheduled = False
+
+        # All words in memory, or a live view of them for storage that serves them itself
         self.words: Dict[str, Dict[str, str]] = {}
-        self._load_dictionary()
+        # Built lazily on first use and kept in sync with self.words afterwards;
+        # storage may answer the prefix and category indexes itself
+        self._search_index: Optional[NgramIndex] = None
+        self._english_prefix_index: Optional[PrefixIndex] = None
+        self._thai_prefix_index: Optional[PrefixIndex] = None
+        self._category_index: Optional[CategoryIndex] = None
+        # Thai and category orders for sorted views; English order is the prefix index
+        self._thai_sort_index: Optional[PrefixIndex] = None
+        self._category_sort_index: Optional[PrefixIndex] = None
+        self._quiz_index: Optional[QuizIndex] = None
+        # Fuzzy indexes per field in FUZZY_FIELDS are expensive to build, so they are
+        # built without holding self._lock and brought up to date from the change
+        # log when queried; _fuzzy_versions holds the version each one is current at
+        self._fuzzy_indexes: Dict[str, DeletionIndex] = {}
+        self._fuzzy_versions: Dict[str, int] = {}
+        self._fuzzy_build_lock = threading.Lock()
+        self._random = random.Random()
+        # Guards self.words and the storage; re-entrant so public methods may call each other
+        self._lock = threading.RLock()
+
+        # Inside batch(), or with a deferred persistence policy, mutations are only
+        # applied in memory and collected here until flush()
+        self._batch_depth = 0
+        self._pending_records: List[Dict] = []
+        # Set while flush() writes to storage without holding self._lock
+        self._flushing = False
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._writer: Optional[WriteQueue] = None
+        # Version counter and recent changes, for ETags and incremental sync
+        self._changes = ChangeLog(change_log_size)
+        self._response_cache = ResponseCache(response_cache_size, response_cache_bytes)
+        # Only set with shared storage; see services.shared
+        self._process_lock: Optional[FileLock] = None
+        self._version_stamp: Optional[VersionStamp] = None
+        self._seen_stamp: Optional[int] = None
+        # Nesting of _synchronized calls per thread
+        self._call_depth = threading.local()
+        if shared:
+            data_path = Path(self._storage.path)
+            self._process_lock = FileLock(data_path.with_name(data_path.name + ".lock"))
+            self._version_stamp = VersionStamp(data_path.with_name(data_path.name + ".version"))
+            with self._process_lock:
+                self._load_dictionary()
+        else:
+            self._load_dictionary()
 
     def _normalize_key(self, text: str) -> str:
         """
@@ -35,28 +202,654 @@ class DictionaryService:
         Returns:
             Normalized text suitable for use as dictionary key
         """
-        return ' '.join(text.strip().lower().split())
+        return normalize_text(text)
+        
+    def _reload_if_changed(self) -> None:
+        """
+        Catch up with the storage if it was modified outside this service.
+        
+        Mutations the storage can hand back, e.g. journal records appended by
+        another process, are applied like local ones so the derived indexes
+        stay in place; anything else reloads the whole dictionary.
+        """
+        if self._flushing or self._pending_records:
+            # Our own write is in flight, or memory holds changes a reload would drop
+            return
+        if not self._storage.has_changed():
+            return
+        try:
+            records = self._storage.read_changes()
+        except ValueError as e:
+            print(f"Error reading changes: {e}")
+            records = None
+        if records is None:
+            self._load_dictionary()
+        else:
+            self._apply_records(records)
+
+    def _apply_records(self, records: List[Dict]) -> None:
+        """Apply mutations another process wrote to storage, see _reload_if_changed()."""
+        # A served view already shows the records; only the indexes need them
+        words = {} if self._storage.serves_words else self.words
+        with OPERATION_SECONDS.time(operation="catch_up"):
+            for record in records:
+                op = record["op"]
+                english = record.get("english")
+                # Records only delete words that existed
+                existed = english in words or words is not self.words
+                apply_record(words, record)
+                if op == "put":
+                    self._index_put(english, words[english])
+                elif op == "delete" and existed:
+                    self._index_remove(english)
+                elif op == "clear":
+                    self._invalidate_indexes()
+                    self._changes.reset()
+        if self._version_stamp is not None:
+            self._adopt_version_stamp()
+
+    def _reload_from_other_processes(self) -> None:
+        """
+        Reload the dictionary if another process wrote to the shared storage.
+        
+        The reload holds the file lock, shared with other readers, so it
+        waits for a write in progress and never sees half of it. Must not be
+        called with self._lock held.
+        """
+        if not self._storage.has_changed():
+            return
+        self._process_lock.acquire(shared=True)
+        try:
+            with self._lock:
+                self._reload_if_changed()
+        finally:
+            self._process_lock.release()
+
+    def _adopt_version_stamp(self) -> None:
+        """
+        Take over the version published by the process that last wrote the storage.
         
+        Must be called with the file lock held, right after loading or
+        applying another process's records. Applying the same records as the
+        writer usually leads to its version already, which keeps the change
+        log; otherwise the log starts over at the published version.
+        """
+        stamp = self._version_stamp.read()
+        if stamp is None:
+            # First process on this storage
+            self._version_stamp.write(self._changes.version)
+            self._seen_stamp = self._changes.version
+        elif stamp != self._seen_stamp:
+            if stamp != self._changes.version:
+                self._changes.reset(version=stamp)
+            self._seen_stamp = stamp
+        # Otherwise the data changed without a new stamp, e.g. an edit by hand;
+        # the fresh version from reset() keeps this process's ETags distinct
+
     def _load_dictionary(self) -> None:
-        """Load dictionary from JSON file."""
-        if self.dictionary_path.exists():
-            try:
-                with open(self.dictionary_path, 'r', encoding='utf-8') as f:
-                    self.words = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"Error loading dictionary: {e}")
-                self.words = {}
+        """Load the dictionary from storage."""
+        try:
+            with OPERATION_SECONDS.time(operation="load"):
+                words = self._storage.load()
+        except ValueError as e:
+            # Keep the words we already have; a half-written file is retried on the next call
+            print(f"Error loading dictionary: {e}")
+            return
+        if not self._storage.serves_words:
+            # Backends that only store the displayed text get their normalized forms here
+            ensure_normalized(words)
+        self.words = words
+        self._invalidate_indexes()
+        self._changes.reset()
+        if self._version_stamp is not None:
+            self._adopt_version_stamp()
+
+    def _record(self, key: str) -> WordRecord:
+        """Build the read-only record handed out for a stored word."""
+        entry = self.words[key]
+        return WordRecord(key, entry["thai"], entry.get("category"))
+
+    def _invalidate_indexes(self) -> None:
+        """Drop all derived indexes; they are rebuilt from self.words on next use."""
+        self._search_index = None
+        self._english_prefix_index = None
+        self._thai_prefix_index = None
+        self._category_index = None
+        self._thai_sort_index = None
+        self._category_sort_index = None
+        self._fuzzy_indexes = {}
+        self._fuzzy_versions = {}
+        self._quiz_index = None
+
+    def _index_put(self, normalized_word: str, entry: Dict[str, str]) -> None:
+        """Update derived indexes and the change log after a word was added or changed in self.words."""
+        self._changes.append("put", normalized_word, entry)
+        if self._search_index is not None:
+            self._search_index.add(normalized_word, self._search_fields(normalized_word, entry))
+        if self._english_prefix_index is not None:
+            self._english_prefix_index.add(normalized_word, normalized_word)
+            self._thai_prefix_index.add(normalized_word, entry["thai_norm"])
+        if self._category_index is not None:
+            self._category_index.add(normalized_word, entry.get("category"))
+        if self._thai_sort_index is not None:
+            self._thai_sort_index.add(normalized_word, thai_sort_key(entry["thai"]))
+            self._category_sort_index.add(normalized_word, thai_sort_key(entry.get("category") or ""))
+        if self._quiz_index is not None:
+            self._quiz_index.add(normalized_word, entry.get("category"))
+
+    def _index_remove(self, normalized_word: str) -> None:
+        """Update derived indexes and the change log after a word was removed from self.words."""
+        self._changes.append("delete", normalized_word)
+        if self._search_index is not None:
+            self._search_index.remove(normalized_word)
+        if self._english_prefix_index is not None:
+            self._english_prefix_index.remove(normalized_word)
+            self._thai_prefix_index.remove(normalized_word)
+        if self._category_index is not None:
+            self._category_index.remove(normalized_word)
+        if self._thai_sort_index is not None:
+            self._thai_sort_index.remove(normalized_word)
+            self._category_sort_index.remove(normalized_word)
+        if self._quiz_index is not None:
+            self._quiz_index.remove(normalized_word)
+
+    def _search_fields(self, normalized_word: str, entry: Dict[str, str]) -> Tuple[str, ...]:
+        """Return the normalized text that search_words matches against."""
+        return (
+            normalized_word,
+            entry["thai_norm"],
+            entry["category_norm"] or ""
+        )
+
+    def _get_search_index(self) -> NgramIndex:
+        """Return the n-gram search index, building it if needed."""
+        if self._search_index is None:
+            index = NgramIndex()
+            for eng, data in self.words.items():
+                index.add(eng, self._search_fields(eng, data))
+            self._search_index = index
+        return self._search_index
+
+    def _search_keys(self, search_term: str) -> List[str]:
+        """
+        Find the keys of words whose English, Thai or category text contains the term.
+        
+        The storage's own full-text index is used when it has one and holds
+        every change, so the in-memory n-gram index is rarely built for such
+        backends.
+        
+        Args:
+            search_term: Normalized search term
+            
+        Returns:
+            Matching keys in dictionary order
+        """
+        with OPERATION_SECONDS.time(operation="search"):
+            candidates = None
+            if not (self._flushing or self._pending_records):
+                # Storage only knows persisted words, so use it only when memory is not ahead
+                candidates = self._storage.search(search_term)
+            if candidates is None:
+                return self._get_search_index().search(search_term)
+            # Candidates may over-match (e.g. case folding); confirm with the exact rule
+            matches = []
+            for eng in candidates:
+                entry = self.words.get(eng)
+                if entry is not None and any(search_term in text for text in self._search_fields(eng, entry)):
+                    matches.append(eng)
+            return matches
+
+    def _get_prefix_indexes(self) -> Tuple[PrefixIndex, PrefixIndex]:
+        """Return the English and Thai prefix indexes, building them if needed."""
+        if self._english_prefix_index is None:
+            indexes = self._storage.prefix_indexes()
+            if indexes is not None:
+                self._english_prefix_index, self._thai_prefix_index = indexes
+                return indexes
+            self._english_prefix_index = PrefixIndex.from_items((eng, eng) for eng in self.words)
+            self._thai_prefix_index = PrefixIndex.from_items(
+                (eng, data["thai_norm"]) for eng, data in self.words.items()
+            )
+        return self._english_prefix_index, self._thai_prefix_index
+
+    def _get_category_index(self) -> CategoryIndex:
+        """Return the category index, building it if needed."""
+        if self._category_index is None:
+            index = self._storage.category_index()
+            if index is not None:
+                self._category_index = index
+                return index
+            index = CategoryIndex()
+            for eng, data in self.words.items():
+                index.add(eng, data.get("category"))
+            self._category_index = index
+        return self._category_index
+
+    def _get_sort_indexes(self) -> Tuple[PrefixIndex, PrefixIndex]:
+        """Return the Thai and category sort indexes, building them if needed."""
+        if self._thai_sort_index is None:
+            self._thai_sort_index = PrefixIndex.from_items(
+                (eng, thai_sort_key(data["thai"])) for eng, data in self.words.items()
+            )
+            self._category_sort_index = PrefixIndex.from_items(
+                (eng, thai_sort_key(data.get("category") or "")) for eng, data in self.words.items()
+            )
+        return self._thai_sort_index, self._category_sort_index
+
+    def _get_quiz_index(self) -> QuizIndex:
+        """Return the quiz sampling index, building it if needed."""
+        if self._quiz_index is None:
+            index = QuizIndex()
+            for eng, data in self.words.items():
+                index.add(eng, data.get("category"))
+            self._quiz_index = index
+        return self._quiz_index
+
+    def _fuzzy_text(self, field: str, normalized_word: str, entry: Dict[str, str]) -> str:
+        """Return the normalized text a word is indexed under in the fuzzy index of a field."""
+        return normalized_word if field == "english" else entry["thai_norm"]
+
+    def _catch_up_fuzzy_index(self, field: str) -> bool:
+        """
+        Apply changes made since a fuzzy index was built; call with self._lock held.
+
+        Args:
+            field: One of FUZZY_FIELDS
+
+        Returns:
+            True if the index is now current, False if it has to be rebuilt
+            because it is missing or too far behind
+        """
+        index = self._fuzzy_indexes.get(field)
+        if index is None:
+            return False
+        changes = self._changes.since(self._fuzzy_versions[field])
+        if changes is None or len(changes) > max(FUZZY_CATCH_UP_LIMIT, len(self.words) // 10):
+            return False
+        # Only the current entry of each changed word matters
+        for eng in {change["english"] for change in changes}:
+            entry = self.words.get(eng)
+            if entry is None:
+                index.remove(eng)
+            else:
+                index.add(eng, self._fuzzy_text(field, eng, entry))
+        self._fuzzy_versions[field] = self._changes.version
+        return True
+
+    @_synchronized
+    def _fuzzy_snapshot(self, field: str) -> Optional[Tuple[int, List[Tuple[str, str]]]]:
+        """
+        Return the version and (english, text) pairs to build a field's fuzzy index from.
+
+        Returns:
+            None if the current index can still be caught up instead
+        """
+        if self._catch_up_fuzzy_index(field):
+            return None
+        return self._changes.version, [
+            (eng, self._fuzzy_text(field, eng, data)) for eng, data in self.words.items()
+        ]
+
+    @_synchronized
+    def _install_fuzzy_index(self, field: str, version: int, index: DeletionIndex) -> None:
+        """Replace a field's fuzzy index with one built from the dictionary at a version."""
+        self._fuzzy_indexes[field] = index
+        self._fuzzy_versions[field] = version
+
+    def _build_fuzzy_index(self, field: str) -> None:
+        """
+        Build the fuzzy index of a field without blocking other calls.
+
+        Only copying the words and swapping the index in hold self._lock;
+        writes made in between are applied from the change log afterwards.
+        """
+        with self._fuzzy_build_lock:
+            # Another thread may have built it while this one waited
+            snapshot = self._fuzzy_snapshot(field)
+            if snapshot is None:
+                return
+            version, items = snapshot
+            index = DeletionIndex()
+            index.add_all(items)
+            self._install_fuzzy_index(field, version, index)
+
+    def _persist(self, *records: Dict) -> None:
+        """
+        Persist mutations that were already applied to self.words.
+        
+        A compaction is scheduled in the background once the storage asks for it,
+        e.g. when the journal grows past compact_threshold records.
+        
+        Inside batch(), or with a deferred persistence policy, the records are
+        only collected for the next flush().
+        
+        Args:
+            records: Journal records describing the mutations
+        """
+        if self._storage.serves_words:
+            # Already written through self.words
+            return
+        if self._batch_depth or self.persistence != "sync":
+            self._pending_records.extend(records)
+            if not self._batch_depth:
+                self._schedule_flush()
+            return
+        with OPERATION_SECONDS.time(operation="save"):
+            self._storage.write(self.words, records)
+        if self._storage.needs_compaction and not self._compaction_scheduled:
+            self._compaction_scheduled = True
+            threading.Thread(target=self.compact, daemon=True).start()
+
+    def compact(self) -> None:
+        """Fold incremental writes into the main storage, e.g. the journal into a snapshot."""
+        # With shared storage the file lock comes first, in the same order as batch()
+        with self._process_lock or nullcontext():
+            with self._lock:
+                self._compaction_scheduled = False
+                if self._process_lock is not None:
+                    # Another process may have written since; compacting older words would undo that
+                    self._reload_if_changed()
+                with OPERATION_SECONDS.time(operation="compact"):
+                    self._storage.compact(self.words)
+
+    def _schedule_flush(self) -> None:
+        """
+        Arrange the next flush of pending mutations according to the persistence policy.
+        
+        Must be called with self._lock held. The flush runs on a timer thread.
+        """
+        if self.persistence == "on-shutdown":
+            return
+        if len(self._pending_records) >= self.flush_max_dirty:
+            delay = 0
         else:
-            print(f"Dictionary file not found at: {self.dictionary_path}")
-            # Create directory if it doesn't exist
-            self.dictionary_path.parent.mkdir(parents=True, exist_ok=True)
-            self._save_dictionary()
+            delay = self.flush_interval_ms / 1000
+        if self._flush_timer is not None:
+            if delay:
+                return  # the running debounce timer will pick these up
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(delay, self._flush_in_background)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_in_background(self) -> None:
+        """Timer callback; a failed flush keeps the mutations pending for the next attempt."""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error saving dictionary: {e}")
+
+    @contextmanager
+    def batch(self):
+        """
+        Apply mutations in memory only and persist them together on exit.
+        
+        Batches may be nested; the outermost one flushes, or schedules the
+        flush when the persistence policy defers it. Storage that serves the
+        words itself writes them right away instead, in one transaction
+        that the outermost batch commits.
+        
+        With shared storage the batch holds the file lock throughout and
+        starts by reloading whatever other processes wrote.
+        """
+        if self._process_lock is not None:
+            with OPERATION_SECONDS.time(operation="lock_wait"):
+                self._process_lock.acquire()
+        try:
+            with self._lock:
+                self._batch_depth += 1
+                if self._batch_depth == 1:
+                    if self._process_lock is not None:
+                        self._reload_if_changed()
+                    if self._storage.serves_words:
+                        self._storage.begin()
+            try:
+                yield self
+            finally:
+                with self._lock:
+                    self._batch_depth -= 1
+                    outermost = self._batch_depth == 0
+                    if outermost and self._storage.serves_words:
+                        self._commit()
+                    elif outermost and self.persistence != "sync" and self._pending_records:
+                        self._schedule_flush()
+                if outermost and self.persistence == "sync":
+                    self.flush()
+        finally:
+            if self._process_lock is not None:
+                self._process_lock.release()
+
+    def flush(self) -> None:
+        """
+        Write mutations collected by batch() to storage.
+        
+        The write runs without the lock, so readers are not blocked by disk
+        I/O; the dictionary is copied under the lock first when the storage
+        rewrites it as a whole.
+        
+        Raises:
+            Exception: Whatever the storage raised. With the 'sync' policy the
+                in-memory dictionary is then reloaded from storage so it matches
+                what was persisted; otherwise the mutations stay pending
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                records = self._pending_records
+                if not records:
+                    return
+                self._pending_records = []
+                # Only storage that rewrites every word needs a copy of them; journal
+                # and SQLite writes get by with the records. Entries are replaced,
+                # never mutated in place, so a shallow copy is enough.
+                words = dict(self.words) if self._storage.writes_all_words else None
+                self._flushing = True
+            
+            try:
+                with OPERATION_SECONDS.time(operation="save"):
+                    self._storage.write(words, records)
+                if self._storage.needs_compaction:
+                    # Rare enough to copy the words only here. The copy may already hold
+                    # mutations that are still pending; replaying their records on top of
+                    # the new snapshot later gives the same result.
+                    with self._lock:
+                        words = dict(self.words)
+                    with OPERATION_SECONDS.time(operation="compact"):
+                        self._storage.compact(words)
+            except Exception:
+                with self._lock:
+                    self._flushing = False
+                    if self.persistence == "sync":
+                        # Callers see the failure, so drop the changes from memory too
+                        self._load_dictionary()
+                    else:
+                        # Callers were already told the change succeeded; keep it for a retry
+                        self._pending_records[:0] = records
+                raise
+            
+            with self._lock:
+                self._flushing = False
+                self._publish_version()
+
+    def _commit(self) -> None:
+        """
+        Commit the writes of the outermost batch to storage that serves the words itself.
+        
+        Must be called with self._lock held.
+        
+        Raises:
+            Exception: Whatever the storage raised; the writes were rolled back,
+                so the indexes are rebuilt from what was stored
+        """
+        try:
+            with OPERATION_SECONDS.time(operation="save"):
+                self._storage.commit()
+        except Exception:
+            self._load_dictionary()
+            raise
+        self._publish_version()
 
-    def _save_dictionary(self) -> None:
-        """Save dictionary to JSON file."""
-        with open(self.dictionary_path, 'w', encoding='utf-8') as f:
-            json.dump(self.words, f, ensure_ascii=False, indent=4)
+    def _publish_version(self) -> None:
+        """Tell other processes the version of the data just written; call with self._lock held."""
+        if self._version_stamp is not None:
+            # Written under the file lock (see batch), so other processes
+            # reload the data and its version together
+            self._version_stamp.write(self._changes.version)
+            self._seen_stamp = self._changes.version
 
+    def start_writer(self) -> None:
+        """Route write_async() calls through a single writer thread."""
+        if self._writer is None:
+            self._writer = WriteQueue(self)
+
+    async def read_async(self, method: Callable, *args, **kwargs):
+        """
+        Run a service method in the default thread pool.
+        
+        Args:
+            method: Bound method of this service
+            args: Positional arguments for method
+            kwargs: Keyword arguments for method
+            
+        Returns:
+            The method's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, profiled(functools.partial(method, *args, **kwargs)))
+
+    async def write_async(self, method: Callable, *args, **kwargs):
+        """
+        Run a mutating service method on the writer thread.
+        
+        Mutations queued at the same time are persisted with one flush.
+        Without a writer this falls back to read_async().
+        
+        Args:
+            method: Bound mutating method of this service
+            args: Positional arguments for method
+            kwargs: Keyword arguments for method
+            
+        Returns:
+            The method's return value, once the change is persisted
+        """
+        if self._writer is None:
+            return await self.read_async(method, *args, **kwargs)
+        return await asyncio.wrap_future(self._writer.submit(profiled(method), *args, **kwargs))
+
+    def close(self) -> None:
+        """Stop the writer, persist anything pending and release open files and connections."""
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+        self.flush()
+        with self._lock:
+            self._storage.close()
+        if self._process_lock is not None:
+            self._process_lock.close()
+
+    @_synchronized
+    def get_version(self) -> int:
+        """
+        Get the current dictionary version, after picking up external changes.
+        
+        It increases with every change, so responses built from the same
+        version are identical and can be revalidated with it as an ETag.
+        
+        Returns:
+            Version of the latest change
+        """
+        return self._changes.version
+
+    @_synchronized
+    def changes_since(self, version: int) -> ChangeFeed:
+        """
+        Get the changes made after a version, for incremental sync.
+        
+        Args:
+            version: Version the client last synced to
+            
+        Returns:
+            ChangeFeed with the changes in order; reset is set instead when
+            the version is too old or unknown and the client has to reload
+            every word
+        """
+        changes = self._changes.since(version)
+        return ChangeFeed(
+            version=self._changes.version,
+            reset=changes is None,
+            changes=changes or []
+        )
+
+    @_synchronized
+    def cached_response(self, kind: str, query: Dict[str, Any], build: Callable[[], Any]) -> Tuple[int, Any]:
+        """
+        Get an encoded response from the cache, building it on a miss.
+        
+        Entries are keyed by the normalized query and belong to the current
+        dictionary version, so any mutation invalidates them. build runs
+        with the lock held and may call the other public methods.
+        
+        Args:
+            kind: Name of the endpoint or view the response belongs to
+            query: Query parameters; term and category are normalized like
+                search_words and get_words_by_category do
+            build: Builds the value to cache
+            
+        Returns:
+            Tuple of (dictionary version, cached or freshly built value)
+        """
+        normalized = []
+        for name, value in sorted(query.items()):
+            if name == "term" and value is not None:
+                value = self._normalize_key(value)
+            elif name == "category" and value is not None:
+                value = ' '.join(value.split())
+            normalized.append((name, value))
+        key = (kind, tuple(normalized))
+        
+        version = self._changes.version
+        value = self._response_cache.get(key, version)
+        if value is None:
+            value = build()
+            self._response_cache.put(key, version, value)
+        return version, value
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get the response cache counters.
+        
+        Returns:
+            Dict with hits, misses, size, max_entries, bytes and max_bytes
+        """
+        return self._response_cache.stats()
+
+    def metric_samples(self) -> List[Tuple[str, str, str, float]]:
+        """
+        Report the service's state for the metrics endpoint.
+        
+        Read without the lock: a scrape must not wait for a write or
+        trigger a reload, and slightly stale numbers are fine.
+        
+        Returns:
+            (name, type, help, value) tuples, see services.metrics.Registry.add_collector
+        """
+        cache = self._response_cache.stats()
+        fuzzy_variants = sum(index.variant_count for index in list(self._fuzzy_indexes.values()))
+        return [
+            ("thaidict_words", "gauge", "Number of words in the dictionary", len(self.words)),
+            ("thaidict_dictionary_version", "gauge", "Current dictionary version", self._changes.version),
+            ("thaidict_pending_changes", "gauge", "Mutations not yet written to storage",
+             len(self._pending_records)),
+            ("thaidict_response_cache_hits_total", "counter", "Responses served from the response cache", cache["hits"]),
+            ("thaidict_response_cache_misses_total", "counter", "Responses that had to be built", cache["misses"]),
+            ("thaidict_response_cache_entries", "gauge", "Responses currently cached", cache["size"]),
+            ("thaidict_response_cache_bytes", "gauge", "Size of the responses currently cached", cache["bytes"]),
+            ("thaidict_fuzzy_index_variants", "gauge", "Deletion variants held by the fuzzy indexes", fuzzy_variants),
+        ]
+
+    @_mutating
     def add_word(self, word: Word) -> None:
         """
         Add a new word to the dictionary.
@@ -75,12 +868,74 @@ class DictionaryService:
             raise ValueError(f"คำว่า '{word.english}' มีอยู่ในระบบแล้ว")
         
         # Add the word with normalized data
-        self.words[normalized_word] = {
-            "thai": ' '.join(word.thai.split()),  # Normalize thai translation
-            "category": ' '.join(word.category.split()) if word.category else None
-        }
-        self._save_dictionary()
+        entry = make_entry(
+            ' '.join(word.thai.split()),  # Normalize thai translation
+            ' '.join(word.category.split()) if word.category else None
+        )
+        self.words[normalized_word] = entry
+        self._index_put(normalized_word, entry)
+        self._persist({"op": "put", "english": normalized_word, **entry})
 
+    @_mutating
+    def add_words_bulk(self, words: List[Word], on_conflict: str = "skip") -> BulkImportResult:
+        """
+        Add many words at once and persist them in a single write.
+        
+        Args:
+            words: Word objects to import
+            on_conflict: What to do with a word that already exists or is repeated
+                in the batch: 'skip' keeps the first one, 'overwrite' keeps the
+                last one, 'fail' rejects the whole batch
+            
+        Returns:
+            BulkImportResult with counts and the affected keys
+            
+        Raises:
+            ValueError: If on_conflict is invalid, or is 'fail' and a conflict was found
+        """
+        if on_conflict not in ['skip', 'overwrite', 'fail']:
+            raise ValueError("Invalid on_conflict. Must be 'skip', 'overwrite', or 'fail'")
+        
+        batch: Dict[str, Dict[str, str]] = {}
+        conflicts: Dict[str, None] = {}  # ordered set
+        skipped_words: List[str] = []
+        
+        for word in words:
+            normalized_word = self._normalize_key(word.english)
+            if normalized_word in self.words or normalized_word in batch:
+                conflicts[normalized_word] = None
+                if on_conflict == 'skip':
+                    skipped_words.append(normalized_word)
+                    continue
+            batch[normalized_word] = make_entry(
+                ' '.join(word.thai.split()),
+                ' '.join(word.category.split()) if word.category else None
+            )
+        
+        if conflicts and on_conflict == 'fail':
+            keys = list(conflicts)
+            shown = ', '.join(keys[:10]) + (' ...' if len(keys) > 10 else '')
+            raise ValueError(f"มีคำศัพท์ซ้ำ {len(keys)} คำ: {shown}")
+        
+        added = sum(1 for normalized_word in batch if normalized_word not in self.words)
+        if batch:
+            self.words.update(batch)
+            for normalized_word, entry in batch.items():
+                self._index_put(normalized_word, entry)
+            self._persist(*[
+                {"op": "put", "english": normalized_word, **entry}
+                for normalized_word, entry in batch.items()
+            ])
+        
+        return BulkImportResult(
+            added=added,
+            updated=len(batch) - added,
+            skipped=len(skipped_words),
+            skipped_words=skipped_words,
+            conflicts=list(conflicts)
+        )
+
+    @_synchronized
     def get_word(self, english_word: str) -> Optional[Word]:
         """
         Get a word from the dictionary.
@@ -102,18 +957,20 @@ class DictionaryService:
             )
         return None
 
-    def get_all_words(self) -> List[Word]:
+    @_synchronized
+    def get_all_words(self) -> List[WordRecord]:
         """
         Get all words from the dictionary.
         
         Returns:
-            List of all Word objects in the dictionary
+            List of all words in the dictionary
         """
         return [
-            Word(english=eng, thai=data["thai"], category=data.get("category"))
-            for eng, data in self.words.items()
+            WordRecord(eng, entry["thai"], entry.get("category"))
+            for eng, entry in self.words.items()
         ]
 
+    @_synchronized
     def check_translation(self, english_word: str, thai_translation: str) -> Tuple[bool, str]:
         """
         Check if the Thai translation matches the correct answer.
@@ -125,17 +982,54 @@ class DictionaryService:
         Returns:
             Tuple of (is_correct, message)
         """
+        return self._check_translation(english_word, thai_translation, False)
+
+    @_synchronized
+    def check_translations(self, answers: List[TranslationAnswer],
+                           lenient: bool = False) -> TranslationCheckBatch:
+        """
+        Grade many answers at once, e.g. a whole quiz session.
+        
+        Args:
+            answers: Answers to grade
+            lenient: Also accept translations that only differ in whitespace or Thai tone marks
+            
+        Returns:
+            TranslationCheckBatch with a result per answer and the score
+        """
+        results = []
+        for answer in answers:
+            is_correct, message = self._check_translation(answer.english_word, answer.thai_translation, lenient)
+            results.append(TranslationCheck(
+                english_word=answer.english_word,
+                thai_translation=answer.thai_translation,
+                is_correct=is_correct,
+                message=message
+            ))
+        correct = sum(1 for result in results if result.is_correct)
+        return TranslationCheckBatch(
+            results=results,
+            correct=correct,
+            total=len(results),
+            score=round(100 * correct / len(results), 1) if results else 0
+        )
+
+    def _check_translation(self, english_word: str, thai_translation: str, lenient: bool) -> Tuple[bool, str]:
+        """Grade one answer; see check_translation and check_translations."""
         normalized_word = self._normalize_key(english_word)
-        normalized_translation = ' '.join(thai_translation.split())
+        normalized_translation = normalize_text(thai_translation)
         word_data = self.words.get(normalized_word)
         
         if not word_data:
             return False, "ไม่พบคำศัพท์นี้ในระบบ"
         
-        if word_data["thai"] == normalized_translation:
+        if word_data["thai_norm"] == normalized_translation:
+            return True, "ถูกต้อง! 🎉"
+        if lenient and word_data["thai_lenient"] == lenient_form(normalized_translation):
             return True, "ถูกต้อง! 🎉"
         return False, f"ไม่ถูกต้อง คำแปลที่ถูกต้องคือ: {word_data['thai']}"
 
+    @_mutating
     def delete_word(self, english_word: str) -> bool:
         """
         Delete a word from the dictionary.
@@ -149,10 +1043,12 @@ class DictionaryService:
         normalized_word = self._normalize_key(english_word)
         if normalized_word in self.words:
             del self.words[normalized_word]
-            self._save_dictionary()
+            self._index_remove(normalized_word)
+            self._persist({"op": "delete", "english": normalized_word})
             return True
         return False
 
+    @_mutating
     def update_word(self, word: Word) -> bool:
         """
         Update an existing word in the dictionary.
@@ -166,15 +1062,18 @@ class DictionaryService:
         normalized_word = self._normalize_key(word.english)
         
         if normalized_word in self.words:
-            self.words[normalized_word] = {
-                "thai": ' '.join(word.thai.split()),
-                "category": ' '.join(word.category.split()) if word.category else None
-            }
-            self._save_dictionary()
+            entry = make_entry(
+                ' '.join(word.thai.split()),
+                ' '.join(word.category.split()) if word.category else None
+            )
+            self.words[normalized_word] = entry
+            self._index_put(normalized_word, entry)
+            self._persist({"op": "put", "english": normalized_word, **entry})
             return True
         return False
 
-    def get_words_by_category(self, category: str) -> List[Word]:
+    @_synchronized
+    def get_words_by_category(self, category: str) -> List[WordRecord]:
         """
         Get all words in a specific category.
         
@@ -182,58 +1081,66 @@ class DictionaryService:
             category: Category to filter by
             
         Returns:
-            List of Word objects in the specified category
+            List of words in the specified category
         """
         normalized_category = ' '.join(category.split())
+        return [self._record(eng) for eng in self._get_category_index().keys(normalized_category)]
+
+    @_synchronized
+    def get_categories(self) -> List[CategoryCount]:
+        """
+        Get every category with the number of words in it.
+        
+        Returns:
+            List of CategoryCount objects sorted by category
+        """
         return [
-            Word(english=eng, thai=data["thai"], category=data["category"])
-            for eng, data in self.words.items()
-            if data.get("category") == normalized_category
+            CategoryCount(category=category, count=count)
+            for category, count in self._get_category_index().counts()
         ]
     
-    def sort_words(self, sort_by: str) -> List[Word]:
+    @_synchronized
+    def sort_words(self, sort_by: str, order: str = "asc") -> List[WordRecord]:
         """
-        Sort words by specified field and save to dictionary.
+        Get all words sorted by the specified field.
+        
+        The order comes from sorted indexes that are kept up to date on every
+        mutation; the stored dictionary and its order are left untouched.
+        Thai text and categories use Thai dictionary order (see
+        services.collation), and words without a category come first.
         
         Args:
             sort_by: Field to sort by ('english', 'thai', or 'category')
+            order: 'asc' or 'desc'
             
         Returns:
-            List of sorted Word objects
+            List of sorted words; ties are ordered by English word
             
         Raises:
-            ValueError: If invalid sort field is provided
+            ValueError: If invalid sort field or order is provided
         """
         if sort_by not in ['english', 'thai', 'category']:
             raise ValueError("Invalid sort field. Must be 'english', 'thai', or 'category'")
+        if order not in ['asc', 'desc']:
+            raise ValueError("Invalid order. Must be 'asc' or 'desc'")
         
-        # Get all words
-        words = self.get_all_words()
-        
-        # Sort words based on field
-        words.sort(key=lambda x: getattr(x, sort_by) or "")
-        
-        # Convert sorted words back to dictionary format and save
-        sorted_dict = {}
-        for word in words:
-            normalized_word = self._normalize_key(word.english)
-            sorted_dict[normalized_word] = {
-                "thai": ' '.join(word.thai.split()),
-                "category": ' '.join(word.category.split()) if word.category else None
-            }
-        
-        # Update the instance dictionary and save
-        self.words = sorted_dict
-        self._save_dictionary()
-        
-        return words
+        if sort_by == 'english':
+            index, _ = self._get_prefix_indexes()
+        else:
+            thai_index, category_index = self._get_sort_indexes()
+            index = thai_index if sort_by == 'thai' else category_index
+        return [self._record(eng) for eng in index.keys(reverse=order == 'desc')]
 
+    @_mutating
     def delete_all_words(self):
         """Delete all words from the dictionary."""
         self.words.clear()
-        self._save_dictionary()
+        self._invalidate_indexes()
+        self._changes.reset()
+        self._persist({"op": "clear"})
 
-    def search_words(self, term: str) -> List[Word]:
+    @_synchronized
+    def search_words(self, term: str) -> List[WordRecord]:
         """
         Search words by term, matching partial words in english, thai, and category fields.
         
@@ -241,24 +1148,305 @@ class DictionaryService:
             term: Search term to filter words by
             
         Returns:
-            List of matching Word objects
+            List of matching words
         """
         # Normalize search term
         search_term = self._normalize_key(term)
         
-        # Filter words that match the search term in any field
-        matching_words = []
-        for eng, data in self.words.items():
-            # Check if search term appears in any field
-            if (search_term in eng or  # Match in English
-                search_term in self._normalize_key(data["thai"]) or  # Match in Thai
-                (data.get("category") and  # Match in category if it exists
-                search_term in self._normalize_key(data["category"]))):
-                
-                matching_words.append(Word(
-                    english=eng,
-                    thai=data["thai"],
-                    category=data.get("category")
-                ))
-        
-        return matching_words  
\ No newline at end of file
+        # Candidates come from the n-gram index instead of scanning every word
+        return [self._record(eng) for eng in self._search_keys(search_term)]
+
+    @_synchronized
+    def search_ranked(self, term: str, k: int = 20) -> List[WordRecord]:
+        """
+        Find the k words that match a term best, most relevant first.
+        
+        A word scores its best match over the English, Thai and category
+        fields: exact > prefix > start of a later word > elsewhere, weighted
+        by field (see services.ranking). Equal scores are ordered by English
+        word.
+        
+        Candidates are scored in stages, from the strongest matches to the
+        weakest, and the search stops as soon as no unseen word can make the
+        top k. Short terms usually have k English prefix matches, so the
+        substring search over the whole dictionary is skipped.
+        
+        Args:
+            term: Search term
+            k: Number of words to return
+            
+        Returns:
+            Up to k matching words
+        """
+        search_term = self._normalize_key(term)
+        if not search_term:
+            return []
+        english_index, thai_index = self._get_prefix_indexes()
+        scores: Dict[str, float] = {}
+        
+        def consider(keys: List[str]) -> None:
+            words = self.words
+            for eng in keys:
+                if eng not in scores:
+                    entry = words[eng]
+                    scores[eng] = relevance(search_term, (eng, entry["thai_norm"], entry["category_norm"] or ""))
+        
+        def top() -> List[Tuple[str, float]]:
+            # Bounded heap of size k
+            return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        
+        def kth_score() -> float:
+            return top()[-1][1] if len(scores) >= k else -1
+        
+        # Stage 1: English exact and prefix matches in key order, and exact Thai matches.
+        # Unseen words score at most an English prefix, and lose the tie on key order
+        consider(english_index.prefix(search_term, k))
+        consider(thai_index.exact(search_term))
+        if kth_score() >= PREFIX * ENGLISH_WEIGHT:
+            return [self._record(eng) for eng, _ in top()]
+        
+        # Stage 2: every Thai prefix match; the English prefix range was exhausted above.
+        # Unseen words score at most an exact category, and may win the tie
+        consider(thai_index.prefix(search_term, len(thai_index)))
+        if kth_score() > max(EXACT * CATEGORY_WEIGHT, WORD * ENGLISH_WEIGHT):
+            return [self._record(eng) for eng, _ in top()]
+        
+        # Stage 3: everything else that contains the term
+        consider(self._search_keys(search_term))
+        return [self._record(eng) for eng, _ in top()]
+
+    @_synchronized
+    def suggest_words(self, prefix: str, limit: int = 10) -> List[WordRecord]:
+        """
+        Suggest words whose English key or Thai translation starts with a prefix.
+        
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+            
+        Returns:
+            English matches in alphabetical order, followed by Thai matches
+        """
+        normalized_prefix = self._normalize_key(prefix)
+        english_index, thai_index = self._get_prefix_indexes()
+        
+        keys = english_index.prefix(normalized_prefix, limit)
+        if len(keys) < limit:
+            seen = set(keys)
+            # Ask for extra Thai matches in case some were already found in English
+            for eng in thai_index.prefix(normalized_prefix, limit):
+                if eng not in seen and len(keys) < limit:
+                    keys.append(eng)
+        
+        return [self._record(eng) for eng in keys]
+
+    @_synchronized
+    def query_words(self, term: Optional[str] = None, category: Optional[str] = None,
+                    limit: int = 100, cursor: Optional[str] = None) -> WordPage:
+        """
+        Get one page of words ordered by normalized English key.
+        
+        Pagination is keyset based: pass the previous page's next_cursor as
+        cursor to get the following page, which stays stable while words
+        are added or removed.
+        
+        Args:
+            term: Optional search term, matched like search_words
+            category: Optional category, matched like get_words_by_category
+            limit: Maximum number of words on the page
+            cursor: English key after which the page starts
+            
+        Returns:
+            WordPage with the words, the total match count and the next cursor
+        """
+        if term is not None:
+            keys = self._search_keys(self._normalize_key(term))
+        elif category is not None:
+            keys = self._get_category_index().keys(' '.join(category.split()))
+        else:
+            keys = None
+        
+        # Fetch one extra key to know whether another page follows
+        if keys is None:
+            total = len(self.words)
+            english_index, _ = self._get_prefix_indexes()
+            page_keys = english_index.keys_after(cursor, limit + 1)
+        else:
+            total = len(keys)
+            if cursor is not None:
+                keys = [eng for eng in keys if eng > cursor]
+            page_keys = heapq.nsmallest(limit + 1, keys)
+        
+        next_cursor = None
+        if len(page_keys) > limit:
+            page_keys = page_keys[:limit]
+            next_cursor = page_keys[-1]
+        
+        return WordPage(
+            items=[self._record(eng) for eng in page_keys],
+            total=total,
+            next_cursor=next_cursor
+        )
+
+    @_synchronized
+    def export_chunk(self, cursor: Optional[str] = None, limit: int = 1000,
+                     category: Optional[str] = None) -> Tuple[List[Tuple[str, Dict[str, Optional[str]]]], Optional[str]]:
+        """
+        Get the next chunk of stored words for an export, ordered by English key.
+        
+        Like query_words, the cursor is a key rather than an offset, so an
+        export that runs while words change neither repeats nor skips the
+        words that stay. Each call holds the lock for one chunk only.
+        
+        Args:
+            cursor: English key after which the chunk starts, or None for the first
+            limit: Number of keys to scan
+            category: Optional category; scanned keys in other categories are left out,
+                so a chunk can hold fewer than limit words
+            
+        Returns:
+            Tuple of (english, stored entry) pairs and the cursor of the next
+            chunk, which is None after the last one
+        """
+        english_index, _ = self._get_prefix_indexes()
+        keys = english_index.keys_after(cursor, limit)
+        if category is not None:
+            category = ' '.join(category.split())
+        rows = [
+            (eng, self.words[eng]) for eng in keys
+            if category is None or self.words[eng].get("category") == category
+        ]
+        return rows, keys[-1] if len(keys) == limit else None
+
+    def fuzzy_words(self, term: str, max_distance: int = 2, limit: int = 10,
+                    include_thai: bool = True) -> List[FuzzyMatch]:
+        """
+        Find words that are spelled close to a term, for "did you mean" hints.
+        
+        The first call builds the fuzzy index of each field it matches, which
+        takes a while on a large dictionary; other calls are not blocked in
+        the meantime. The Thai index is only built once include_thai is asked
+        for. If writes keep outpacing the rebuilds, the last index built is
+        used as it is after FUZZY_REBUILD_ATTEMPTS, missing the newest words.
+        
+        Args:
+            term: Possibly misspelled English word or Thai translation
+            max_distance: Largest edit distance to accept, at most MAX_DISTANCE
+            limit: Maximum number of candidates
+            include_thai: Also match the term against Thai translations
+            
+        Returns:
+            List of FuzzyMatch objects, closest first, then alphabetical
+            
+        Raises:
+            ValueError: If max_distance is larger than MAX_DISTANCE
+            TimeoutError: If no index could be kept long enough to answer
+        """
+        if max_distance > MAX_DISTANCE:
+            raise ValueError(f"max_distance must be at most {MAX_DISTANCE}")
+        normalized_term = self._normalize_key(term)
+        fields = FUZZY_FIELDS if include_thai else ("english",)
+        for _ in range(FUZZY_REBUILD_ATTEMPTS):
+            matches = self._search_fuzzy_indexes(normalized_term, max_distance, limit, fields)
+            if matches is not None:
+                return matches
+            for field in fields:
+                self._build_fuzzy_index(field)
+        matches = self._search_fuzzy_indexes(normalized_term, max_distance, limit, fields, stale=True)
+        if matches is None:
+            # Every index built was dropped again, e.g. by reloads of a file edited in a loop
+            raise TimeoutError("Fuzzy index is being rebuilt")
+        return matches
+
+    @_synchronized
+    def _search_fuzzy_indexes(self, normalized_term: str, max_distance: int, limit: int,
+                              fields: Tuple[str, ...], stale: bool = False) -> Optional[List[FuzzyMatch]]:
+        """
+        Look a term up in the fuzzy indexes of some fields; see fuzzy_words().
+        
+        Args:
+            stale: Settle for indexes that are too far behind to catch up,
+                skipping words they still hold but the dictionary no longer does
+        
+        Returns:
+            The matches, or None if an index has to be (re)built first
+        """
+        matches = []
+        for field in fields:
+            if not self._catch_up_fuzzy_index(field) and not (stale and field in self._fuzzy_indexes):
+                return None
+            matches += self._fuzzy_indexes[field].search(normalized_term, max_distance)
+        
+        # A word may match through both languages; keep its smallest distance
+        distances: Dict[str, int] = {}
+        for distance, eng in matches:
+            if eng in self.words and distance < distances.get(eng, max_distance + 1):
+                distances[eng] = distance
+        
+        best = heapq.nsmallest(limit, distances.items(), key=lambda item: (item[1], item[0]))
+        return [
+            FuzzyMatch(
+                english=eng,
+                thai=self.words[eng]["thai"],
+                category=self.words[eng].get("category"),
+                distance=distance
+            )
+            for eng, distance in best
+        ]
+
+    @_synchronized
+    def make_quiz(self, count: int = 10, category: Optional[str] = None,
+                  direction: str = "en-th", choices: int = 4) -> List[QuizQuestion]:
+        """
+        Build a multiple-choice quiz from randomly picked words.
+        
+        Wrong choices are taken from the same category as the word when it
+        has enough other words, and from the whole dictionary otherwise.
+        
+        Args:
+            count: Number of questions; fewer are returned if there are not enough words
+            category: Optional category to pick the words from
+            direction: 'en-th' to show English and ask for Thai, 'th-en' for the reverse
+            choices: Number of choices per question, including the correct one
+            
+        Returns:
+            List of QuizQuestion objects, each word at most once; the
+            answers are left out so they can be graded server-side
+            
+        Raises:
+            ValueError: If direction is invalid
+        """
+        if direction not in ['en-th', 'th-en']:
+            raise ValueError("Invalid direction. Must be 'en-th' or 'th-en'")
+        
+        index = self._get_quiz_index()
+        pool = index.pool(' '.join(category.split()) if category is not None else None)
+        
+        def answer_of(eng: str) -> str:
+            return self.words[eng]["thai"] if direction == 'en-th' else eng
+        
+        questions = []
+        for eng in pool.sample(count, self._random):
+            answer = answer_of(eng)
+            options = {answer: None}  # ordered set of distinct choice texts
+            word_category = index.category_of(eng)
+            for candidates in (index.pool(word_category) if word_category else None, index.all):
+                if candidates is None:
+                    continue
+                # Random picks with a bounded number of tries; duplicates and the word itself are skipped
+                for _ in range(4 * choices):
+                    if len(options) >= choices or len(candidates) <= 1:
+                        break
+                    options.setdefault(answer_of(candidates.choice(self._random)), None)
+                if len(options) >= choices:
+                    break
+            
+            texts = list(options)
+            self._random.shuffle(texts)
+            questions.append(QuizQuestion(
+                english=eng if direction == 'en-th' else None,
+                category=self.words[eng].get("category"),
+                prompt=eng if direction == 'en-th' else self.words[eng]["thai"],
+                choices=texts
+            ))
+        return questions
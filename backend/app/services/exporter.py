@@ -0,0 +1,77 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import csv
+import io
+import json
+
+# (english, stored entry) pairs as returned by DictionaryService.export_chunk()
+Rows = List[Tuple[str, Dict[str, Optional[str]]]]
+
+
+def _word(english: str, entry: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    return {"english": english, "thai": entry["thai"], "category": entry.get("category")}
+
+
+def encode_csv_rows(rows: Rows) -> str:
+    """
+    Encode rows as 'english,thai,category' CSV lines, the format parse_csv_row reads.
+
+    Args:
+        rows: Words to encode
+
+    Returns:
+        CSV text ending with a newline; an empty category is an empty column
+    """
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerows((english, entry["thai"], entry.get("category") or "") for english, entry in rows)
+    return out.getvalue()
+
+
+def encode_ndjson_rows(rows: Rows) -> str:
+    """
+    Encode rows as NDJSON lines, the format parse_ndjson_row reads.
+
+    Args:
+        rows: Words to encode
+
+    Returns:
+        One JSON object per line, each ending with a newline
+    """
+    return ''.join(
+        json.dumps(_word(english, entry), ensure_ascii=False, separators=(',', ':')) + '\n'
+        for english, entry in rows
+    )
+
+
+def encode_json_rows(rows: Rows) -> str:
+    """
+    Encode rows as comma-separated JSON objects, to be placed inside an array.
+
+    Args:
+        rows: Words to encode
+
+    Returns:
+        Objects without the enclosing brackets or a trailing comma
+    """
+    return ','.join(
+        json.dumps(_word(english, entry), ensure_ascii=False, separators=(',', ':'))
+        for english, entry in rows
+    )
+
+
+class ExportFormat(NamedTuple):
+    """How one export format frames and encodes its rows."""
+    media_type: str
+    extension: str
+    header: str
+    encode: Callable[[Rows], str]
+    # Written between two non-empty encoded chunks
+    separator: str
+    footer: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("text/csv; charset=utf-8", "csv", "english,thai,category\n", encode_csv_rows, "", ""),
+    "ndjson": ExportFormat("application/x-ndjson", "ndjson", "", encode_ndjson_rows, "", ""),
+    "json": ExportFormat("application/json", "json", "[", encode_json_rows, ",", "]"),
+}
@@ -0,0 +1,202 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Largest edit distance a DeletionIndex can answer queries for
+MAX_DISTANCE = 2
+# Only this many leading characters are indexed; longer texts are told apart
+# by the edit distance check on the candidates. Each text is stored under up to
+# 1 + p + p(p-1)/2 variants for prefix length p, so 5 keeps that at 16 (29 at 7)
+PREFIX_LENGTH = 5
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Compute the edit distance between two strings if it is small.
+
+    Stops as soon as every alignment needs more than max_distance edits, so
+    checking a candidate that is far off costs little.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        Minimum number of single-character insertions, deletions and
+        substitutions, or None if it exceeds max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    # A shared prefix or suffix never needs editing
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a) if len(a) <= max_distance else None
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            current.append(distance)
+            if distance < row_min:
+                row_min = distance
+        if row_min > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def _deletes(text: str, max_distance: int) -> Set[str]:
+    """Return the text and every string obtained by deleting up to max_distance characters."""
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+class DeletionIndex:
+    """
+    Symmetric-deletion index for finding texts within an edit distance of a term.
+
+    Two strings within distance d of each other can both be reduced to a
+    common string by deleting at most d characters from each. Every text is
+    stored under all of its deletion variants, so a query only generates the
+    term's own variants and looks them up; edit distance is computed for the
+    few texts found that way, never for the whole dictionary. Several keys
+    may share one text, e.g. words with the same translation.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest edit distance queries may ask for
+            prefix_length: Number of leading characters to generate variants from
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # Deletion variant -> the text that produces it, or a set if there are several;
+        # most variants belong to a single text, and a set for each would double the memory
+        self._variants: Dict[str, Union[str, Set[str]]] = {}
+        # Text -> keys indexed under it
+        self._keys: Dict[str, Set[str]] = {}
+        # Text per key, to remove it again
+        self._texts: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def variant_count(self) -> int:
+        """Number of deletion variants stored, which dominates the index's memory."""
+        return len(self._variants)
+
+    def add(self, key: str, text: str) -> None:
+        """
+        Index a key under a text, replacing any previous text.
+
+        Args:
+            key: Normalized English key
+            text: Normalized text to match against
+        """
+        if self._texts.get(key) == text:
+            return
+        self.remove(key)
+        self._texts[key] = text
+        keys = self._keys.get(text)
+        if keys is not None:
+            keys.add(key)
+            return
+        self._keys[text] = {key}
+        variants = self._variants
+        for variant in _deletes(text[:self.prefix_length], self.max_distance):
+            texts = variants.get(variant)
+            if texts is None:
+                variants[variant] = text
+            elif isinstance(texts, str):
+                variants[variant] = {texts, text}
+            else:
+                texts.add(text)
+
+    def add_all(self, items: Iterable[Tuple[str, str]]) -> None:
+        """
+        Index many (key, text) pairs.
+
+        Args:
+            items: Pairs as passed to add()
+        """
+        for key, text in items:
+            self.add(key, text)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key: Normalized English key
+        """
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        keys = self._keys[text]
+        keys.discard(key)
+        if keys:
+            return
+        del self._keys[text]
+        variants = self._variants
+        for variant in _deletes(text[:self.prefix_length], self.max_distance):
+            texts = variants[variant]
+            if isinstance(texts, str):
+                del variants[variant]
+                continue
+            texts.discard(text)
+            if len(texts) == 1:
+                variants[variant] = texts.pop()
+
+    def search(self, term: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find keys whose text is within max_distance edits of the term.
+
+        Args:
+            term: Normalized search term
+            max_distance: Largest edit distance to accept, at most the index's max_distance
+
+        Returns:
+            List of (distance, key) pairs in no particular order
+
+        Raises:
+            ValueError: If max_distance exceeds what the index was built for
+        """
+        if max_distance > self.max_distance:
+            raise ValueError(f"max_distance must be at most {self.max_distance}")
+        candidates: Set[str] = set()
+        for variant in _deletes(term[:self.prefix_length], max_distance):
+            texts = self._variants.get(variant)
+            if texts is None:
+                continue
+            if isinstance(texts, str):
+                candidates.add(texts)
+            else:
+                candidates |= texts
+        matches = []
+        for text in candidates:
+            distance = bounded_levenshtein(term, text, max_distance)
+            if distance is not None:
+                matches.extend((distance, key) for key in self._keys[text])
+        return matches
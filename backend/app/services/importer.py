@@ -0,0 +1,90 @@
+from typing import AsyncIterator, Optional
+import codecs
+import csv
+import json
+from pydantic import ValidationError
+from models.word import Word
+from services.metrics import OPERATION_SECONDS
+
+
+def _validate_word(**fields) -> Word:
+    """
+    Build a Word, turning pydantic errors into a short one-line message.
+
+    Raises:
+        ValueError: If the fields fail Word validation
+    """
+    try:
+        with OPERATION_SECONDS.time(operation="validate"):
+            return Word(**fields)
+    except ValidationError as e:
+        raise ValueError('; '.join(
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg'].removeprefix('Value error, ')}"
+            for error in e.errors()
+        )) from None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 bytes into text lines as the bytes arrive.
+
+    Args:
+        chunks: Raw byte chunks, e.g. from Request.stream()
+
+    Yields:
+        Each line without its line ending; a leading BOM is dropped
+
+    Raises:
+        UnicodeDecodeError: If the stream is not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer.rstrip('\r')
+
+
+def parse_ndjson_row(line: str) -> Word:
+    """
+    Parse one NDJSON line into a validated Word.
+
+    Args:
+        line: JSON object with english, thai and optional category
+
+    Returns:
+        Validated Word object
+
+    Raises:
+        ValueError: If the line is not a JSON object or fails Word validation
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("แต่ละบรรทัดต้องเป็น JSON object")
+    return _validate_word(**data)
+
+
+def parse_csv_row(line: str) -> Optional[Word]:
+    """
+    Parse one 'english,thai,category' CSV line into a validated Word.
+
+    Args:
+        line: CSV line; the category column is optional
+
+    Returns:
+        Validated Word object, or None for the header line
+
+    Raises:
+        ValueError: If the row has too few columns or fails Word validation
+    """
+    row = next(csv.reader([line]))
+    if len(row) < 2:
+        raise ValueError("ต้องมีอย่างน้อย 2 คอลัมน์: english,thai")
+    if row[0].strip().lower() == 'english' and row[1].strip().lower() == 'thai':
+        return None
+    category = row[2] if len(row) > 2 else None
+    return _validate_word(english=row[0], thai=row[1], category=category)
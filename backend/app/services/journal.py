@@ -0,0 +1,201 @@
+from typing import Dict, List, Optional
+import json
+import os
+import tempfile
+from pathlib import Path
+from services.metrics import BYTES_WRITTEN
+from services.normalization import NORMALIZED_FIELDS, make_entry
+
+
+def atomic_write_json(path: Path, data, indent: Optional[int] = 4) -> None:
+    """
+    Write JSON to a file without ever leaving a half-written file behind.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and then renamed over the target in a single step.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        indent: Indentation passed to json.dump
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.replace(tmp_path, path)
+        BYTES_WRITTEN.inc(size, kind="json")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def apply_record(words: Dict[str, Dict[str, str]], record: Dict) -> None:
+    """
+    Apply one journal record to an in-memory dictionary.
+
+    Args:
+        words: Dictionary data to modify in place
+        record: Journal record with an 'op' of 'put', 'delete' or 'clear'
+
+    Raises:
+        ValueError: If the record has an unknown operation
+    """
+    op = record.get("op")
+    if op == "put":
+        if all(field in record for field in NORMALIZED_FIELDS):
+            entry = {field: record[field] for field in ("thai", "category") + NORMALIZED_FIELDS}
+        else:
+            # Written before normalized forms were journaled
+            entry = make_entry(record["thai"], record.get("category"))
+        words[record["english"]] = entry
+    elif op == "delete":
+        words.pop(record["english"], None)
+    elif op == "clear":
+        words.clear()
+    else:
+        raise ValueError(f"Unknown journal operation: {op}")
+
+
+class Journal:
+    """Append-only log of dictionary mutations kept next to the snapshot file."""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Path to the log file
+            fsync: Force every appended record to disk before returning
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        # Number of records in the log that are not yet folded into the snapshot
+        self.entries = 0
+        # Bytes of the log this process has replayed, read or written itself,
+        # or None once another process appended records it has not read
+        self.offset: Optional[int] = 0
+        self._file = None
+
+    def append(self, *records: Dict) -> None:
+        """
+        Append mutation records to the log with a single flush.
+
+        Args:
+            records: Journal records (see apply_record)
+        """
+        if self._file is not None and not self._is_current_file():
+            # Another process folded the log into a snapshot and removed it
+            self.close()
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8', newline='\n')
+        if os.fstat(self._file.fileno()).st_size != self.offset:
+            self.offset = None
+        start = self._file.tell()
+        self._file.write(''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for record in records
+        ))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        BYTES_WRITTEN.inc(self._file.tell() - start, kind="journal")
+        self.entries += len(records)
+        if self.offset is not None:
+            self.offset = self._file.tell()
+
+    def _is_current_file(self) -> bool:
+        """Check that the open handle still refers to the file at self.path."""
+        try:
+            return os.path.samestat(os.fstat(self._file.fileno()), os.stat(self.path))
+        except FileNotFoundError:
+            return False
+
+    def replay(self, words: Dict[str, Dict[str, str]]) -> int:
+        """
+        Apply every record in the log to the given dictionary.
+
+        A trailing record that was cut off by a crash is dropped from the
+        file so that new records start on a clean line.
+
+        Args:
+            words: Dictionary data loaded from the snapshot
+
+        Returns:
+            Number of records applied
+        """
+        self.entries = 0
+        self.offset = 0
+        if not self.path.exists():
+            return 0
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("record is not newline-terminated")
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    print(f"Ignoring incomplete journal record in: {self.path}")
+                    break
+                apply_record(words, record)
+                self.entries += 1
+                valid_bytes += len(line)
+            else:
+                self.offset = valid_bytes
+                return self.entries
+        self.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_bytes)
+        self.offset = valid_bytes
+        return self.entries
+
+    def read_new(self) -> Optional[List[Dict]]:
+        """
+        Read the records other processes appended since this one last replayed, read or wrote the log.
+
+        A record that is still being written is left for the next call.
+
+        Returns:
+            New records in order, or None if they cannot be told apart from the
+            ones already seen, e.g. because the log was rewritten
+        """
+        if self.offset is None:
+            return None
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return [] if self.offset == 0 else None
+        records = []
+        with f:
+            if os.fstat(f.fileno()).st_size < self.offset:
+                return None
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line.decode('utf-8')))
+                except ValueError:
+                    return None
+                self.offset += len(line)
+        self.entries += len(records)
+        return records
+
+    def truncate(self) -> None:
+        """Discard all records, after they have been folded into a snapshot."""
+        self.close()
+        if self.path.exists():
+            os.unlink(self.path)
+        self.entries = 0
+        self.offset = 0
+
+    def close(self) -> None:
+        """Close the underlying file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
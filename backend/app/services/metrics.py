@@ -0,0 +1,383 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import types
+
+# Upper bounds in seconds; in-memory operations mostly land in the first few
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a Prometheus label set, escaping backslashes, quotes and newlines."""
+    if not names:
+        return ""
+    pairs = (
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Named family of samples, one per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add amount to the total for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current total for the given labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (the last one is +Inf), the sum and the total count
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one value for the given labels."""
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the block in seconds, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Return the number of values observed for the given labels."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Set of metrics rendered together in the Prometheus text format.
+
+    Collectors add samples that are read at scrape time instead of being
+    updated on every change, e.g. the size of the dictionary.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, float]]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; names must be unique."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, str, float]]]) -> None:
+        """
+        Add a callback returning (name, type, help, value) samples at scrape time.
+
+        Args:
+            collector: Callback; type is 'gauge' or 'counter'
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable) -> None:
+        """Remove a collector added with add_collector(), if present."""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric and collector sample.
+
+        Returns:
+            Text in the Prometheus exposition format, version 0.0.4
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        blocks = [metric.render() for metric in metrics]
+        for collector in collectors:
+            for name, kind, help, value in collector():
+                blocks.append(f"# HELP {name} {help}\n# TYPE {name} {kind}\n{name} {_format_value(value)}")
+        return "\n".join(blocks) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "thaidict_http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template",
+    ("method", "route", "status")
+)
+OPERATION_SECONDS = REGISTRY.histogram(
+    "thaidict_operation_duration_seconds",
+    "Time spent in internal dictionary operations",
+    ("operation",)
+)
+BYTES_WRITTEN = REGISTRY.counter(
+    "thaidict_storage_bytes_written_total",
+    "Bytes written to dictionary files, journals and snapshots",
+    ("kind",)
+)
+
+
+# Profiles collected for the current request while it runs with ?profile=1
+_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("thaidict_profiles", default=None)
+# Held while a profiler runs; since Python 3.12 only one may be active per process
+_profiler_lock = threading.Lock()
+
+
+def profiled(fn: Callable) -> Callable:
+    """
+    Wrap a callable so it is profiled when the current request is.
+
+    This covers the work handed to the thread pool or the writer thread;
+    the handler itself is profiled on the event loop by profile_coroutine().
+    The context is captured here, in the caller's thread. A call that starts
+    while another one is being profiled runs unprofiled instead of waiting,
+    since it may be what the other one is waiting for.
+
+    Args:
+        fn: Callable about to be run on another thread
+
+    Returns:
+        fn itself when the request is not profiled
+    """
+    profiles = _profiles.get()
+    if profiles is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _profiler_lock.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        try:
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(fn, *args, **kwargs)
+            finally:
+                profiles.append(profile)
+        finally:
+            _profiler_lock.release()
+    return wrapper
+
+
+async def profile_coroutine(coro: Coroutine) -> Any:
+    """
+    Await a coroutine on the event loop, profiling it when the current request is profiled.
+
+    The profiler only runs while the coroutine itself runs, one step between
+    awaits at a time, so the work it waits for on other threads can be
+    profiled by profiled() in the meantime. A step that starts while another
+    profiler is active runs unprofiled.
+
+    Args:
+        coro: Coroutine to run, e.g. a route handler
+
+    Returns:
+        The coroutine's result
+    """
+    profiles = _profiles.get()
+    if profiles is None:
+        return await coro
+    profile = cProfile.Profile()
+    try:
+        return await _step_profiled(coro, profile)
+    finally:
+        profiles.append(profile)
+
+
+def profile_iterator(items: AsyncIterator) -> AsyncIterator:
+    """
+    Profile an async iterator like profile_coroutine() while it is consumed, if the current request is profiled.
+
+    Args:
+        items: Async iterator, e.g. a streamed response body
+
+    Returns:
+        items itself when the request is not profiled
+    """
+    profiles = _profiles.get()
+    if profiles is None:
+        return items
+    return _profiled_items(items, profiles)
+
+
+async def _profiled_items(items: AsyncIterator, profiles: List[cProfile.Profile]) -> AsyncIterator:
+    """Yield the items of an async iterator, profiling each step; see profile_iterator."""
+    profile = cProfile.Profile()
+    try:
+        while True:
+            try:
+                item = await _step_profiled(items.__anext__(), profile)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        profiles.append(profile)
+
+
+@types.coroutine
+def _step_profiled(coro: Awaitable, profile: cProfile.Profile) -> Generator:
+    """Drive a coroutine, or another awaitable with send() and throw(), enabling the profile around each step."""
+    value, error = None, None
+    while True:
+        locked = _profiler_lock.acquire(blocking=False)
+        if locked:
+            profile.enable()
+        try:
+            if error is None:
+                future = coro.send(value)
+            else:
+                future = coro.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            if locked:
+                profile.disable()
+                _profiler_lock.release()
+        try:
+            value, error = (yield future), None
+        except BaseException as e:
+            # Cancellation and the like are delivered to the coroutine
+            value, error = None, e
+
+
+@contextmanager
+def profile_request() -> Iterator[List[cProfile.Profile]]:
+    """
+    Collect the profiles of profiled() and profile_coroutine() calls made for the duration of the block.
+
+    Yields:
+        List that receives the profiles
+    """
+    profiles: List[cProfile.Profile] = []
+    token = _profiles.set(profiles)
+    try:
+        yield profiles
+    finally:
+        _profiles.reset(token)
+
+
+def profile_report(profiles: List[cProfile.Profile], limit: int = 40) -> str:
+    """
+    Merge profiles and summarize them by cumulative time.
+
+    Args:
+        profiles: Profiles from profile_request()
+        limit: Number of functions to list
+
+    Returns:
+        pstats text report
+    """
+    if not profiles:
+        return "No dictionary operations were profiled for this request\n"
+    out = io.StringIO()
+    stats = pstats.Stats(profiles[0], stream=out)
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,102 @@
+from typing import Dict, Optional, Tuple
+import unicodedata
+from services.collation import lenient_form
+
+# Version of the dictionary.json layout written by this code:
+#   1: {"<english>": {"thai": ..., "category": ...}, ...}
+#   2: {"format": 2, "words": {"<english>": {"thai": ..., "category": ..., <normalized forms>}}}
+FORMAT_VERSION = 2
+
+# Derived fields stored in every entry next to thai and category
+NORMALIZED_FIELDS = ("thai_norm", "category_norm", "thai_lenient")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for comparisons: NFC, lowercase, single spaces.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Normalized text; for English words this is the dictionary key
+    """
+    return ' '.join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def make_entry(thai: str, category: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Build a stored entry with its normalized forms.
+
+    Args:
+        thai: Thai translation as displayed
+        category: Category as displayed, or None
+
+    Returns:
+        Entry with thai, category, thai_norm and category_norm (see
+        normalize_text; None without a category) and thai_lenient (see
+        services.collation.lenient_form)
+    """
+    thai_norm = normalize_text(thai)
+    return {
+        "thai": thai,
+        "category": category,
+        "thai_norm": thai_norm,
+        # Search terms go through normalize_text too, so both sides must fold case the same way
+        "category_norm": normalize_text(category) if category else None,
+        "thai_lenient": lenient_form(thai_norm)
+    }
+
+
+def ensure_normalized(words: Dict[str, Dict[str, Optional[str]]]) -> int:
+    """
+    Add the normalized forms to entries that were stored without them.
+
+    Args:
+        words: Dictionary data to update in place
+
+    Returns:
+        Number of entries that had to be completed
+    """
+    missing = [
+        english for english, entry in words.items()
+        if any(field not in entry for field in NORMALIZED_FIELDS)
+    ]
+    for english in missing:
+        entry = words[english]
+        words[english] = make_entry(entry["thai"], entry.get("category"))
+    return len(missing)
+
+
+def decode_dictionary(data: Dict) -> Tuple[Dict[str, Dict[str, Optional[str]]], int]:
+    """
+    Unpack parsed dictionary.json content of any supported format.
+
+    Args:
+        data: Parsed JSON
+
+    Returns:
+        Tuple of (words, format version)
+
+    Raises:
+        ValueError: If the file was written in a newer, unknown format
+    """
+    # A format 1 file maps words to objects, so an integer "format" cannot be a word
+    if isinstance(data.get("format"), int):
+        if data["format"] > FORMAT_VERSION:
+            raise ValueError(f"Unsupported dictionary format {data['format']}; this version reads up to {FORMAT_VERSION}")
+        return data["words"], data["format"]
+    return data, 1
+
+
+def encode_dictionary(words: Dict[str, Dict[str, Optional[str]]]) -> Dict:
+    """
+    Pack words into the current dictionary.json format.
+
+    Args:
+        words: Dictionary data with normalized forms
+
+    Returns:
+        JSON-serializable data
+    """
+    return {"format": FORMAT_VERSION, "words": words}
@@ -0,0 +1,179 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Entries per block when bulk-building; a block is split once it holds twice as many
+BLOCK_SIZE = 1000
+
+
+class PrefixIndex:
+    """
+    Sorted (text, key) pairs for prefix lookups with bisect.
+
+    The pairs are kept in blocks of about BLOCK_SIZE sorted entries, plus the
+    last entry of each block to find the right block with bisect. A lookup
+    costs O(log N + k) for k results, and inserting or removing a key only
+    shifts the entries of one block instead of the whole array. Build large
+    indexes with from_items(), which sorts once instead of inserting one by one.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._blocks: List[List[Tuple[str, str]]] = []
+        # Last entry of each block
+        self._maxes: List[Tuple[str, str]] = []
+        # Indexed text per key, to find the entry again on update or removal
+        self._texts: Dict[str, str] = {}
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, str]]) -> "PrefixIndex":
+        """
+        Build an index from many (key, text) pairs with a single sort.
+
+        Args:
+            items: Pairs as passed to add(); each key must occur only once
+
+        Returns:
+            The populated index
+        """
+        index = cls()
+        index._texts = dict(items)
+        entries = sorted((text, key) for key, text in index._texts.items())
+        index._blocks = [entries[i:i + BLOCK_SIZE] for i in range(0, len(entries), BLOCK_SIZE)]
+        index._maxes = [block[-1] for block in index._blocks]
+        return index
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, key: str, text: str) -> None:
+        """
+        Index a key under the given text, replacing any previous text.
+
+        Args:
+            key: Normalized English key
+            text: Normalized text to match prefixes against
+        """
+        if key in self._texts:
+            self.remove(key)
+        self._texts[key] = text
+        entry = (text, key)
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._maxes.append(entry)
+            return
+        i = bisect_left(self._maxes, entry)
+        if i == len(self._blocks):
+            # Sorts after everything; goes at the end of the last block
+            i -= 1
+            self._blocks[i].append(entry)
+            self._maxes[i] = entry
+        else:
+            insort(self._blocks[i], entry)
+        block = self._blocks[i]
+        if len(block) > 2 * BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[i:i + 1] = [block[:half], block[half:]]
+            self._maxes[i:i + 1] = [block[half - 1], block[-1]]
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key: Normalized English key
+        """
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        entry = (text, key)
+        i = bisect_left(self._maxes, entry)
+        block = self._blocks[i]
+        del block[bisect_left(block, entry)]
+        if not block:
+            del self._blocks[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = block[-1]
+
+    def _iter_from(self, entry: Tuple, after: bool = False) -> Iterator[Tuple[str, str]]:
+        """Yield the entries from the first one at or, if after is set, past the given entry."""
+        find = bisect_right if after else bisect_left
+        i = find(self._maxes, entry)
+        if i == len(self._blocks):
+            return
+        block = self._blocks[i]
+        yield from islice(block, find(block, entry), None)
+        for block in islice(self._blocks, i + 1, None):
+            yield from block
+
+    def prefix(self, prefix: str, limit: int) -> List[str]:
+        """
+        Find keys whose text starts with the prefix.
+
+        Args:
+            prefix: Normalized prefix
+            limit: Maximum number of keys to return
+
+        Returns:
+            Matching keys ordered by their text
+        """
+        keys = []
+        if limit <= 0:
+            return keys
+        for text, key in self._iter_from((prefix,)):
+            if not text.startswith(prefix):
+                break
+            keys.append(key)
+            if len(keys) >= limit:
+                break
+        return keys
+
+    def exact(self, text: str) -> List[str]:
+        """
+        Find keys whose text equals the given text.
+
+        Args:
+            text: Normalized text
+
+        Returns:
+            Matching keys in key order
+        """
+        keys = []
+        for entry_text, key in self._iter_from((text,)):
+            if entry_text != text:
+                break
+            keys.append(key)
+        return keys
+
+    def keys_after(self, text: Optional[str], limit: int) -> List[str]:
+        """
+        Return keys in text order, starting after the given text.
+
+        Args:
+            text: Text to start after, or None to start from the beginning
+            limit: Maximum number of keys to return
+
+        Returns:
+            Keys whose text sorts after the given text
+        """
+        if text is None:
+            entries = (entry for block in self._blocks for entry in block)
+        else:
+            entries = self._iter_from((text, '\U0010ffff'), after=True)
+        return [key for _, key in islice(entries, max(limit, 0))]
+
+    def keys(self, reverse: bool = False) -> List[str]:
+        """
+        Return every key in text order.
+
+        Args:
+            reverse: Return the keys in descending text order instead
+
+        Returns:
+            All indexed keys; keys with equal text are ordered by key
+        """
+        keys = [key for block in self._blocks for _, key in block]
+        if reverse:
+            keys.reverse()
+        return keys
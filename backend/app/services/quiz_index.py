@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional
+import random
+
+
+class KeyPool:
+    """
+    Set of keys backed by an array, for O(1) uniform random picks.
+
+    Removal swaps the last key into the freed slot, so add, remove and
+    picking a random key all run in constant time.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def add(self, key: str) -> None:
+        """Add a key if it is not in the pool yet."""
+        if key not in self._positions:
+            self._positions[key] = len(self._keys)
+            self._keys.append(key)
+
+    def remove(self, key: str) -> None:
+        """Remove a key if it is in the pool."""
+        i = self._positions.pop(key, None)
+        if i is None:
+            return
+        last = self._keys.pop()
+        if last != key:
+            self._keys[i] = last
+            self._positions[last] = i
+
+    def choice(self, rng: random.Random) -> str:
+        """Return a random key; the pool must not be empty."""
+        return self._keys[rng.randrange(len(self._keys))]
+
+    def sample(self, count: int, rng: random.Random) -> List[str]:
+        """Return up to count distinct random keys."""
+        return rng.sample(self._keys, min(count, len(self._keys)))
+
+
+class QuizIndex:
+    """Random-access pools of all keys and of the keys in each category."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.all = KeyPool()
+        self._by_category: Dict[str, KeyPool] = {}
+        self._categories: Dict[str, Optional[str]] = {}
+
+    def add(self, key: str, category: Optional[str]) -> None:
+        """
+        Index a key under a category, moving it if it was in another one.
+
+        Args:
+            key: Normalized English key
+            category: Normalized category, or None for an uncategorized word
+        """
+        if key in self._categories:
+            self._unlink(key)
+        self._categories[key] = category
+        self.all.add(key)
+        if category is not None:
+            self._by_category.setdefault(category, KeyPool()).add(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key: Normalized English key
+        """
+        if key in self._categories:
+            self._unlink(key)
+            del self._categories[key]
+            self.all.remove(key)
+
+    def _unlink(self, key: str) -> None:
+        """Drop a key from the pool of its current category."""
+        category = self._categories[key]
+        if category is not None:
+            pool = self._by_category[category]
+            pool.remove(key)
+            if not pool:
+                del self._by_category[category]
+
+    def category_of(self, key: str) -> Optional[str]:
+        """Return the category a key is indexed under."""
+        return self._categories.get(key)
+
+    def pool(self, category: Optional[str] = None) -> KeyPool:
+        """
+        Return the pool of a category, or of every key.
+
+        Args:
+            category: Normalized category, or None for all keys
+
+        Returns:
+            The pool; an empty one for an unknown category
+        """
+        if category is None:
+            return self.all
+        return self._by_category.get(category, KeyPool())
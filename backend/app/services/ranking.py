@@ -0,0 +1,67 @@
+from typing import Tuple
+import unicodedata
+
+# Score of the best match of the term in one field
+EXACT = 100
+PREFIX = 60
+WORD = 40
+SUBSTRING = 20
+
+# Weight per searchable field, in the order DictionaryService._search_fields returns them:
+# English, Thai, category. The tiers stay ordered within a field, and an exact Thai match
+# still outranks an English prefix.
+FIELD_WEIGHTS = (1.0, 0.9, 0.5)
+ENGLISH_WEIGHT, THAI_WEIGHT, CATEGORY_WEIGHT = FIELD_WEIGHTS
+
+
+def _starts_word(text: str, i: int) -> bool:
+    """Check whether position i starts a word, i.e. follows a space or punctuation."""
+    # Thai vowel and tone marks are combining characters, not word boundaries
+    return i == 0 or unicodedata.category(text[i - 1])[0] not in "LMN"
+
+
+def match_score(text: str, term: str) -> int:
+    """
+    Classify how the term occurs in one field.
+
+    Args:
+        text: Normalized field text
+        term: Normalized search term
+
+    Returns:
+        EXACT, PREFIX, WORD (the term starts a later word), SUBSTRING, or 0 if
+        the term does not occur
+    """
+    if text == term:
+        return EXACT
+    if text.startswith(term):
+        return PREFIX
+    i = text.find(term)
+    if i < 0:
+        return 0
+    while i >= 0:
+        if _starts_word(text, i):
+            return WORD
+        i = text.find(term, i + 1)
+    return SUBSTRING
+
+
+def relevance(term: str, fields: Tuple[str, ...]) -> float:
+    """
+    Score a word for a search term.
+
+    Args:
+        term: Normalized search term
+        fields: Normalized English, Thai and category text
+
+    Returns:
+        The best weighted match over the fields; 0 if none contains the term
+    """
+    best = 0
+    for text, weight in zip(fields, FIELD_WEIGHTS):
+        # Most fields of a candidate do not contain the term at all
+        if term in text:
+            score = match_score(text, term) * weight
+            if score > best:
+                best = score
+    return best
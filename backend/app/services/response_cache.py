@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+
+
+def _value_size(value: Any) -> int:
+    """Approximate the memory held by an encoded response: its bytes and strings."""
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_value_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_value_size(k) + _value_size(v) for k, v in value.items())
+    return 0
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of encoded responses for one dictionary version.
+
+    Only responses for the current version can ever be served, so the cache
+    is emptied as soon as it sees a newer one: a mutation invalidates every
+    entry at once without having to find the affected ones, and full-list
+    bodies of older versions do not linger until they are evicted.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Number of responses to keep; 0 disables the cache
+            max_bytes: Total size of the cached bodies; larger responses are not cached
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Value and its size per key, all built at self._version
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _switch_version(self, version: int) -> None:
+        """Drop every entry if they were built at another version; call with self._lock held."""
+        if version != self._version:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """
+        Look up a response built at the given version.
+
+        Args:
+            key: Normalized query
+            version: Current dictionary version
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            self._switch_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        Store a response, evicting the least recently used ones if full.
+
+        Args:
+            key: Normalized query
+            version: Dictionary version the value was built from
+            value: Encoded response
+        """
+        if self.max_entries <= 0:
+            return
+        size = _value_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._switch_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
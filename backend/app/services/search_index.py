@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class NgramIndex:
+    """
+    Character n-gram index for substring search.
+
+    Thai is written without spaces between words, so the index works on raw
+    character n-grams instead of tokens. Every key is indexed under the
+    n-grams of all of its searchable fields; a query intersects the posting
+    lists of its own n-grams and then confirms each candidate with a plain
+    substring check.
+    """
+
+    def __init__(self, n: int = 3):
+        """
+        Initialize an empty index.
+
+        Args:
+            n: Length of the character n-grams
+        """
+        self.n = n
+        self._postings: Dict[str, Set[str]] = {}
+        # Normalized searchable fields per key, in dictionary order
+        self._fields: Dict[str, Tuple[str, ...]] = {}
+        # Position of each key in dictionary order, used to order results
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def _grams(self, fields: Iterable[str]) -> Set[str]:
+        """Return the set of n-grams that occur in any of the fields."""
+        n = self.n
+        return {
+            text[i:i + n]
+            for text in fields
+            for i in range(len(text) - n + 1)
+        }
+
+    def add(self, key: str, fields: Tuple[str, ...]) -> None:
+        """
+        Index a key, replacing its previous fields if it is already indexed.
+
+        An existing key keeps its position in the result order.
+
+        Args:
+            key: Normalized English key
+            fields: Normalized searchable text for the key
+        """
+        if key in self._fields:
+            self._unlink(key)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        self._fields[key] = fields
+        for gram in self._grams(fields):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key: Normalized English key
+        """
+        if key in self._fields:
+            self._unlink(key)
+            del self._fields[key]
+            del self._order[key]
+
+    def _unlink(self, key: str) -> None:
+        """Drop a key from the posting lists of its current fields."""
+        for gram in self._grams(self._fields[key]):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def search(self, term: str) -> List[str]:
+        """
+        Find keys whose fields contain the term.
+
+        Args:
+            term: Normalized search term
+
+        Returns:
+            Matching keys in dictionary order
+        """
+        if len(term) < self.n:
+            # Too short to have an n-gram; compare against the cached fields
+            return [
+                key for key, fields in self._fields.items()
+                if any(term in text for text in fields)
+            ]
+
+        postings = []
+        for gram in self._grams([term]):
+            keys = self._postings.get(gram)
+            if not keys:
+                return []
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+
+        matches = [
+            key for key in candidates
+            if any(term in text for text in self._fields[key])
+        ]
+        matches.sort(key=self._order.__getitem__)
+        return matches
@@ -0,0 +1,150 @@
+from typing import Optional
+import os
+import threading
+from pathlib import Path
+from services.journal import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Coordination between worker processes that serve the same data directory.
+# Every process keeps its own copy of the dictionary in memory; writers
+# serialize on a FileLock and publish the dictionary version they wrote in a
+# VersionStamp, so all processes hand out the same ETag for the same data.
+
+
+def _lock_fd(fd: int, blocking: bool, shared: bool) -> bool:
+    """Take an advisory lock on an open file; False if busy and not blocking."""
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    # msvcrt has no shared locks, so readers exclude each other there
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            # LK_LOCK gives up after about ten seconds, so keep retrying when blocking
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+
+
+def _unlock_fd(fd: int) -> None:
+    """Release a lock taken with _lock_fd."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Advisory lock on a file between processes, re-entrant within one.
+
+    Writers take it exclusively; readers may share it with each other. Threads
+    of the same process queue on an RLock first, so only one of them holds the
+    operating system lock at a time and nested acquire() calls by the owning
+    thread do not block; they keep the mode of the outermost acquire().
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the lock; the lock file is created on first use.
+
+        Args:
+            path: Lock file, e.g. dictionary.json.lock
+        """
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True, shared: bool = False) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            blocking: Wait for other threads and processes; otherwise give up at once
+            shared: Only exclude exclusive holders in other processes, for reading
+
+        Returns:
+            True if the lock is now held, False if it was busy and blocking is False
+        """
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if not _lock_fd(self._fd, blocking, shared):
+                    self._thread_lock.release()
+                    return False
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        """Release one acquire(); the file lock is dropped with the outermost one."""
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_fd(self._fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def close(self) -> None:
+        """Close the lock file; the lock must not be held."""
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class VersionStamp:
+    """File holding the dictionary version of the last write by any process."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the stamp.
+
+        Args:
+            path: Stamp file, e.g. dictionary.json.version
+        """
+        self.path = Path(path)
+
+    def read(self) -> Optional[int]:
+        """
+        Read the published version.
+
+        Returns:
+            The version, or None if no process has written one yet
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, version: int) -> None:
+        """
+        Publish a version; call with the FileLock held, after the data is written.
+
+        Args:
+            version: Dictionary version that matches the data now in storage
+        """
+        atomic_write_json(self.path, version, indent=None)
@@ -0,0 +1,285 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from services.metrics import BYTES_WRITTEN
+from services.normalization import decode_dictionary, encode_dictionary, ensure_normalized
+
+# File layout (all integers little-endian uint32):
+#
+#   header        magic "TDBS", version (u16), reserved (u16), word count
+#   english table English keys in sorted order
+#   thai table    Thai translations, aligned with the english table
+#   category tbl  Distinct categories
+#   category ids  One per word (sorted order); NO_CATEGORY for None
+#   order         Sorted index of each word in dictionary order
+#
+# A string table is: count, blob length, count + 1 offsets, then the UTF-8
+# blob of NUL-terminated strings padded to 4 bytes. The offsets give O(1)
+# random access to one string; the NUL separators let a whole table be
+# decoded with a single decode() and split().
+MAGIC = b"TDBS"
+VERSION = 1
+NO_CATEGORY = 0xFFFFFFFF
+_HEADER = struct.Struct("<4sHHI")
+_U32 = struct.Struct("<I")
+
+
+def _u32_array(data) -> array:
+    """Build a uint32 array from little-endian bytes."""
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _u32_bytes(values: List[int]) -> bytes:
+    """Encode integers as little-endian uint32 bytes."""
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _string_table(strings: List[str]) -> bytes:
+    """Encode a string table (see the layout notes above)."""
+    offsets = [0]
+    chunks = []
+    for text in strings:
+        if "\x00" in text:
+            raise ValueError("Snapshot strings cannot contain NUL characters")
+        encoded = text.encode("utf-8") + b"\x00"
+        chunks.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+    blob = b"".join(chunks)
+    padding = b"\x00" * (-len(blob) % 4)
+    return _U32.pack(len(strings)) + _U32.pack(len(blob)) + _u32_bytes(offsets) + blob + padding
+
+
+def write_snapshot(path: Path, words: Dict[str, Dict[str, str]]) -> None:
+    """
+    Write a dictionary as a binary snapshot, atomically.
+
+    Args:
+        path: Destination file
+        words: Dictionary data in dictionary order
+
+    Raises:
+        ValueError: If a string contains a NUL character
+    """
+    path = Path(path)
+    sorted_keys = sorted(words)
+    sorted_index = {english: i for i, english in enumerate(sorted_keys)}
+
+    categories: Dict[str, int] = {}
+    category_ids = []
+    for english in sorted_keys:
+        category = words[english].get("category")
+        if category is None:
+            category_ids.append(NO_CATEGORY)
+        else:
+            category_ids.append(categories.setdefault(category, len(categories)))
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, 0, len(words)),
+        _string_table(sorted_keys),
+        _string_table([words[english]["thai"] for english in sorted_keys]),
+        _string_table(list(categories)),
+        _u32_bytes(category_ids),
+        _u32_bytes([sorted_index[english] for english in words]),
+    ]
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in parts:
+                f.write(part)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp_path, path)
+        BYTES_WRITTEN.inc(size, kind="snapshot")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class _StringTable:
+    """Lazy view of one string table inside the mapped file."""
+
+    def __init__(self, buffer: mmap.mmap, start: int):
+        self._buffer = buffer
+        self.count, blob_length = struct.unpack_from("<II", buffer, start)
+        offsets_start = start + 8
+        self._blob_start = offsets_start + 4 * (self.count + 1)
+        self._offsets = _u32_array(buffer[offsets_start:self._blob_start])
+        self._blob_length = blob_length
+        self.end = self._blob_start + blob_length + (-blob_length % 4)
+
+    def __getitem__(self, i: int) -> str:
+        start = self._blob_start + self._offsets[i]
+        end = self._blob_start + self._offsets[i + 1] - 1  # drop the NUL
+        return self._buffer[start:end].decode("utf-8")
+
+    def all(self) -> List[str]:
+        """Decode the whole table at once."""
+        if not self.count:
+            return []
+        blob = self._buffer[self._blob_start:self._blob_start + self._blob_length - 1]
+        return blob.decode("utf-8").split("\x00")
+
+
+class SnapshotReader:
+    """
+    Memory-mapped reader for binary snapshots.
+
+    Opening a snapshot only parses the header and offset tables. Single
+    words are decoded on demand with a binary search over the sorted
+    English keys, and load_all() decodes everything in a few bulk passes.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open and map a snapshot file.
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Snapshot file is empty: {self.path}")
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, self._count = _HEADER.unpack_from(self._buffer, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a version {VERSION} dictionary snapshot: {self.path}")
+            self._english = _StringTable(self._buffer, _HEADER.size)
+            self._thai = _StringTable(self._buffer, self._english.end)
+            self._categories = _StringTable(self._buffer, self._thai.end)
+            ids_start = self._categories.end
+            order_start = ids_start + 4 * self._count
+            self._category_ids = _u32_array(self._buffer[ids_start:order_start])
+            self._order = _u32_array(self._buffer[order_start:order_start + 4 * self._count])
+        except (struct.error, IndexError) as e:
+            self.close()
+            raise ValueError(f"Corrupt dictionary snapshot {self.path}: {e}")
+        except ValueError:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _entry(self, i: int) -> Dict[str, str]:
+        """Decode the entry at a sorted index."""
+        category_id = self._category_ids[i]
+        return {
+            "thai": self._thai[i],
+            "category": None if category_id == NO_CATEGORY else self._categories[category_id]
+        }
+
+    def get(self, english: str) -> Optional[Dict[str, str]]:
+        """
+        Look up one word without decoding the rest of the snapshot.
+
+        Args:
+            english: Normalized English key
+
+        Returns:
+            Entry with thai and category, or None if the key is not present
+        """
+        i = bisect_left(_LazyKeys(self._english), english)
+        if i < self._count and self._english[i] == english:
+            return self._entry(i)
+        return None
+
+    def load_all(self) -> Dict[str, Dict[str, str]]:
+        """
+        Decode every word.
+
+        Returns:
+            Dictionary data in dictionary order
+        """
+        english = self._english.all()
+        thai = self._thai.all()
+        categories = dict(enumerate(self._categories.all()))
+        categories[NO_CATEGORY] = None
+        category = list(map(categories.__getitem__, self._category_ids))
+        return {
+            english[i]: {"thai": thai[i], "category": category[i]}
+            for i in self._order
+        }
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._buffer.close()
+
+
+class _LazyKeys:
+    """Sequence adapter so bisect can search a string table without decoding it all."""
+
+    def __init__(self, table: _StringTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return self._table.count
+
+    def __getitem__(self, i: int) -> str:
+        return self._table[i]
+
+
+def read_snapshot(path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Read a whole snapshot file.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Dictionary data in dictionary order
+    """
+    with SnapshotReader(path) as reader:
+        return reader.load_all()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Convert between dictionary.json and the binary snapshot format."""
+    parser = argparse.ArgumentParser(description="Convert a dictionary between JSON and binary snapshot.")
+    parser.add_argument("direction", choices=["to-snapshot", "to-json"])
+    parser.add_argument("source", type=Path)
+    parser.add_argument("target", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.direction == "to-snapshot":
+        with open(args.source, "r", encoding="utf-8") as f:
+            words, _ = decode_dictionary(json.load(f))
+        write_snapshot(args.target, words)
+    else:
+        words = read_snapshot(args.source)
+        ensure_normalized(words)
+        with open(args.target, "w", encoding="utf-8") as f:
+            json.dump(encode_dictionary(words), f, ensure_ascii=False, indent=4)
+    print(f"Converted {len(words)} words: {args.source} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
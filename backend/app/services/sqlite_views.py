@@ -0,0 +1,187 @@
+from collections.abc import ItemsView, Mapping, MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import sqlite3
+from services.normalization import make_entry
+
+# Rows fetched per query when iterating over every word
+FETCH_SIZE = 1000
+
+
+def _prefix_end(prefix: str) -> Optional[str]:
+    """Return the smallest string above every string that starts with the prefix, or None if unbounded."""
+    while prefix and prefix[-1] == '\U0010ffff':
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SqliteWords(MutableMapping):
+    """
+    Live view of the words table that stands in for the in-memory dictionary.
+
+    Reading a word runs one indexed query, and iterating fetches the words
+    in stored order a chunk at a time, so the dictionary never has to fit in
+    memory. Writes go straight to the database as journal records.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, write: Callable[[List[Dict]], None]):
+        """
+        Initialize the view.
+
+        Args:
+            conn: Connection to the database
+            write: Callback that applies journal records in one transaction,
+                see SqliteStorage.write
+        """
+        self._conn = conn
+        self._write = write
+
+    def __getitem__(self, key: str) -> Dict[str, Optional[str]]:
+        row = self._conn.execute("SELECT thai, category FROM words WHERE english = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return make_entry(*row)
+
+    def __contains__(self, key) -> bool:
+        return self._conn.execute("SELECT 1 FROM words WHERE english = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def _rows(self) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Yield (english, thai, category) in stored order, without keeping a statement open in between."""
+        position = -1
+        while True:
+            rows = self._conn.execute(
+                "SELECT english, thai, category, position FROM words WHERE position > ? "
+                "ORDER BY position LIMIT ?",
+                (position, FETCH_SIZE)
+            ).fetchall()
+            for english, thai, category, _ in rows:
+                yield english, thai, category
+            if len(rows) < FETCH_SIZE:
+                return
+            position = rows[-1][3]
+
+    def __iter__(self) -> Iterator[str]:
+        return (english for english, _, _ in self._rows())
+
+    def items(self) -> "SqliteItems":
+        return SqliteItems(self)
+
+    def __setitem__(self, key: str, entry: Dict[str, Optional[str]]) -> None:
+        self._write([{"op": "put", "english": key, **entry}])
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._write([{"op": "delete", "english": key}])
+
+    def update(self, words: Mapping) -> None:
+        """Store many entries in one transaction."""
+        self._write([{"op": "put", "english": key, **entry} for key, entry in words.items()])
+
+    def clear(self) -> None:
+        self._write([{"op": "clear"}])
+
+
+class SqliteItems(ItemsView):
+    """(english, entry) pairs of a SqliteWords view, read a chunk at a time."""
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Optional[str]]]]:
+        return ((english, make_entry(thai, category)) for english, thai, category in self._mapping._rows())
+
+
+class SqliteOrderIndex:
+    """
+    Keys ordered by a text column, with the query methods of PrefixIndex.
+
+    The column's database index answers the queries, so nothing has to be
+    built in memory; add() and remove() do nothing because every write
+    already updates the table.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, column: str):
+        """
+        Initialize the index.
+
+        Args:
+            conn: Connection to the database
+            column: Indexed column holding the normalized text, 'english' or 'thai_norm'
+        """
+        self._conn = conn
+        self._column = column
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def add(self, key: str, text: str) -> None:
+        pass
+
+    def remove(self, key: str) -> None:
+        pass
+
+    def _keys(self, where: str, args: Tuple, limit: int = -1, descending: bool = False) -> List[str]:
+        """Return english keys matching a condition, in (column, english) order."""
+        direction = " DESC" if descending else ""
+        rows = self._conn.execute(
+            f"SELECT english FROM words WHERE {where} "
+            f"ORDER BY {self._column}{direction}, english{direction} LIMIT ?",
+            args + (limit,)
+        )
+        return [english for english, in rows]
+
+    def prefix(self, prefix: str, limit: int) -> List[str]:
+        """See PrefixIndex.prefix."""
+        end = _prefix_end(prefix)
+        if end is None:
+            return self._keys(f"{self._column} >= ?", (prefix,), limit)
+        return self._keys(f"{self._column} >= ? AND {self._column} < ?", (prefix, end), limit)
+
+    def exact(self, text: str) -> List[str]:
+        """See PrefixIndex.exact."""
+        return self._keys(f"{self._column} = ?", (text,))
+
+    def keys_after(self, text: Optional[str], limit: int) -> List[str]:
+        """See PrefixIndex.keys_after."""
+        if text is None:
+            return self._keys("1", (), limit)
+        return self._keys(f"{self._column} > ?", (text,), limit)
+
+    def keys(self, reverse: bool = False) -> List[str]:
+        """See PrefixIndex.keys."""
+        return self._keys("1", (), descending=reverse)
+
+
+class SqliteCategoryIndex:
+    """Categories answered from the category column, with the query methods of CategoryIndex."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the index.
+
+        Args:
+            conn: Connection to the database
+        """
+        self._conn = conn
+
+    def add(self, key: str, category: Optional[str]) -> None:
+        pass
+
+    def remove(self, key: str) -> None:
+        pass
+
+    def keys(self, category: str) -> List[str]:
+        """See CategoryIndex.keys."""
+        rows = self._conn.execute(
+            "SELECT english FROM words WHERE category = ? ORDER BY position", (category,)
+        )
+        return [english for english, in rows]
+
+    def counts(self) -> List[Tuple[str, int]]:
+        """See CategoryIndex.counts."""
+        return self._conn.execute(
+            "SELECT category, COUNT(*) FROM words WHERE category IS NOT NULL "
+            "GROUP BY category ORDER BY category"
+        ).fetchall()
@@ -0,0 +1,692 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+from services.journal import Journal, atomic_write_json
+from services.normalization import (
+    FORMAT_VERSION, decode_dictionary, encode_dictionary, ensure_normalized, normalize_text
+)
+from services.snapshot import SnapshotReader, write_snapshot
+from services.sqlite_views import SqliteCategoryIndex, SqliteOrderIndex, SqliteWords
+
+# Get the directory where the current file (storage.py) is located,
+# go up one level to the app root directory and then into data
+DEFAULT_DATA_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent.parent / "data"
+
+
+class StorageBackend(ABC):
+    """
+    Persistence layer behind DictionaryService.
+
+    The service keeps the working copy of the dictionary in memory and
+    calls the backend to load it, to persist individual mutations and to
+    rewrite everything when the word order changes. Mutations are passed as
+    journal records (see services.journal.apply_record).
+    """
+
+    @abstractmethod
+    def load(self) -> Dict[str, Dict[str, str]]:
+        """
+        Load the whole dictionary in its stored order.
+
+        Raises:
+            ValueError: If the stored data cannot be parsed
+        """
+
+    @abstractmethod
+    def has_changed(self) -> bool:
+        """Whether the stored data was modified by someone else since our last load or write."""
+
+    def read_changes(self) -> Optional[List[Dict]]:
+        """
+        Read the mutations written by someone else since our last load, write or read_changes().
+
+        Lets the service apply another process's writes instead of loading
+        the whole dictionary again.
+
+        Returns:
+            Journal records in order, or None if they are not available and
+            the dictionary has to be loaded again, e.g. after a compaction
+        """
+        return None
+
+    @property
+    def writes_all_words(self) -> bool:
+        """Whether write() rewrites the whole dictionary and so needs its words argument."""
+        return False
+
+    @property
+    def serves_words(self) -> bool:
+        """
+        Whether load() returns a live view of the stored words instead of a copy.
+
+        Changes to the view are written to storage right away, so the service
+        does not call write() for them and never holds every word in memory.
+        """
+        return False
+
+    def begin(self) -> None:
+        """Start a group of writes to a served view that commit() makes visible and durable together."""
+
+    def commit(self) -> None:
+        """
+        End the group of writes started by begin().
+
+        Raises:
+            Exception: Whatever the storage raised; the group is then discarded
+        """
+
+    def prefix_indexes(self) -> Optional[Tuple]:
+        """
+        Return indexes the storage answers itself, in place of the service's English and Thai PrefixIndex.
+
+        Returns:
+            Pair of objects with PrefixIndex's methods, or None to build them in memory
+        """
+        return None
+
+    def category_index(self):
+        """
+        Return an index the storage answers itself, in place of the service's CategoryIndex.
+
+        Returns:
+            Object with CategoryIndex's methods, or None to build one in memory
+        """
+        return None
+
+    @abstractmethod
+    def write(self, words: Optional[Dict[str, Dict[str, str]]], records: Iterable[Dict]) -> None:
+        """
+        Persist mutations that were already applied to words.
+
+        Args:
+            words: The full, already updated dictionary; may be None unless
+                writes_all_words is set
+            records: Journal records describing the mutations
+        """
+
+    @abstractmethod
+    def replace_all(self, words: Dict[str, Dict[str, str]]) -> None:
+        """
+        Overwrite the stored dictionary, including its order.
+
+        Args:
+            words: The full dictionary
+        """
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether compact() should be scheduled."""
+        return False
+
+    def compact(self, words: Dict[str, Dict[str, str]]) -> None:
+        """
+        Reclaim space used by incremental writes.
+
+        Args:
+            words: The full dictionary
+        """
+
+    def search(self, term: str) -> Optional[List[str]]:
+        """
+        Find candidate keys for a normalized substring search term.
+
+        Args:
+            term: Normalized search term
+
+        Returns:
+            Candidate keys in stored order (a superset of the real matches),
+            or None if the backend cannot search for this term
+        """
+        return None
+
+    def close(self) -> None:
+        """Release open files and connections."""
+
+
+class JsonStorage(StorageBackend):
+    """Dictionary stored as one JSON file, optionally with an append-only journal."""
+
+    def __init__(self, path: Path, journal: bool = False, fsync: bool = False,
+                 compact_threshold: int = 1000):
+        """
+        Initialize JSON storage.
+
+        Args:
+            path: Path to the JSON file
+            journal: Append mutations to a log file instead of rewriting the whole file
+            fsync: Force each journal record to disk before the write returns
+            compact_threshold: Number of journal records after which compaction is due
+        """
+        self.path = Path(path)
+        # In journal mode the JSON file is a snapshot and mutations since then live in the log
+        self._journal: Optional[Journal] = None
+        if journal:
+            self._journal = Journal(self._journal_path(), fsync=fsync)
+        self.compact_threshold = compact_threshold
+        # Set by _read_snapshot when the file has to be migrated to the current format
+        self._outdated_format = False
+        # (mtime_ns, inode, size) of the files as of our last load or write
+        self._signature: Optional[Tuple] = None
+
+    def _journal_path(self) -> Path:
+        """Return the path of the journal that belongs to the snapshot file."""
+        return self.path.with_suffix(".journal")
+
+    def _read_snapshot(self) -> Dict[str, Dict[str, str]]:
+        """
+        Read the snapshot file.
+        
+        A file in an older format is loaded with its missing normalized
+        forms computed and flagged for rewriting in the current format.
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            words, version = decode_dictionary(json.load(f))
+        ensure_normalized(words)
+        self._outdated_format = version < FORMAT_VERSION
+        return words
+
+    def _write_snapshot(self, words: Dict[str, Dict[str, str]]) -> None:
+        """Write the snapshot file atomically in the current format."""
+        atomic_write_json(self.path, encode_dictionary(words))
+
+    def _read_signature(self) -> Tuple:
+        """
+        Read a cheap fingerprint of the JSON file and its journal.
+
+        Returns:
+            Tuple holding (mtime_ns, inode, size) per file, or None for a missing file
+        """
+        paths = [self.path]
+        if self._journal is not None:
+            paths.append(self._journal.path)
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_ino, stat.st_size))
+        return tuple(signature)
+
+    def load(self) -> Dict[str, Dict[str, str]]:
+        """Load the JSON file, replaying the journal on top if enabled."""
+        if not self.path.exists():
+            print(f"Dictionary file not found at: {self.path}")
+            # Create directory if it doesn't exist
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            words = {}
+            if self._journal is not None:
+                self._journal.replay(words)
+            self.replace_all(words)
+            return words
+
+        signature = self._read_signature()
+        words = self._read_snapshot()
+        if self._journal is not None:
+            self._journal.replay(words)
+        self._signature = signature
+        if self._outdated_format:
+            print(f"Migrating {self.path} to dictionary format {FORMAT_VERSION}")
+            self.replace_all(words)
+            self._outdated_format = False
+        return words
+
+    def has_changed(self) -> bool:
+        return self._read_signature() != self._signature
+
+    def read_changes(self) -> Optional[List[Dict]]:
+        """Read the records appended to the journal, as long as the snapshot is unchanged."""
+        if self._journal is None or self._signature is None:
+            return None
+        signature = self._read_signature()
+        if signature[0] != self._signature[0]:
+            # The snapshot was rewritten, e.g. by a compaction that folded the log into it
+            return None
+        journal, seen_journal = signature[1], self._signature[1]
+        if seen_journal is not None and (journal is None or journal[1] != seen_journal[1]):
+            return None
+        records = self._journal.read_new()
+        if records is not None:
+            self._signature = signature
+        return records
+
+    @property
+    def writes_all_words(self) -> bool:
+        return self._journal is None
+
+    def write(self, words: Optional[Dict[str, Dict[str, str]]], records: Iterable[Dict]) -> None:
+        """Append the records to the journal, or rewrite the file without one."""
+        if self._journal is None:
+            self.replace_all(words)
+            return
+        self._journal.append(*records)
+        self._signature = self._read_signature()
+
+    def replace_all(self, words: Dict[str, Dict[str, str]]) -> None:
+        """Write the JSON file atomically, folding in the journal if enabled."""
+        self._write_snapshot(words)
+        if self._journal is not None:
+            self._journal.truncate()
+        self._signature = self._read_signature()
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._journal is not None and self._journal.entries >= self.compact_threshold
+
+    def compact(self, words: Dict[str, Dict[str, str]]) -> None:
+        """Fold the journal into a fresh snapshot and empty the log."""
+        if self._journal is not None and self._journal.entries:
+            self.replace_all(words)
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+
+
+class BinarySnapshotStorage(JsonStorage):
+    """
+    Dictionary stored as a binary snapshot plus an append-only journal.
+
+    The snapshot (see services.snapshot) is decoded without a JSON parser,
+    which keeps cold starts short for large dictionaries. Mutations always
+    go to the journal and are folded into a new snapshot on compaction.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False, compact_threshold: int = 1000):
+        """
+        Initialize snapshot storage.
+
+        Args:
+            path: Path to the snapshot file
+            fsync: Force each journal record to disk before the write returns
+            compact_threshold: Number of journal records after which compaction is due
+        """
+        super().__init__(path, journal=True, fsync=fsync, compact_threshold=compact_threshold)
+
+    def _journal_path(self) -> Path:
+        # Kept apart from dictionary.journal so switching backends never
+        # replays another snapshot's log
+        return self.path.with_suffix(self.path.suffix + ".journal")
+
+    def _read_snapshot(self) -> Dict[str, Dict[str, str]]:
+        # The binary format only holds the displayed text; normalized forms are rebuilt
+        with SnapshotReader(self.path) as reader:
+            words = reader.load_all()
+        ensure_normalized(words)
+        return words
+
+    def _write_snapshot(self, words: Dict[str, Dict[str, str]]) -> None:
+        write_snapshot(self.path, words)
+
+
+class SqliteStorage(StorageBackend):
+    """
+    Dictionary stored in an SQLite database.
+
+    The database runs in WAL mode so readers in other processes never block
+    the writer. Words keep their dictionary order in a position column, the
+    english and category columns are indexed, and an FTS5 trigram table
+    mirrors the normalized text columns for substring search, so it finds
+    whatever the service's own search matches. Every write is also logged
+    in a bounded changes table, from which other processes catch up.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS words (
+            id INTEGER PRIMARY KEY,
+            english TEXT NOT NULL UNIQUE,
+            thai TEXT NOT NULL,
+            category TEXT,
+            position INTEGER NOT NULL,
+            thai_norm TEXT,
+            category_norm TEXT
+        );
+        CREATE INDEX IF NOT EXISTS words_category ON words(category);
+        CREATE INDEX IF NOT EXISTS words_position ON words(position);
+        CREATE TABLE IF NOT EXISTS changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            record TEXT NOT NULL
+        );
+    """
+
+    # Recent mutations kept in the changes table for other processes to catch up from
+    CHANGE_LOG_ROWS = 10000
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+            english, thai_norm, category_norm, content='words', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts(rowid, english, thai_norm, category_norm)
+            VALUES (new.id, new.english, new.thai_norm, new.category_norm);
+        END;
+        CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, english, thai_norm, category_norm)
+            VALUES ('delete', old.id, old.english, old.thai_norm, old.category_norm);
+        END;
+        CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, english, thai_norm, category_norm)
+            VALUES ('delete', old.id, old.english, old.thai_norm, old.category_norm);
+            INSERT INTO words_fts(rowid, english, thai_norm, category_norm)
+            VALUES (new.id, new.english, new.thai_norm, new.category_norm);
+        END;
+    """
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path: Path to the database file
+            fsync: Sync the WAL on every commit instead of only at checkpoints
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The service serializes access with its own lock, so the connection
+        # may be shared with its background threads
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        # Nesting of _transaction(); the outermost one, or begin(), holds the transaction
+        self._transaction_depth = 0
+        self._conn.executescript(self.SCHEMA)
+        added_columns = self._add_normalized_columns()
+        try:
+            self._conn.executescript(self.FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError as e:
+            # FTS5 or its trigram tokenizer (SQLite 3.34+) is not compiled in
+            print(f"Full-text search unavailable: {e}")
+            self._fts = False
+        if added_columns and self._fts:
+            self._conn.execute("INSERT INTO words_fts(words_fts) VALUES ('rebuild')")
+        # Only once the column exists in databases from before it
+        self._conn.execute("CREATE INDEX IF NOT EXISTS words_thai_norm ON words(thai_norm, english)")
+        self._data_version: Optional[int] = None
+        # Last row of the changes table this connection has read or written,
+        # or None if rows from other connections may have been skipped
+        self._change_id: Optional[int] = None
+
+    def _add_normalized_columns(self) -> bool:
+        """
+        Upgrade a database whose full-text index still covers the raw text columns.
+
+        Adds and fills the thai_norm and category_norm columns and drops the
+        old index and its triggers, so FTS_SCHEMA recreates them.
+
+        Returns:
+            True if the database was upgraded and the index must be rebuilt
+        """
+        with self._transaction():
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(words)")}
+            if "thai_norm" in columns:
+                return False
+            self._conn.execute("ALTER TABLE words ADD COLUMN thai_norm TEXT")
+            self._conn.execute("ALTER TABLE words ADD COLUMN category_norm TEXT")
+            rows = self._conn.execute("SELECT id, thai, category FROM words").fetchall()
+            self._conn.executemany(
+                "UPDATE words SET thai_norm = ?, category_norm = ? WHERE id = ?",
+                (
+                    (normalize_text(thai), normalize_text(category) if category else None, row_id)
+                    for row_id, thai, category in rows
+                )
+            )
+            for trigger in ("words_fts_insert", "words_fts_delete", "words_fts_update"):
+                self._conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self._conn.execute("DROP TABLE IF EXISTS words_fts")
+        return True
+
+    def _read_data_version(self) -> int:
+        """Return SQLite's counter of commits made by other connections."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _last_change_id(self) -> int:
+        """Return the id of the newest row ever added to the changes table."""
+        row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+        return row[0] if row else 0
+
+    def _log_changes(self, records: List[Dict]) -> None:
+        """Add records to the changes table and drop old ones; call inside a transaction."""
+        if self._last_change_id() != self._change_id:
+            # Another connection wrote rows we have not read
+            self._change_id = None
+        self._conn.executemany(
+            "INSERT INTO changes (record) VALUES (?)",
+            ((json.dumps(record, ensure_ascii=False, separators=(',', ':')),) for record in records)
+        )
+        last_id = self._last_change_id()
+        self._conn.execute("DELETE FROM changes WHERE id <= ?", (last_id - self.CHANGE_LOG_ROWS,))
+        if self._change_id is not None:
+            self._change_id = last_id
+
+    def load(self) -> SqliteWords:
+        """Return a live view of the words table; nothing is read up front."""
+        self._data_version = self._read_data_version()
+        self._change_id = self._last_change_id()
+        return SqliteWords(self._conn, lambda records: self.write(None, records))
+
+    @property
+    def serves_words(self) -> bool:
+        return True
+
+    def prefix_indexes(self) -> Tuple[SqliteOrderIndex, SqliteOrderIndex]:
+        return SqliteOrderIndex(self._conn, "english"), SqliteOrderIndex(self._conn, "thai_norm")
+
+    def category_index(self) -> SqliteCategoryIndex:
+        return SqliteCategoryIndex(self._conn)
+
+    def has_changed(self) -> bool:
+        return self._read_data_version() != self._data_version
+
+    def read_changes(self) -> Optional[List[Dict]]:
+        """Read the rows other connections added to the changes table."""
+        if self._change_id is None:
+            return None
+        data_version = self._read_data_version()
+        rows = self._conn.execute(
+            "SELECT id, record FROM changes WHERE id > ? ORDER BY id", (self._change_id,)
+        ).fetchall()
+        if not rows or rows[0][0] != self._change_id + 1:
+            # Changed without a log entry (e.g. by hand), or the entries were already dropped
+            return None
+        records = [json.loads(record) for _, record in rows]
+        if any(record["op"] == "replace" for record in records):
+            return None
+        self._change_id = rows[-1][0]
+        self._data_version = data_version
+        return records
+
+    def write(self, words: Optional[Dict[str, Dict[str, str]]], records: Iterable[Dict]) -> None:
+        """Apply the records as single-row statements in one transaction."""
+        records = list(records)
+        with self._transaction():
+            for record in records:
+                op = record["op"]
+                if op == "put":
+                    self._conn.execute(
+                        "INSERT INTO words (english, thai, category, position, thai_norm, category_norm) "
+                        "VALUES (?, ?, ?, (SELECT IFNULL(MAX(position), -1) + 1 FROM words), ?, ?) "
+                        "ON CONFLICT(english) DO UPDATE SET thai = excluded.thai, category = excluded.category, "
+                        "thai_norm = excluded.thai_norm, category_norm = excluded.category_norm",
+                        (
+                            record["english"], record["thai"], record.get("category"),
+                            record["thai_norm"], record["category_norm"]
+                        )
+                    )
+                elif op == "delete":
+                    self._conn.execute("DELETE FROM words WHERE english = ?", (record["english"],))
+                elif op == "clear":
+                    self._conn.execute("DELETE FROM words")
+                else:
+                    raise ValueError(f"Unknown journal operation: {op}")
+            self._log_changes(records)
+
+    def replace_all(self, words: Dict[str, Dict[str, str]]) -> None:
+        with self._transaction():
+            self._conn.execute("DELETE FROM words")
+            self._conn.executemany(
+                "INSERT INTO words (english, thai, category, position, thai_norm, category_norm) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (english, data["thai"], data.get("category"), position, data["thai_norm"], data["category_norm"])
+                    for position, (english, data) in enumerate(words.items())
+                )
+            )
+            # Other connections cannot catch up with a rewrite and have to load everything
+            self._log_changes([{"op": "replace"}])
+            self._change_id = self._last_change_id()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run the enclosed statements in one write transaction, rolled back on error.
+
+        Inside an open transaction, e.g. one started by begin(), the
+        statements run in a savepoint instead, so they still take effect
+        completely or not at all.
+        """
+        if self._transaction_depth:
+            start, undo, end = "SAVEPOINT nested", ("ROLLBACK TO nested", "RELEASE nested"), "RELEASE nested"
+        else:
+            start, undo, end = "BEGIN IMMEDIATE", ("ROLLBACK",), "COMMIT"
+        self._conn.execute(start)
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            for statement in undo:
+                self._conn.execute(statement)
+            raise
+        finally:
+            self._transaction_depth -= 1
+        self._conn.execute(end)
+
+    def begin(self) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+
+    def commit(self) -> None:
+        self._transaction_depth -= 1
+        try:
+            self._conn.execute("COMMIT")
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def compact(self, words: Dict[str, Dict[str, str]]) -> None:
+        """Fold the WAL back into the main database file."""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def search(self, term: str) -> Optional[List[str]]:
+        """
+        Use the FTS5 trigram index.
+
+        Terms under three characters have no trigram, so those, and every
+        term without FTS5, are matched by scanning the normalized columns.
+        """
+        if not self._fts or len(term) < 3:
+            rows = self._conn.execute(
+                "SELECT english FROM words WHERE instr(english, ?) OR instr(thai_norm, ?) "
+                "OR instr(IFNULL(category_norm, ''), ?) ORDER BY position",
+                (term, term, term)
+            ).fetchall()
+            return [english for english, in rows]
+        rows = self._conn.execute(
+            "SELECT words.english FROM words_fts JOIN words ON words.id = words_fts.rowid "
+            "WHERE words_fts MATCH ? ORDER BY words.position",
+            ('"' + term.replace('"', '""') + '"',)
+        ).fetchall()
+        return [english for english, in rows]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def migrate_json_to_sqlite(json_path: Path, db_path: Path) -> int:
+    """
+    Copy a JSON dictionary (and its journal, if any) into an SQLite database.
+
+    Args:
+        json_path: Existing JSON dictionary file
+        db_path: Database file to create or overwrite
+
+    Returns:
+        Number of words copied
+    """
+    source = JsonStorage(json_path, journal=Path(json_path).with_suffix(".journal").exists())
+    words = source.load()
+    source.close()
+    target = SqliteStorage(db_path)
+    target.replace_all(words)
+    target.close()
+    return len(words)
+
+
+def migrate_json_to_snapshot(json_path: Path, snapshot_path: Path) -> int:
+    """
+    Copy a JSON dictionary (and its journal, if any) into a binary snapshot.
+
+    Args:
+        json_path: Existing JSON dictionary file
+        snapshot_path: Snapshot file to create or overwrite
+
+    Returns:
+        Number of words copied
+    """
+    source = JsonStorage(json_path, journal=Path(json_path).with_suffix(".journal").exists())
+    words = source.load()
+    source.close()
+    write_snapshot(snapshot_path, words)
+    return len(words)
+
+
+def create_storage(kind: str, data_dir: Path, fsync: bool = False) -> StorageBackend:
+    """
+    Create the storage backend selected in configuration.
+
+    Args:
+        kind: 'json', 'journal', 'snapshot' or 'sqlite'
+        data_dir: Directory holding dictionary.json / dictionary.tdb / dictionary.db
+        fsync: Force every write to disk before it returns
+
+    Returns:
+        Storage backend; for 'snapshot' and 'sqlite' a missing file is first
+        migrated from dictionary.json if that file exists
+
+    Raises:
+        ValueError: If kind is unknown
+    """
+    data_dir = Path(data_dir)
+    json_path = data_dir / "dictionary.json"
+    if kind == "json":
+        return JsonStorage(json_path, fsync=fsync)
+    if kind == "journal":
+        return JsonStorage(json_path, journal=True, fsync=fsync)
+    if kind == "snapshot":
+        snapshot_path = data_dir / "dictionary.tdb"
+        if not snapshot_path.exists() and json_path.exists():
+            count = migrate_json_to_snapshot(json_path, snapshot_path)
+            print(f"Migrated {count} words from {json_path} to {snapshot_path}")
+        return BinarySnapshotStorage(snapshot_path, fsync=fsync)
+    if kind == "sqlite":
+        db_path = data_dir / "dictionary.db"
+        if not db_path.exists() and json_path.exists():
+            count = migrate_json_to_sqlite(json_path, db_path)
+            print(f"Migrated {count} words from {json_path} to {db_path}")
+        return SqliteStorage(db_path, fsync=fsync)
+    raise ValueError(f"Unknown storage backend: {kind}. Must be 'json', 'journal', 'snapshot', or 'sqlite'")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy a JSON dictionary into an SQLite database.")
+    parser.add_argument("json_path", type=Path)
+    parser.add_argument("db_path", type=Path)
+    args = parser.parse_args()
+    print(f"Migrated {migrate_json_to_sqlite(args.json_path, args.db_path)} words")
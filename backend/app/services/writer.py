@@ -0,0 +1,87 @@
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+import queue
+import threading
+
+
+class WriteQueue:
+    """
+    Single writer thread for dictionary mutations.
+
+    Mutations submitted while the writer is busy pile up in the queue. The
+    writer takes everything that is waiting, applies it inside one
+    DictionaryService.batch() and so persists the whole group with a single
+    flush. A caller's future resolves only after that flush, so a successful
+    result means the change is on disk.
+    """
+
+    def __init__(self, service):
+        """
+        Initialize the queue.
+
+        Args:
+            service: DictionaryService whose mutations are serialized
+        """
+        self._service = service
+        self._queue: "queue.Queue[Tuple[Callable, tuple, dict, Future] | None]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="dictionary-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a mutation.
+
+        Args:
+            fn: Bound DictionaryService method to call
+            args: Positional arguments for fn
+            kwargs: Keyword arguments for fn
+
+        Returns:
+            Future that resolves to fn's return value once it has been persisted
+        """
+        future: Future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def stop(self) -> None:
+        """Finish the queued mutations and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Writer loop: take every waiting mutation, apply them, flush once."""
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                running = False
+                items = [item for item in items if item is not None]
+            if items:
+                self._apply(items)
+
+    def _apply(self, items: List[Tuple[Callable, tuple, dict, Future]]) -> None:
+        """Apply a group of mutations and persist them together."""
+        results = []
+        try:
+            with self._service.batch():
+                for fn, args, kwargs, future in items:
+                    try:
+                        results.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        results.append((future, None, e))
+        except Exception as e:
+            # The flush failed, so none of the group was persisted
+            for future, _, _ in results:
+                future.set_exception(e)
+            return
+
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
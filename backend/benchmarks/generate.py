@@ -0,0 +1,107 @@
+"""
+Synthetic dictionary generator for benchmarks.
+
+Words are built from random syllables so they look and sort like real
+entries: English keys are unique lowercase words, sometimes two-word
+phrases or hyphenated; Thai translations are one to three syllables with
+leading vowels and tone marks; most words belong to one of a few dozen
+categories, some have none.
+
+Usage:
+    python generate.py 10000 dictionary.json [--seed 42]
+"""
+from typing import Dict, Optional
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from services.normalization import encode_dictionary, make_entry  # noqa: E402
+
+ENGLISH_ONSETS = ["b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w",
+                  "br", "ch", "cl", "cr", "dr", "fl", "gr", "pl", "pr", "sh", "sl", "st", "th", "tr"]
+ENGLISH_VOWELS = ["a", "e", "i", "o", "u", "ai", "ea", "ee", "oo", "ou", "ie"]
+ENGLISH_CODAS = ["", "", "n", "r", "t", "s", "l", "ck", "nd", "ng", "st", "ght"]
+
+THAI_CONSONANTS = list("กขคงจฉชซดตถทนบปผพฟมยรลวสหอฮ")
+THAI_VOWELS = ["า", "ิ", "ี", "ุ", "ู", "ะ", "ำ", "ื", "ึ", "ั"]
+THAI_LEADING_VOWELS = ["เ", "แ", "โ", "ไ", "ใ"]
+THAI_TONE_MARKS = ["", "", "", "่", "้", "๊", "๋"]
+THAI_FINALS = ["", "", "ก", "ง", "น", "ม", "ย", "ว", "ด", "บ"]
+
+CATEGORIES = [
+    "animal", "food", "fruit", "vegetable", "color", "number", "body", "family", "job", "place",
+    "travel", "weather", "time", "sport", "music", "school", "house", "clothes", "emotion", "nature",
+    "verb", "adjective", "adverb", "business", "health", "technology", "สัตว์", "อาหาร", "ผลไม้", "สี"
+]
+
+
+def english_word(rng: random.Random) -> str:
+    """Return a random pronounceable English-like word."""
+    return "".join(
+        rng.choice(ENGLISH_ONSETS) + rng.choice(ENGLISH_VOWELS) + rng.choice(ENGLISH_CODAS)
+        for _ in range(rng.choice([1, 1, 2, 2, 3]))
+    )
+
+
+def thai_syllable(rng: random.Random) -> str:
+    """Return a random Thai syllable."""
+    consonant = rng.choice(THAI_CONSONANTS)
+    tone = rng.choice(THAI_TONE_MARKS)
+    if rng.random() < 0.3:
+        return rng.choice(THAI_LEADING_VOWELS) + consonant + tone + rng.choice(THAI_FINALS)
+    return consonant + tone + rng.choice(THAI_VOWELS) + rng.choice(THAI_FINALS)
+
+
+def thai_text(rng: random.Random) -> str:
+    """Return a random Thai translation, occasionally two space-separated words."""
+    text = "".join(thai_syllable(rng) for _ in range(rng.choice([1, 2, 2, 3])))
+    if rng.random() < 0.1:
+        text += " " + "".join(thai_syllable(rng) for _ in range(rng.choice([1, 2])))
+    return text
+
+
+def generate(size: int, seed: int = 42) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Generate a dictionary.
+
+    Args:
+        size: Number of words
+        seed: Random seed; the same seed and size always give the same dictionary
+
+    Returns:
+        Dictionary data as stored by DictionaryService, in insertion order
+    """
+    rng = random.Random(seed)
+    words: Dict[str, Dict[str, Optional[str]]] = {}
+    while len(words) < size:
+        english = english_word(rng)
+        roll = rng.random()
+        if roll < 0.08:
+            english += " " + english_word(rng)
+        elif roll < 0.1:
+            english += "-" + english_word(rng)
+        if english in words:
+            # Keep generating until the key is new; a numeric suffix keeps large sizes cheap
+            english += str(len(words))
+        category = rng.choice(CATEGORIES) if rng.random() < 0.85 else None
+        words[english] = make_entry(thai_text(rng), category)
+    return words
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic dictionary.json for benchmarks.")
+    parser.add_argument("size", type=int)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(encode_dictionary(generate(args.size, args.seed)), f, ensure_ascii=False)
+    print(f"Wrote {args.size} words to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
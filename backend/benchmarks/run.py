@@ -0,0 +1,227 @@
+"""
+Benchmark DictionaryService and the API at several dictionary sizes.
+
+Each size gets a synthetic dictionary (see generate.py) in a temporary
+directory. Service methods are timed directly; routes are timed end to end
+through FastAPI's in-process TestClient with the app pointed at the same
+directory. Results are written as JSON so runs from different commits can
+be compared.
+
+Usage:
+    python run.py                              # 1k, 10k and 100k words
+    python run.py --sizes 1000 1000000 --output after.json
+    python run.py --compare before.json        # print speedups against an earlier run
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from generate import english_word, generate, thai_text  # noqa: E402
+from models.word import Word  # noqa: E402
+from services.dictionary import DictionaryService  # noqa: E402
+from services.normalization import encode_dictionary  # noqa: E402
+from services.storage import JsonStorage  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def measure(fn: Callable[[int], object], repeat: int,
+            setup: Optional[Callable[[int], object]] = None) -> Dict[str, float]:
+    """
+    Time a function several times.
+
+    Args:
+        fn: Called with the repetition number, so it can vary its input
+        repeat: Number of calls
+        setup: Optional untimed call made before each call of fn
+
+    Returns:
+        First, minimum and median duration in milliseconds; the first call
+        is reported separately because it often builds a lazy index
+    """
+    timings = []
+    for i in range(repeat):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "first_ms": round(timings[0], 3),
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "repeat": repeat
+    }
+
+
+def bench_service(data_dir: Path, words: Dict, repeat: int, rng: random.Random) -> Dict[str, Dict[str, float]]:
+    """Time service methods against dictionary.json in data_dir."""
+    results = {}
+    path = data_dir / "dictionary.json"
+    service = DictionaryService(storage=JsonStorage(path))
+
+    keys = list(words)
+    sample_keys = [rng.choice(keys) for _ in range(1000)]
+    categories = sorted({entry["category"] for entry in words.values() if entry["category"]})
+    terms = [key[:3] for key in rng.sample(keys, repeat)]
+
+    results["load"] = measure(lambda i: service._load_dictionary(), repeat)
+    results["save"] = measure(lambda i: service._storage.replace_all(service.words), repeat)
+    results["get_word_x1000"] = measure(
+        lambda i: [service.get_word(key) for key in sample_keys], repeat
+    )
+    results["search_words"] = measure(lambda i: service.search_words(terms[i]), repeat)
+    results["search_words_thai"] = measure(
+        lambda i: service.search_words(words[sample_keys[i]]["thai"][:2]), repeat
+    )
+    results["search_ranked_k20"] = measure(lambda i: service.search_ranked(terms[i], 20), repeat)
+    results["get_words_by_category"] = measure(
+        lambda i: service.get_words_by_category(categories[i % len(categories)]), repeat
+    )
+    results["sort_words_english"] = measure(lambda i: service.sort_words("english"), repeat)
+    results["sort_words_thai"] = measure(lambda i: service.sort_words("thai"), repeat)
+    results["fuzzy_words"] = measure(lambda i: service.fuzzy_words(sample_keys[i][:-1] + "x"), repeat)
+
+    batches: List[List[Word]] = []
+
+    def make_batch(i: int) -> None:
+        batches.append([
+            Word(english=f"{english_word(rng)} bench{i} {n}", thai=thai_text(rng))
+            for n in range(1000)
+        ])
+    results["import_words_x1000"] = measure(lambda i: service.add_words_bulk(batches[i]), repeat, setup=make_batch)
+
+    service.close()
+    return results
+
+
+def bench_routes(data_dir: Path, words: Dict, repeat: int, rng: random.Random) -> Dict[str, Dict[str, float]]:
+    """Time API routes end to end with the app serving dictionary.json in data_dir."""
+    from fastapi.testclient import TestClient
+    os.environ["THAIDICT_DATA_DIR"] = str(data_dir)
+    import main
+
+    results = {}
+    keys = list(words)
+    sample_keys = [rng.choice(keys) for _ in range(repeat)]
+    categories = sorted({entry["category"] for entry in words.values() if entry["category"]})
+    api = "/api/v1"
+
+    with TestClient(main.app) as client:
+        def get(url: str) -> None:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+        # An untimed write before each list request keeps the response cache from serving it
+        def touch(i: int) -> None:
+            client.put(f"{api}/words/{sample_keys[i]}", json={"english": sample_keys[i], "thai": f"แก้ไข{i}"})
+
+        results["GET /words/ (full)"] = measure(lambda i: get(f"{api}/words/"), repeat, setup=touch)
+        results["GET /words/ (cached)"] = measure(lambda i: get(f"{api}/words/"), repeat)
+        results["GET /words/?limit=100"] = measure(lambda i: get(f"{api}/words/?limit=100"), repeat, setup=touch)
+        results["GET /words/?sort=thai"] = measure(lambda i: get(f"{api}/words/?sort=thai"), repeat, setup=touch)
+        results["GET /words/{english_word}"] = measure(lambda i: get(f"{api}/words/{sample_keys[i]}"), repeat)
+        results["GET /words/search"] = measure(
+            lambda i: get(f"{api}/words/search?term={sample_keys[i][:3]}"), repeat, setup=touch
+        )
+        results["GET /words/search?k=20"] = measure(
+            lambda i: get(f"{api}/words/search?term={sample_keys[i][:3]}&k=20"), repeat, setup=touch
+        )
+        results["GET /words/category/{category}"] = measure(
+            lambda i: get(f"{api}/words/category/{categories[i % len(categories)]}"), repeat, setup=touch
+        )
+        results["GET /words/suggest"] = measure(lambda i: get(f"{api}/words/suggest?prefix={sample_keys[i][:2]}"), repeat)
+        results["GET /quiz"] = measure(lambda i: get(f"{api}/quiz?count=20"), repeat)
+        results["PUT /words/{english_word}"] = measure(touch, repeat)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, if the benchmark runs inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: List[int], repeat: int, routes: bool, seed: int) -> Dict:
+    """Run every benchmark at every size."""
+    results = []
+    for size in sizes:
+        print(f"Generating {size} words...", file=sys.stderr)
+        words = generate(size, seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            with open(data_dir / "dictionary.json", "w", encoding="utf-8") as f:
+                json.dump(encode_dictionary(words), f, ensure_ascii=False, indent=4)
+            groups = {"service": bench_service}
+            if routes:
+                groups["route"] = bench_routes
+            for group, bench in groups.items():
+                print(f"Running {group} benchmarks at {size} words...", file=sys.stderr)
+                for operation, timing in bench(data_dir, words, repeat, random.Random(seed)).items():
+                    results.append({"size": size, "group": group, "operation": operation, **timing})
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": seed,
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> None:
+    """Print the median of each benchmark next to the baseline's and the speedup."""
+    before = {(r["size"], r["operation"]): r["median_ms"] for r in baseline["results"]}
+    print(f"{'size':>8}  {'operation':<32} {'before ms':>11} {'after ms':>11} {'speedup':>8}")
+    for r in current["results"]:
+        old = before.get((r["size"], r["operation"]))
+        if old is None:
+            continue
+        speedup = old / r["median_ms"] if r["median_ms"] else float("inf")
+        print(f"{r['size']:>8}  {r['operation']:<32} {old:>11.3f} {r['median_ms']:>11.3f} {speedup:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the dictionary service and API.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-routes", action="store_true", help="Only benchmark service methods")
+    parser.add_argument("--output", type=Path, help="Write results to this file instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, not args.no_routes, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app imports its packages relative to backend/app, as when run with uvicorn from there
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+
+@pytest.fixture
+def put():
+    """Build a journal 'put' record, normalized forms included."""
+    from services.normalization import make_entry
+
+    def put(english, thai, category=None):
+        return {"op": "put", "english": english, **make_entry(thai, category)}
+    return put
+
+
+@pytest.fixture
+def sample_words():
+    """A few stored entries, with a multi-word key and text that normalization changes."""
+    from services.normalization import make_entry
+
+    return {
+        "cat": make_entry("แมว", "สัตว์"),
+        "apple": make_entry("แอปเปิ้ล", "fruit"),
+        "hello world": make_entry("สวัสดีชาวโลก", None),
+        "straße": make_entry("ถนน", "Straße"),
+    }
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client for the app, keeping its dictionary in a temporary directory."""
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setenv("THAIDICT_DATA_DIR", str(tmp_path))
+    with TestClient(main.app) as client:
+        yield client
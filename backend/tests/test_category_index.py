@@ -0,0 +1,51 @@
+from models.word import Word
+from services.category_index import CategoryIndex
+from services.dictionary import DictionaryService
+
+
+def test_keys_move_between_categories_and_keep_their_order():
+    index = CategoryIndex()
+    index.add("cat", "animal")
+    index.add("rose", "plant")
+    index.add("dog", "animal")
+    index.add("stone", None)
+    index.add("cat", "pet")
+    index.add("cat", "animal")
+
+    assert index.keys("animal") == ["cat", "dog"]
+    assert index.counts() == [("animal", 2), ("plant", 1)]
+    index.remove("rose")
+    index.remove("missing")
+    assert index.keys("plant") == []
+    assert index.counts() == [("animal", 2)]
+
+
+def test_service_categories_follow_every_change(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([
+        Word(english="cat", thai="แมว", category="animal"),
+        Word(english="dog", thai="หมา", category=" animal "),
+        Word(english="rose", thai="กุหลาบ", category="plant"),
+        Word(english="stone", thai="หิน"),
+    ])
+    service.update_word(Word(english="dog", thai="หมา", category="pet"))
+    service.delete_word("rose")
+
+    assert [word.english for word in service.get_words_by_category("animal")] == ["cat"]
+    assert [(count.category, count.count) for count in service.get_categories()] == [("animal", 1), ("pet", 1)]
+    service.delete_all_words()
+    assert service.get_categories() == []
+    service.close()
+
+
+def test_category_routes(client):
+    client.post("/api/v1/words/bulk", json={"words": [
+        {"english": "cat", "thai": "แมว", "category": "animal"},
+        {"english": "dog", "thai": "หมา", "category": "animal"},
+        {"english": "rose", "thai": "กุหลาบ", "category": "plant"},
+    ]})
+
+    assert [word["english"] for word in client.get("/api/v1/words/category/animal").json()] == ["cat", "dog"]
+    assert client.get("/api/v1/categories").json() == [
+        {"category": "animal", "count": 2}, {"category": "plant", "count": 1}
+    ]
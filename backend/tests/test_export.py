@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from services.exporter import encode_csv_rows, encode_json_rows, encode_ndjson_rows
+
+WORDS = [
+    {"english": "cat", "thai": "แมว", "category": "สัตว์"},
+    {"english": "apple", "thai": "แอปเปิ้ล, ผลไม้", "category": None},
+    {"english": "dog", "thai": "หมา", "category": "สัตว์"},
+]
+
+
+@pytest.fixture
+def exporting(client):
+    for word in WORDS:
+        client.post("/api/v1/words/", json={key: value for key, value in word.items() if value})
+    return client
+
+
+def export(client, **params):
+    response = client.get("/api/v1/words/export", params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_encoders_match_the_import_formats():
+    rows = [("apple", {"thai": "แอปเปิ้ล, ผลไม้"}), ("cat", {"thai": "แมว", "category": "สัตว์"})]
+    assert encode_csv_rows(rows) == 'apple,"แอปเปิ้ล, ผลไม้",\ncat,แมว,สัตว์\n'
+    assert encode_ndjson_rows(rows).splitlines()[1] == '{"english":"cat","thai":"แมว","category":"สัตว์"}'
+    assert json.loads("[" + encode_json_rows(rows) + "]")[0]["category"] is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_json_export_is_one_array_in_key_order(exporting, chunk_size):
+    response = export(exporting, format="json", chunk_size=chunk_size)
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-disposition"] == 'attachment; filename="dictionary.json"'
+    assert [word["english"] for word in response.json()] == ["apple", "cat", "dog"]
+
+
+def test_csv_and_ndjson_exports_filter_by_category(exporting):
+    lines = export(exporting, format="csv", category="สัตว์", chunk_size=1).text.splitlines()
+    assert lines == ["english,thai,category", "cat,แมว,สัตว์", "dog,หมา,สัตว์"]
+
+    assert export(exporting, format="ndjson", category="ไม่มี").text == ""
+
+
+def test_empty_json_export_is_an_empty_array(client):
+    assert export(client, format="json").json() == []
+
+
+@pytest.mark.parametrize("format", ["csv", "ndjson"])
+def test_export_imports_back_unchanged(exporting, format):
+    body = export(exporting, format=format).content
+    exporting.delete("/api/v1/words/")
+    assert exporting.get("/api/v1/words/").json() == []
+
+    result = exporting.post("/api/v1/words/import", params={"format": format}, content=body).json()
+    assert (result["added"], result["invalid"]) == (3, 0)
+    assert sorted(exporting.get("/api/v1/words/").json(), key=lambda w: w["english"]) == \
+        sorted(WORDS, key=lambda w: w["english"])
@@ -0,0 +1,82 @@
+import random
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.fuzzy import DeletionIndex, bounded_levenshtein
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def random_text(rng, longest=9):
+    return "".join(rng.choice("abcก่") for _ in range(rng.randint(0, longest)))
+
+
+def test_bounded_distance_matches_the_full_distance():
+    rng = random.Random(9)
+    for _ in range(2000):
+        a, b = random_text(rng), random_text(rng)
+        distance = levenshtein(a, b)
+        for limit in (0, 1, 2):
+            assert bounded_levenshtein(a, b, limit) == (distance if distance <= limit else None)
+
+
+def test_index_finds_exactly_the_texts_within_the_distance():
+    rng = random.Random(10)
+    index = DeletionIndex()
+    texts = {}
+    for step in range(800):
+        key = f"k{rng.randrange(120)}"
+        if rng.random() < 0.25:
+            index.remove(key)
+            texts.pop(key, None)
+        else:
+            # Texts longer than the indexed prefix are matched too
+            texts[key] = random_text(rng)
+            index.add(key, texts[key])
+        if step % 100 == 0:
+            for _ in range(20):
+                term, limit = random_text(rng), rng.randint(0, 2)
+                expected = {
+                    (levenshtein(term, text), key) for key, text in texts.items()
+                    if levenshtein(term, text) <= limit
+                }
+                assert set(index.search(term, limit)) == expected
+
+
+def test_service_ranks_by_distance_and_matches_thai_on_request(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([
+        Word(english="receive", thai="ได้รับ"),
+        Word(english="recipe", thai="สูตร"),
+        Word(english="relieve", thai="บรรเทา"),
+        Word(english="believe", thai="เชื่อ"),
+    ])
+
+    matches = service.fuzzy_words("recieve", 2)
+    # Closest first, then by English word; a swap of two letters counts as two edits
+    assert [(match.english, match.distance) for match in matches] == \
+        [("relieve", 1), ("believe", 2), ("receive", 2), ("recipe", 2)]
+    assert [match.english for match in service.fuzzy_words("recieve", 2, limit=2)] == ["relieve", "believe"]
+    assert [match.english for match in service.fuzzy_words("เชือ", 1)] == ["believe"]
+    assert service.fuzzy_words("เชือ", 1, include_thai=False) == []
+    service.delete_word("believe")
+    assert service.fuzzy_words("เชือ", 1) == []
+    service.close()
+
+
+def test_fuzzy_route_reports_a_busy_rebuild_as_unavailable(client, monkeypatch):
+    client.post("/api/v1/words/bulk", json={"words": [{"english": "receive", "thai": "ได้รับ"}]})
+    assert client.get("/api/v1/words/fuzzy", params={"term": "recieve"}).json()[0]["english"] == "receive"
+
+    def busy(*args):
+        raise TimeoutError("Fuzzy index is being rebuilt")
+    monkeypatch.setattr(client.app.state.dictionary, "fuzzy_words", busy)
+    assert client.get("/api/v1/words/fuzzy", params={"term": "recieve"}).status_code == 503
@@ -0,0 +1,39 @@
+from models.word import Word
+from services.dictionary import DictionaryService
+
+
+def test_lists_are_revalidated_with_the_dictionary_version(client):
+    client.post("/api/v1/words/", json={"english": "cat", "thai": "แมว"})
+    response = client.get("/api/v1/words/")
+    etag = response.headers["ETag"]
+
+    assert client.get("/api/v1/words/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/words/", headers={"If-None-Match": f'"0", W/{etag}'}).status_code == 304
+    search = client.get("/api/v1/words/search", params={"term": "cat"}, headers={"If-None-Match": etag})
+    assert search.status_code == 304
+
+    client.post("/api/v1/words/", json={"english": "dog", "thai": "หมา"})
+    response = client.get("/api/v1/words/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_change_feed_lists_changes_since_a_version(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json", change_log_size=3)
+    service.add_word(Word(english="cat", thai="แมว"))
+    version = service.get_version()
+    service.update_word(Word(english="cat", thai="เหมียว", category="pet"))
+    service.delete_word("cat")
+
+    feed = service.changes_since(version)
+    assert (feed.version, feed.reset) == (service.get_version(), False)
+    assert [(change.op, change.english, change.thai) for change in feed.changes] == \
+        [("put", "cat", "เหมียว"), ("delete", "cat", None)]
+    assert service.changes_since(service.get_version()).changes == []
+
+    for i in range(3):
+        service.add_word(Word(english=f"word{i}", thai="คำ"))
+    feed = service.changes_since(version)
+    assert feed.reset and feed.changes == []
+    service.close()
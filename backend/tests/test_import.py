@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+
+
+def ndjson(*rows):
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+def test_bulk_import_reports_skipped_and_conflicting_words(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_word(Word(english="cat", thai="แมว"))
+
+    result = service.add_words_bulk([
+        Word(english="Cat", thai="เหมียว"),
+        Word(english="dog", thai="หมา"),
+        Word(english="DOG", thai="สุนัข"),
+    ])
+    assert (result.added, result.updated, result.skipped) == (1, 0, 2)
+    assert result.skipped_words == ["cat", "dog"]
+    assert result.conflicts == ["cat", "dog"]
+    assert service.get_word("dog").thai == "หมา"
+
+    result = service.add_words_bulk([Word(english="cat", thai="เหมียว"), Word(english="fish", thai="ปลา")],
+                                    on_conflict="overwrite")
+    assert (result.added, result.updated, result.skipped) == (1, 1, 0)
+    assert service.get_word("cat").thai == "เหมียว"
+
+    with pytest.raises(ValueError):
+        service.add_words_bulk([Word(english="bird", thai="นก"), Word(english="fish", thai="ปลา")],
+                               on_conflict="fail")
+    assert service.get_word("bird") is None
+    service.close()
+
+
+def test_streamed_import_commits_chunks_and_reports_invalid_rows(client):
+    body = ndjson(*({"english": f"word{i}", "thai": "คำ"} for i in range(5))) + b"{broken\n" + \
+        ndjson({"english": "word0", "thai": "ซ้ำ"}, {"english": "", "thai": "ว่าง"})
+    response = client.post("/api/v1/words/import?chunk_size=2", content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["rows"], result["added"], result["skipped"], result["invalid"], result["chunks"]) == (6, 5, 1, 2, 3)
+    assert [error.split(":")[0] for error in result["errors"]] == ["บรรทัด 6", "บรรทัด 8"]
+    assert client.get("/api/v1/words/word4").json()["thai"] == "คำ"
+
+
+def test_streamed_csv_import_skips_the_header(client):
+    body = "english,thai,category\ncat,\"แมว, เหมียว\",animal\nhello world,สวัสดี\n".encode("utf-8")
+    response = client.post("/api/v1/words/import?format=csv", content=body)
+
+    assert (response.json()["added"], response.json()["invalid"]) == (2, 0)
+    assert client.get("/api/v1/words/cat").json() == {"english": "cat", "thai": "แมว, เหมียว", "category": "animal"}
+    assert client.get("/api/v1/words/hello world").json()["category"] is None
+
+
+def test_streamed_import_reports_progress_after_every_chunk(client):
+    body = ndjson(*({"english": f"word{i}", "thai": "คำ"} for i in range(5)))
+    response = client.post("/api/v1/words/import?chunk_size=2&progress=true", content=body)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["rows"], line["added"], line["chunks"]) for line in lines] == [(2, 2, 1), (4, 4, 2), (5, 5, 3), (5, 5, 3)]
+    assert lines[-1]["message"].startswith("นำเข้าข้อมูลสำเร็จ")
+
+
+def test_streamed_import_rejects_bodies_that_are_not_utf8(client):
+    body = b'{"english": "cat", "thai": "\xff"}\n'
+    assert client.post("/api/v1/words/import", content=body).status_code == 400
+    lines = client.post("/api/v1/words/import?progress=true", content=body).text.splitlines()
+    assert "detail" in json.loads(lines[-1])
@@ -0,0 +1,111 @@
+import json
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.journal import Journal
+from services.normalization import FORMAT_VERSION
+from services.storage import JsonStorage
+
+
+def test_replay_applies_records_in_order(tmp_path, put):
+    journal = Journal(tmp_path / "dictionary.journal")
+    journal.append(put("cat", "แมว"), put("dog", "หมา"))
+    journal.append({"op": "delete", "english": "cat"}, put("dog", "สุนัข", "animal"))
+    journal.close()
+
+    words = {}
+    assert Journal(tmp_path / "dictionary.journal").replay(words) == 4
+    assert list(words) == ["dog"]
+    assert words["dog"]["thai"] == "สุนัข"
+    assert words["dog"]["category"] == "animal"
+
+
+def test_replay_drops_cut_off_last_record(tmp_path, put):
+    path = tmp_path / "dictionary.journal"
+    journal = Journal(path)
+    journal.append(put("cat", "แมว"), put("dog", "หมา"))
+    journal.close()
+    intact = path.read_bytes()
+    # A crash in the middle of the next append leaves half a line behind
+    cut_off = (json.dumps(put("bird", "นก"), ensure_ascii=False) + "\n").encode("utf-8")[:-9]
+    path.write_bytes(intact + cut_off)
+
+    words = {}
+    journal = Journal(path)
+    assert journal.replay(words) == 2
+    assert list(words) == ["cat", "dog"]
+    assert path.read_bytes() == intact
+
+    # New records start on a clean line and survive the next replay
+    journal.append(put("fish", "ปลา"))
+    journal.close()
+    words = {}
+    assert Journal(path).replay(words) == 3
+    assert list(words) == ["cat", "dog", "fish"]
+
+
+def test_replay_stops_at_unterminated_record(tmp_path, put):
+    path = tmp_path / "dictionary.journal"
+    # Valid JSON, but the newline that marks a complete record never made it to disk
+    path.write_text(json.dumps(put("cat", "แมว"), ensure_ascii=False), encoding="utf-8")
+
+    words = {}
+    assert Journal(path).replay(words) == 0
+    assert words == {}
+    assert path.read_bytes() == b""
+
+
+def test_truncate_removes_the_log(tmp_path, put):
+    path = tmp_path / "dictionary.journal"
+    journal = Journal(path)
+    journal.append(put("cat", "แมว"))
+    journal.truncate()
+
+    assert not path.exists()
+    assert journal.entries == 0
+    journal.append(put("dog", "หมา"))
+    journal.close()
+    words = {}
+    assert Journal(path).replay(words) == 1
+    assert list(words) == ["dog"]
+
+
+def test_journal_compaction_folds_log_into_snapshot(tmp_path, put):
+    path = tmp_path / "dictionary.json"
+    storage = JsonStorage(path, journal=True, compact_threshold=3)
+    words = storage.load()
+    records = [put("cat", "แมว"), put("dog", "หมา"), {"op": "delete", "english": "cat"}]
+    for record in records:
+        if record["op"] == "put":
+            words[record["english"]] = {k: v for k, v in record.items() if k not in ("op", "english")}
+        else:
+            del words[record["english"]]
+        storage.write(None, [record])
+    assert storage.needs_compaction
+
+    storage.compact(words)
+    storage.close()
+    assert not storage.needs_compaction
+    assert not (tmp_path / "dictionary.journal").exists()
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["format"] == FORMAT_VERSION
+    assert list(data["words"]) == ["dog"]
+
+    reopened = JsonStorage(path, journal=True)
+    assert reopened.load() == words
+    reopened.close()
+
+
+def test_service_compaction_keeps_every_word(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json", journal=True, compact_threshold=1000)
+    for i in range(20):
+        service.add_word(Word(english=f"word{i}", thai="คำ"))
+    service.delete_word("word3")
+    service.compact()
+    service.add_word(Word(english="after", thai="หลัง"))
+    service.close()
+
+    reopened = DictionaryService(tmp_path / "dictionary.json", journal=True)
+    keys = [word.english for word in reopened.get_all_words()]
+    assert keys == [f"word{i}" for i in range(20) if i != 3] + ["after"]
+    reopened.close()
@@ -0,0 +1,65 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import main
+from services.metrics import REQUEST_SECONDS, Registry
+
+WORD_ROUTE = {"method": "GET", "route": "/api/v1/words/{english_word}"}
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("test_seconds", "Test durations", ("path",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, path='a"b')
+    registry.add_collector(lambda: [("test_words", "gauge", "Words", 3)])
+
+    text = registry.render()
+    assert 'test_seconds_bucket{path="a\\"b",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{path="a\\"b",le="1"} 2' in text
+    assert 'test_seconds_bucket{path="a\\"b",le="+Inf"} 3' in text
+    assert 'test_seconds_count{path="a\\"b"} 3' in text
+    assert "# TYPE test_words gauge\ntest_words 3" in text
+
+
+def test_requests_are_recorded_per_route_template(client):
+    before = REQUEST_SECONDS.count(status="404", **WORD_ROUTE)
+    client.get("/api/v1/words/cat")
+    client.get("/api/v1/words/dog")
+    assert REQUEST_SECONDS.count(status="404", **WORD_ROUTE) == before + 2
+
+    text = client.get("/metrics").text
+    assert 'thaidict_http_request_duration_seconds_count{method="GET",route="/api/v1/words/{english_word}"' in text
+    assert "thaidict_words 0" in text
+
+
+def test_streamed_responses_are_timed_until_the_last_chunk():
+    app = FastAPI()
+    app.add_middleware(main.MeasureRequests)
+
+    @app.get("/slow")
+    async def slow():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                yield b"x"
+        return StreamingResponse(body())
+
+    labels = {"method": "GET", "route": "/slow", "status": "200"}
+    assert TestClient(app).get("/slow").content == b"xxx"
+    assert REQUEST_SECONDS.count(**labels) == 1
+    assert REQUEST_SECONDS._values[REQUEST_SECONDS._key(labels)][1] >= 0.15
+
+
+def test_profile_report_covers_the_handler_and_the_streamed_body(client, monkeypatch):
+    monkeypatch.setattr(main, "profiling_enabled", True)
+    client.post("/api/v1/words/", json={"english": "cat", "thai": "แมว"})
+
+    response = client.get("/api/v1/words/", params={"profile": "1"})
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert "_list_words" in response.text and "get_all_words" in response.text
+    response = client.get("/api/v1/words/export", params={"profile": "1"})
+    assert "export_chunk" in response.text
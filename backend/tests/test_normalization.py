@@ -0,0 +1,114 @@
+import json
+import sqlite3
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.normalization import FORMAT_VERSION, make_entry
+from services.storage import JsonStorage, SqliteStorage
+
+
+def fts_available():
+    """Whether SQLite was built with FTS5 and its trigram tokenizer."""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+needs_fts = pytest.mark.skipif(not fts_available(), reason="SQLite without FTS5 trigram tokenizer")
+
+
+def test_format_1_file_is_migrated_to_format_2(tmp_path):
+    path = tmp_path / "dictionary.json"
+    # Format 1: words at the top level, only the displayed text stored
+    path.write_text(json.dumps({
+        "cat": {"thai": "แมว", "category": "Animal"},
+        "hello": {"thai": "สวัสดี  ครับ", "category": None},
+    }, ensure_ascii=False), encoding="utf-8")
+
+    storage = JsonStorage(path)
+    words = storage.load()
+    storage.close()
+
+    assert words["cat"] == make_entry("แมว", "Animal")
+    assert words["hello"]["thai_norm"] == "สวัสดี ครับ"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data == {"format": FORMAT_VERSION, "words": words}
+
+
+def test_newer_format_is_rejected(tmp_path):
+    path = tmp_path / "dictionary.json"
+    path.write_text(json.dumps({"format": FORMAT_VERSION + 1, "words": {}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        JsonStorage(path).load()
+
+
+@needs_fts
+def test_sqlite_search_matches_normalized_text(tmp_path):
+    storage = SqliteStorage(tmp_path / "dictionary.db")
+    # Tone mark before the vowel; NFC puts the vowel first
+    words = {"wu": make_entry("วุ่น", None), "street": make_entry("ถนน", "Straße")}
+    storage.replace_all(words)
+
+    assert storage.search("วุ่") == ["wu"]
+    assert storage.search("straße") == ["street"]
+    storage.close()
+
+
+@needs_fts
+def test_sqlite_database_from_before_normalized_columns_is_upgraded(tmp_path, put):
+    path = tmp_path / "dictionary.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE words (
+            id INTEGER PRIMARY KEY, english TEXT NOT NULL UNIQUE, thai TEXT NOT NULL,
+            category TEXT, position INTEGER NOT NULL
+        );
+        CREATE VIRTUAL TABLE words_fts USING fts5(
+            english, thai, category, content='words', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER words_fts_insert AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts(rowid, english, thai, category) VALUES (new.id, new.english, new.thai, new.category);
+        END;
+    """)
+    conn.executemany(
+        "INSERT INTO words (english, thai, category, position) VALUES (?, ?, ?, ?)",
+        [("wu", "วุ่น", None, 0), ("street", "ถนน", "Straße", 1)]
+    )
+    conn.commit()
+    conn.close()
+
+    storage = SqliteStorage(path)
+    assert list(storage.load()) == ["wu", "street"]
+    assert storage.search("วุ่") == ["wu"]
+    storage.write(None, [put("dog", "หมา")])
+    assert storage.search("หมา") == ["dog"]
+    storage.close()
+
+
+def test_answers_are_compared_in_normalized_form(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_word(Word(english="Busy", thai="วุ่น  วาย"))
+
+    assert service.check_translation("  busy ", "วุ่น วาย")[0]
+    # Tone mark before the vowel; NFC puts the vowel first
+    assert service.check_translation("BUSY", "\u0e27\u0e48\u0e38\u0e19 \u0e27\u0e32\u0e22")[0]
+    assert not service.check_translation("busy", "วุ่นวาย")[0]
+    service.close()
+
+
+def test_journal_records_without_normalized_forms_are_completed(tmp_path):
+    path = tmp_path / "dictionary.json"
+    # Journaled before the normalized forms were stored with each record
+    (tmp_path / "dictionary.journal").write_text(
+        json.dumps({"op": "put", "english": "cat", "thai": "แมว", "category": "Animal"}, ensure_ascii=False) + "\n",
+        encoding="utf-8"
+    )
+
+    storage = JsonStorage(path, journal=True)
+    words = storage.load()
+    storage.close()
+    assert words["cat"] == make_entry("แมว", "Animal")
@@ -0,0 +1,53 @@
+from models.word import Word
+from services.dictionary import DictionaryService
+
+
+def test_cursor_pages_see_every_remaining_word_once_while_words_change(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([Word(english=f"word{i:02}", thai="คำ") for i in range(10)])
+
+    seen = []
+    page = service.query_words(limit=3)
+    assert page.total == 10
+    while True:
+        seen += [word.english for word in page.items]
+        if page.next_cursor is None:
+            break
+        # Changes before the cursor must not shift the following pages
+        service.delete_word(seen[0])
+        service.add_word(Word(english=f"aaa{len(seen)}", thai="ใหม่"))
+        page = service.query_words(limit=3, cursor=page.next_cursor)
+    assert seen == [f"word{i:02}" for i in range(10)]
+    service.close()
+
+
+def test_filtered_pages(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([
+        Word(english=f"word{i}", thai="คำ", category="even" if i % 2 == 0 else "odd") for i in range(7)
+    ])
+
+    page = service.query_words(category="even", limit=2)
+    assert ([word.english for word in page.items], page.total, page.next_cursor) == (["word0", "word2"], 4, "word2")
+    page = service.query_words(category="even", limit=2, cursor=page.next_cursor)
+    assert ([word.english for word in page.items], page.next_cursor) == (["word4", "word6"], None)
+    page = service.query_words(term="word1", limit=2)
+    assert ([word.english for word in page.items], page.total, page.next_cursor) == (["word1"], 1, None)
+    service.close()
+
+
+def test_word_list_route_pages_with_headers_and_fields(client):
+    client.post("/api/v1/words/bulk", json={"words": [
+        {"english": f"word{i}", "thai": "คำ", "category": "noun"} for i in range(5)
+    ]})
+
+    response = client.get("/api/v1/words/", params={"limit": 2, "fields": "english,thai"})
+    assert response.json() == [{"english": "word0", "thai": "คำ"}, {"english": "word1", "thai": "คำ"}]
+    assert response.headers["X-Total-Count"] == "5"
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/api/v1/words/", params={"limit": 10, "cursor": cursor, "fields": "english"})
+    assert response.json() == [{"english": f"word{i}"} for i in range(2, 5)]
+    assert "X-Next-Cursor" not in response.headers
+    assert len(client.get("/api/v1/words/").json()) == 5
+    assert client.get("/api/v1/words/", params={"fields": "spelling"}).status_code == 400
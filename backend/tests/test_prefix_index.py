@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from models.word import Word
+from services import prefix_index
+from services.dictionary import DictionaryService
+from services.prefix_index import PrefixIndex
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Small blocks so a few hundred keys split and empty many of them
+    monkeypatch.setattr(prefix_index, "BLOCK_SIZE", 4)
+
+
+def check(index, texts):
+    entries = sorted((text, key) for key, text in texts.items())
+    assert len(index) == len(texts)
+    assert index.keys() == [key for _, key in entries]
+    assert index.keys(reverse=True) == [key for _, key in reversed(entries)]
+    for prefix in ("", "a", "ab", "b", "ก", "zz"):
+        expected = [key for text, key in entries if text.startswith(prefix)]
+        assert index.prefix(prefix, 5) == expected[:5]
+        assert index.exact(prefix) == [key for text, key in entries if text == prefix]
+    for after in (None, "", "ab", "b", "กก"):
+        expected = [key for text, key in entries if after is None or text > after]
+        assert index.keys_after(after, 7) == expected[:7]
+
+
+def test_lookups_match_a_sorted_list_through_updates():
+    rng = random.Random(7)
+    index = PrefixIndex()
+    texts = {}
+    for step in range(1500):
+        key = f"k{rng.randrange(200)}"
+        if rng.random() < 0.3:
+            index.remove(key)
+            texts.pop(key, None)
+        else:
+            texts[key] = "".join(rng.choice("abก") for _ in range(rng.randint(0, 4)))
+            index.add(key, texts[key])
+        if step % 100 == 0:
+            check(index, texts)
+    check(index, texts)
+
+
+def test_bulk_built_index_matches_one_built_by_adding():
+    rng = random.Random(8)
+    texts = {f"k{i}": "".join(rng.choice("ab") for _ in range(3)) for i in range(50)}
+    index = PrefixIndex.from_items(texts.items())
+    check(index, texts)
+    index.add("k0", "zzz")
+    index.remove("k1")
+    texts["k0"] = "zzz"
+    del texts["k1"]
+    check(index, texts)
+
+
+def test_suggestions_list_english_matches_before_thai_matches(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([
+        Word(english="mango", thai="มะม่วง"),
+        Word(english="man", thai="ผู้ชาย"),
+        Word(english="lime", thai="มะนาว"),
+        Word(english="coconut", thai="มะพร้าว"),
+    ])
+
+    assert [word.english for word in service.suggest_words("MAN")] == ["man", "mango"]
+    assert [word.english for word in service.suggest_words("มะ", 2)] == ["lime", "coconut"]
+    service.delete_word("lime")
+    assert [word.english for word in service.suggest_words("มะ")] == ["coconut", "mango"]
+    service.close()
+
+
+def test_suggest_route(client):
+    client.post("/api/v1/words/bulk", json={"words": [
+        {"english": "cat", "thai": "แมว"}, {"english": "catalog", "thai": "แคตตาล็อก"}, {"english": "dog", "thai": "หมา"}
+    ]})
+    response = client.get("/api/v1/words/suggest", params={"prefix": "cat", "limit": 1})
+    assert [word["english"] for word in response.json()] == ["cat"]
@@ -0,0 +1,65 @@
+import random
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.quiz_index import KeyPool
+
+ANIMALS = {"cat": "แมว", "dog": "หมา", "bird": "นก", "fish": "ปลา", "cow": "วัว"}
+FRUITS = {"apple": "แอปเปิ้ล", "mango": "มะม่วง"}
+
+
+def make_service(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk(
+        [Word(english=english, thai=thai, category="animal") for english, thai in ANIMALS.items()] +
+        [Word(english=english, thai=thai, category="fruit") for english, thai in FRUITS.items()]
+    )
+    service._random = random.Random(1)
+    return service
+
+
+def test_key_pool_samples_distinct_keys_after_removals():
+    pool = KeyPool()
+    for key in "abcdef":
+        pool.add(key)
+    pool.remove("b")
+    pool.remove("f")
+    pool.remove("missing")
+    rng = random.Random(2)
+
+    assert len(pool) == 4 and "b" not in pool
+    assert sorted(pool.sample(10, rng)) == ["a", "c", "d", "e"]
+    assert {pool.choice(rng) for _ in range(100)} == {"a", "c", "d", "e"}
+
+
+def test_questions_ask_each_word_once_with_choices_from_its_category(tmp_path):
+    service = make_service(tmp_path)
+    questions = service.make_quiz(count=5, category="animal", choices=4)
+
+    assert sorted(question.english for question in questions) == sorted(ANIMALS)
+    for question in questions:
+        assert question.prompt == question.english
+        assert ANIMALS[question.english] in question.choices
+        assert len(set(question.choices)) == 4
+        assert set(question.choices) <= set(ANIMALS.values())
+    service.close()
+
+
+def test_small_categories_borrow_choices_and_removed_words_are_not_asked(tmp_path):
+    service = make_service(tmp_path)
+    service.delete_word("mango")
+    questions = service.make_quiz(count=10, category="fruit", direction="th-en", choices=3)
+
+    assert [question.prompt for question in questions] == ["แอปเปิ้ล"]
+    assert questions[0].english is None
+    assert "apple" in questions[0].choices and len(questions[0].choices) == 3
+    assert "mango" not in questions[0].choices
+    service.close()
+
+
+def test_quiz_route(client):
+    client.post("/api/v1/words/bulk", json={"words": [{"english": e, "thai": t} for e, t in ANIMALS.items()]})
+    questions = client.get("/api/v1/quiz", params={"count": 3, "choices": 2}).json()
+    assert len(questions) == 3
+    assert all(len(question["choices"]) == 2 for question in questions)
+    assert client.get("/api/v1/quiz", params={"direction": "up"}).status_code == 422
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.ranking import EXACT, PREFIX, SUBSTRING, WORD, match_score, relevance
+
+# Best first for the term "cat"
+RANKED = [
+    Word(english="cat", thai="แมว"),                      # English exact
+    Word(english="feline", thai="cat"),                   # Thai exact
+    Word(english="catalog", thai="แคตตาล็อก"),            # English prefix
+    Word(english="herb", thai="catnip"),                  # Thai prefix
+    Word(english="lion", thai="สิงโต", category="cat"),   # category exact
+    Word(english="wild-cat", thai="แมวป่า"),              # English word start
+    Word(english="bobcat", thai="แมวป่าบ็อบ"),            # English elsewhere
+]
+
+
+@pytest.fixture
+def ranked(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk(list(reversed(RANKED)) + [Word(english="dog", thai="หมา")])
+    yield service
+    service.close()
+
+
+def test_match_score_tiers():
+    assert match_score("cat", "cat") == EXACT
+    assert match_score("catalog", "cat") == PREFIX
+    assert match_score("wild cat", "cat") == WORD
+    assert match_score("bobcat", "cat") == SUBSTRING
+    # Thai marks are part of the word before them
+    assert match_score("ก่า", "า") == SUBSTRING
+    assert match_score("dog", "cat") == 0
+
+
+def test_ranked_search_orders_by_tier_then_field(ranked):
+    assert [word.english for word in ranked.search_ranked("Cat", 20)] == [word.english for word in RANKED]
+    assert [word.english for word in ranked.search_ranked("cat", 3)] == ["cat", "feline", "catalog"]
+    assert ranked.search_ranked("  ", 5) == []
+
+
+def test_ranked_search_stops_early_with_the_same_result_as_a_full_scan(tmp_path):
+    rng = random.Random(25)
+    service = DictionaryService(tmp_path / "dictionary.json")
+    texts = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 5))).strip() or "a" for _ in range(300)]
+    service.add_words_bulk([
+        Word(english=f"{text.replace(' ', '-')}{i}", thai=rng.choice(texts), category=rng.choice(texts + [None]))
+        for i, text in enumerate(texts)
+    ])
+    for term in ("a", "ab", "b a", "bb"):
+        normalize = service._normalize_key
+        scored = sorted(
+            service.search_words(term),
+            key=lambda word: (-relevance(normalize(term), tuple(normalize(text or "") for text in word.to_dict().values())), word.english)
+        )
+        for k in (1, 5, 50, 1000):
+            assert [word.english for word in service.search_ranked(term, k)] == \
+                [word.english for word in scored[:k]], (term, k)
+    service.close()
+
+
+def test_search_route_returns_the_top_k(client):
+    for word in RANKED:
+        client.post("/api/v1/words/", json={key: value for key, value in word.model_dump().items() if value})
+
+    response = client.get("/api/v1/words/search", params={"term": "cat", "k": 4})
+    assert response.status_code == 200
+    assert [word["english"] for word in response.json()] == ["cat", "feline", "catalog", "herb"]
+
+    for extra in ({"limit": 2}, {"cursor": "cat"}):
+        response = client.get("/api/v1/words/search", params={"term": "cat", "k": 4, **extra})
+        assert response.status_code == 400
@@ -0,0 +1,53 @@
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.response_cache import ResponseCache
+
+
+def test_cache_evicts_least_recently_used_and_forgets_old_versions():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.put("a", 1, b"aaa")
+    cache.put("b", 1, b"bbb")
+    assert cache.get("a", 1) == b"aaa"
+    cache.put("c", 1, b"ccc")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == b"aaa"
+
+    cache.put("big", 1, b"x" * 11)
+    assert cache.get("big", 1) is None
+    assert cache.get("a", 2) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_equivalent_queries_share_an_entry_until_the_next_change(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_word(Word(english="cat", thai="แมว"))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return [word.english for word in service.search_words("cat")]
+
+    assert service.cached_response("search", {"term": "cat"}, build)[1] == ["cat"]
+    assert service.cached_response("search", {"term": "  CAT "}, build)[1] == ["cat"]
+    assert len(builds) == 1
+    service.add_word(Word(english="catalog", thai="แคตตาล็อก"))
+    assert service.cached_response("search", {"term": "cat"}, build)[1] == ["cat", "catalog"]
+    assert len(builds) == 2
+    service.close()
+
+
+def test_cache_disabled_with_zero_size(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json", response_cache_size=0)
+    builds = []
+    for _ in range(2):
+        service.cached_response("words", {}, lambda: builds.append(1))
+    assert len(builds) == 2
+    service.close()
+
+
+def test_list_routes_are_served_from_the_cache(client):
+    client.post("/api/v1/words/", json={"english": "cat", "thai": "แมว", "category": "animal"})
+    for _ in range(3):
+        client.get("/api/v1/words/category/animal")
+    stats = client.get("/api/v1/admin/cache").json()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
@@ -0,0 +1,60 @@
+import random
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.search_index import NgramIndex
+
+
+def brute_force(fields, term):
+    return [key for key, texts in fields.items() if any(term in text for text in texts)]
+
+
+def test_search_matches_a_substring_scan_through_updates():
+    rng = random.Random(5)
+    index = NgramIndex()
+    fields = {}
+
+    def text():
+        return "".join(rng.choice("abcกขค") for _ in range(rng.randint(0, 8)))
+
+    for step in range(600):
+        key = f"k{rng.randrange(80)}"
+        if rng.random() < 0.2:
+            index.remove(key)
+            fields.pop(key, None)
+        else:
+            fields[key] = (key, text(), text())
+            index.add(key, fields[key])
+        if step % 50 == 0:
+            for term in ("", "a", "ab", "abc", "กข", "กขค", "bcaa", "z"):
+                assert sorted(index.search(term)) == sorted(brute_force(fields, term))
+
+
+def test_results_keep_dictionary_order_when_a_key_is_updated():
+    index = NgramIndex()
+    index.add("first", ("first", "aaa"))
+    index.add("second", ("second", "aaa"))
+    index.add("first", ("first", "aaab"))
+
+    assert index.search("aaa") == ["first", "second"]
+    assert index.search("aab") == ["first"]
+    index.remove("first")
+    assert index.search("aaa") == ["second"]
+
+
+def test_service_search_covers_every_field(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([
+        Word(english="Apple Pie", thai="พายแอปเปิ้ล", category="Dessert"),
+        Word(english="pineapple", thai="สับปะรด", category="fruit"),
+        Word(english="cat", thai="แมว", category="animal"),
+    ])
+
+    assert [word.english for word in service.search_words("APPLE")] == ["apple pie", "pineapple"]
+    assert [word.english for word in service.search_words("แอปเปิ้ล")] == ["apple pie"]
+    assert [word.english for word in service.search_words("dess")] == ["apple pie"]
+    service.delete_word("pineapple")
+    service.update_word(Word(english="cat", thai="แมวป่า", category="animal"))
+    assert [word.english for word in service.search_words("apple")] == ["apple pie"]
+    assert [word.english for word in service.search_words("ป่า")] == ["cat"]
+    service.close()
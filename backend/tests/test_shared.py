@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.shared import FileLock
+from services.storage import SqliteStorage, create_storage
+
+PROCESSES = 3
+WORDS_PER_PROCESS = 30
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork to start worker processes")
+
+
+def add_words(kind, data_dir, worker, barrier):
+    """Worker process: add and update words while the others do the same."""
+    service = DictionaryService(storage=create_storage(kind, data_dir), shared=True)
+    barrier.wait()
+    for i in range(WORDS_PER_PROCESS):
+        service.add_word(Word(english=f"w{worker}x{i}", thai="แมว"))
+        if i % 5 == 0:
+            service.update_word(Word(english=f"w{worker}x{i}", thai="หมา"))
+    service.close()
+
+
+@pytest.mark.parametrize("kind", ["json", "journal", "snapshot", "sqlite"])
+def test_concurrent_writers_do_not_lose_words(tmp_path, kind):
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(PROCESSES)
+    processes = [
+        context.Process(target=add_words, args=(kind, tmp_path, worker, barrier))
+        for worker in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    service = DictionaryService(storage=create_storage(kind, tmp_path), shared=True)
+    words = {word.english: word.thai for word in service.get_all_words()}
+    service.close()
+    assert len(words) == PROCESSES * WORDS_PER_PROCESS
+    assert all(
+        words[f"w{worker}x{i}"] == ("หมา" if i % 5 == 0 else "แมว")
+        for worker in range(PROCESSES) for i in range(WORDS_PER_PROCESS)
+    )
+
+
+def test_processes_see_each_others_writes_and_version(tmp_path):
+    first = DictionaryService(storage=create_storage("journal", tmp_path), shared=True)
+    second = DictionaryService(storage=create_storage("journal", tmp_path), shared=True)
+
+    first.add_word(Word(english="cat", thai="แมว"))
+    assert second.get_word("cat").thai == "แมว"
+    assert second.get_version() == first.get_version()
+
+    second.delete_word("cat")
+    assert first.get_word("cat") is None
+    first.close()
+    second.close()
+
+
+@pytest.mark.parametrize("kind", ["journal", "snapshot", "sqlite"])
+def test_other_processes_writes_are_applied_without_reloading(tmp_path, kind, monkeypatch):
+    first = DictionaryService(storage=create_storage(kind, tmp_path), shared=True)
+    second = DictionaryService(storage=create_storage(kind, tmp_path), shared=True)
+    first.add_words_bulk([Word(english=f"word{i}", thai="คำ") for i in range(10)])
+    second.suggest_words("word")
+    prefix_index, _ = second._get_prefix_indexes()
+    loads = []
+    monkeypatch.setattr(second._storage, "load", lambda: loads.append(1))
+
+    first.add_word(Word(english="wordx", thai="ใหม่"))
+    first.delete_word("word3")
+    first.update_word(Word(english="word4", thai="แก้"))
+    assert [word.english for word in second.suggest_words("word", 20)] == \
+        [f"word{i}" for i in range(10) if i != 3] + ["wordx"]
+    assert second.get_word("word4").thai == "แก้"
+    assert second.get_version() == first.get_version()
+    assert second._get_prefix_indexes()[0] is prefix_index
+    assert loads == []
+
+    first.delete_all_words()
+    assert second.get_all_words() == []
+    assert loads == []
+    first.close()
+    second.close()
+
+
+def test_changes_older_than_the_sqlite_log_reload_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(SqliteStorage, "CHANGE_LOG_ROWS", 3)
+    first = DictionaryService(storage=create_storage("sqlite", tmp_path), shared=True)
+    second = DictionaryService(storage=create_storage("sqlite", tmp_path), shared=True)
+    second.get_word("word0")
+
+    for i in range(10):
+        first.add_word(Word(english=f"word{i}", thai="คำ"))
+    assert second._storage.read_changes() is None
+    assert [word.english for word in second.suggest_words("word", 20)] == [f"word{i}" for i in range(10)]
+    assert second.get_version() == first.get_version()
+    first.close()
+    second.close()
+
+
+def hold_lock(path, locked, release):
+    with FileLock(path):
+        locked.set()
+        release.wait(10)
+
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    path = tmp_path / "dictionary.json.lock"
+    context = multiprocessing.get_context("fork")
+    locked, release = context.Event(), context.Event()
+    holder = context.Process(target=hold_lock, args=(path, locked, release))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        lock = FileLock(path)
+        assert not lock.acquire(blocking=False)
+        assert not lock.acquire(blocking=False, shared=True)
+        release.set()
+        holder.join(10)
+        assert lock.acquire(blocking=False)
+        lock.release()
+        lock.close()
+    finally:
+        release.set()
+        holder.join(10)
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.normalization import make_entry
+from services.storage import BinarySnapshotStorage, create_storage
+from services.snapshot import SnapshotReader, read_snapshot, write_snapshot
+
+
+def test_snapshot_round_trip(tmp_path, sample_words):
+    path = tmp_path / "dictionary.tdb"
+    write_snapshot(path, sample_words)
+
+    loaded = read_snapshot(path)
+    assert list(loaded) == list(sample_words)
+    assert loaded == {english: {"thai": e["thai"], "category": e["category"]} for english, e in sample_words.items()}
+    with SnapshotReader(path) as reader:
+        assert len(reader) == len(sample_words)
+        assert reader.get("hello world") == {"thai": "สวัสดีชาวโลก", "category": None}
+        assert reader.get("missing") is None
+
+
+def test_empty_snapshot_round_trip(tmp_path):
+    path = tmp_path / "dictionary.tdb"
+    write_snapshot(path, {})
+    assert read_snapshot(path) == {}
+
+
+def test_corrupt_snapshot_is_rejected(tmp_path, sample_words):
+    path = tmp_path / "dictionary.tdb"
+    write_snapshot(path, sample_words)
+    path.write_bytes(path.read_bytes()[:20])
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def test_snapshot_storage_replays_journal_and_compacts(tmp_path, put, sample_words):
+    path = tmp_path / "dictionary.tdb"
+    storage = BinarySnapshotStorage(path, compact_threshold=2)
+    words = storage.load()
+    words.update(sample_words)
+    storage.replace_all(words)
+    words["dog"] = make_entry("หมา", "สัตว์")
+    storage.write(None, [put("dog", "หมา", "สัตว์")])
+    storage.close()
+
+    storage = BinarySnapshotStorage(path, compact_threshold=2)
+    assert storage.load() == words
+    words.pop("cat")
+    storage.write(None, [{"op": "delete", "english": "cat"}])
+    assert storage.needs_compaction
+    storage.compact(words)
+    storage.close()
+    assert not path.with_suffix(".tdb.journal").exists()
+
+    storage = BinarySnapshotStorage(path)
+    assert storage.load() == words
+    storage.close()
+
+
+def test_json_dictionary_is_migrated_to_snapshot(tmp_path, sample_words):
+    (tmp_path / "dictionary.json").write_text(json.dumps({"format": 2, "words": sample_words}, ensure_ascii=False),
+                                             encoding="utf-8")
+    storage = create_storage("snapshot", tmp_path)
+    assert storage.load() == sample_words
+    storage.close()
+
+
+def test_service_on_snapshot_storage_reopens_with_every_change(tmp_path):
+    service = DictionaryService(storage=create_storage("snapshot", tmp_path))
+    service.add_words_bulk([Word(english=f"word{i}", thai="คำ") for i in range(10)])
+    service.update_word(Word(english="word2", thai="คำใหม่", category="noun"))
+    service.delete_word("word5")
+    service.close()
+
+    reopened = DictionaryService(storage=create_storage("snapshot", tmp_path))
+    assert [word.english for word in reopened.get_all_words()] == [f"word{i}" for i in range(10) if i != 5]
+    assert reopened.get_word("word2").thai == "คำใหม่"
+    assert reopened.get_word("word2").category == "noun"
+    reopened.close()
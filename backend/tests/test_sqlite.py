@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+from services.storage import create_storage
+from services.sqlite_views import SqliteWords
+
+WORDS = [
+    Word(english="cat", thai="แมว", category="animal"),
+    Word(english="catalog", thai="แคตตาล็อก", category="book"),
+    Word(english="dog", thai="หมา", category="animal"),
+    Word(english="Hello World", thai="สวัสดีชาวโลก"),
+    Word(english="scatter", thai="กระจาย"),
+    Word(english="mat", thai="เสื่อ", category="Animal"),
+]
+
+
+def records(words):
+    return [(word.english, word.thai, word.category) for word in words]
+
+
+@pytest.fixture
+def services(tmp_path):
+    """The same words in a JSON service and an SQLite service."""
+    json_service = DictionaryService(storage=create_storage("json", tmp_path / "json"))
+    sqlite_service = DictionaryService(storage=create_storage("sqlite", tmp_path / "sqlite"))
+    for service in (json_service, sqlite_service):
+        service.add_words_bulk(WORDS)
+        service.delete_word("dog")
+        service.update_word(Word(english="mat", thai="พรม", category="home"))
+    yield json_service, sqlite_service
+    json_service.close()
+    sqlite_service.close()
+
+
+def test_json_dictionary_is_migrated_to_sqlite(tmp_path, sample_words):
+    (tmp_path / "dictionary.json").write_text(json.dumps({"format": 2, "words": sample_words}, ensure_ascii=False),
+                                             encoding="utf-8")
+    storage = create_storage("sqlite", tmp_path)
+    assert dict(storage.load()) == sample_words
+    storage.close()
+
+
+def test_words_are_served_from_the_database(services):
+    json_service, sqlite_service = services
+    assert isinstance(sqlite_service.words, SqliteWords)
+    assert records(sqlite_service.get_all_words()) == records(json_service.get_all_words())
+    assert sqlite_service.get_word("CAT").thai == "แมว"
+    assert sqlite_service.get_word("dog") is None
+
+
+@pytest.mark.parametrize("term", ["", "a", "at", "cat", "แม", "สวัสดี", "animal", "xyz"])
+def test_search_and_suggest_match_the_in_memory_service(services, term):
+    json_service, sqlite_service = services
+    for method in ("search_words", "suggest_words"):
+        assert records(getattr(sqlite_service, method)(term)) == records(getattr(json_service, method)(term))
+    assert records(sqlite_service.search_ranked(term, 3)) == records(json_service.search_ranked(term, 3))
+
+
+def test_pages_categories_and_export_match_the_in_memory_service(services):
+    json_service, sqlite_service = services
+    for query in ({}, {"term": "at"}, {"category": "animal"}):
+        cursor = None
+        while True:
+            expected = json_service.query_words(limit=2, cursor=cursor, **query)
+            page = sqlite_service.query_words(limit=2, cursor=cursor, **query)
+            assert (records(page.items), page.total, page.next_cursor) == \
+                (records(expected.items), expected.total, expected.next_cursor)
+            cursor = expected.next_cursor
+            if cursor is None:
+                break
+    assert sqlite_service.get_categories() == json_service.get_categories()
+    assert records(sqlite_service.get_words_by_category("animal")) == \
+        records(json_service.get_words_by_category("animal"))
+    assert sqlite_service.export_chunk(None, 3) == json_service.export_chunk(None, 3)
+    for field in ("english", "thai", "category"):
+        assert records(sqlite_service.sort_words(field, "desc")) == records(json_service.sort_words(field, "desc"))
+
+
+def test_changes_survive_reopening(tmp_path):
+    service = DictionaryService(storage=create_storage("sqlite", tmp_path))
+    service.add_words_bulk(WORDS)
+    service.delete_word("cat")
+    service.delete_all_words()
+    service.add_word(Word(english="bird", thai="นก"))
+    service.close()
+
+    reopened = DictionaryService(storage=create_storage("sqlite", tmp_path))
+    assert records(reopened.get_all_words()) == [("bird", "นก", None)]
+    reopened.close()
+
+
+def test_sqlite_requires_sync_persistence(tmp_path):
+    with pytest.raises(ValueError):
+        DictionaryService(storage=create_storage("sqlite", tmp_path), persistence="debounced")
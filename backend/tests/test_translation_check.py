@@ -0,0 +1,34 @@
+from models.word import TranslationAnswer, Word
+from services.dictionary import DictionaryService
+
+
+def test_batch_grades_every_answer_and_scores_the_session(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_words_bulk([Word(english="busy", thai="วุ่นวาย"), Word(english="cat", thai="แมว")])
+    answers = [
+        TranslationAnswer(english_word="Busy", thai_translation="วุ่นวาย"),
+        TranslationAnswer(english_word="cat", thai_translation="หมา"),
+        TranslationAnswer(english_word="dog", thai_translation="หมา"),
+        # Missing tone mark and an extra space
+        TranslationAnswer(english_word="busy", thai_translation="วุนวา ย"),
+    ]
+
+    batch = service.check_translations(answers)
+    assert [result.is_correct for result in batch.results] == [True, False, False, False]
+    assert (batch.correct, batch.total, batch.score) == (1, 4, 25.0)
+    assert batch.results[1].message == service.check_translation("cat", "หมา")[1]
+
+    lenient = service.check_translations(answers, lenient=True)
+    assert [result.is_correct for result in lenient.results] == [True, False, False, True]
+    assert service.check_translations([]).score == 0
+    service.close()
+
+
+def test_batch_route(client):
+    client.post("/api/v1/words/", json={"english": "cat", "thai": "แมว"})
+    response = client.post("/api/v1/check-translation/batch", json={"answers": [
+        {"english_word": "cat", "thai_translation": "แมว"}, {"english_word": "cat", "thai_translation": "หมา"}
+    ]})
+    assert response.json()["score"] == 50.0
+    too_many = [{"english_word": "cat", "thai_translation": "แมว"}] * 1001
+    assert client.post("/api/v1/check-translation/batch", json={"answers": too_many}).status_code == 422
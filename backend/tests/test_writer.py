@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from models.word import Word
+from services.dictionary import DictionaryService
+
+
+def stored_words(path):
+    """Words another service finds on disk."""
+    service = DictionaryService(path)
+    words = [word.english for word in service.get_all_words()]
+    service.close()
+    return words
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Count the writes that reach storage."""
+    def count(service):
+        calls = []
+        write = service._storage.write
+
+        def counted(*args):
+            write(*args)
+            calls.append(args)
+        monkeypatch.setattr(service._storage, "write", counted)
+        return calls
+    return count
+
+
+def test_waiting_mutations_are_persisted_with_one_write(tmp_path, writes):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.add_word(Word(english="cat", thai="แมว"))
+    service.start_writer()
+    calls = writes(service)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(10)
+    first = service._writer.submit(block)
+    assert started.wait(10)
+    futures = [service._writer.submit(service.add_word, Word(english=f"word{i}", thai="คำ")) for i in range(5)]
+    duplicate = service._writer.submit(service.add_word, Word(english="cat", thai="แมว"))
+    release.set()
+
+    first.result(10)
+    assert [future.result(10) for future in futures] == [None] * 5
+    with pytest.raises(ValueError):
+        duplicate.result(10)
+    assert len(calls) == 1
+    service.close()
+    assert stored_words(tmp_path / "dictionary.json") == ["cat"] + [f"word{i}" for i in range(5)]
+
+
+def test_concurrent_requests_write_through_the_writer_thread(tmp_path):
+    service = DictionaryService(tmp_path / "dictionary.json")
+    service.start_writer()
+
+    async def add_all():
+        await asyncio.gather(*(
+            service.write_async(service.add_word, Word(english=f"word{i}", thai="คำ")) for i in range(20)
+        ))
+        return await service.read_async(service.get_all_words)
+    assert len(asyncio.run(add_all())) == 20
+    service.close()
+    assert len(stored_words(tmp_path / "dictionary.json")) == 20
+
+
+def wait_for(calls, count):
+    deadline = time.monotonic() + 10
+    while len(calls) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_debounced_persistence_flushes_after_the_interval(tmp_path, writes):
+    path = tmp_path / "dictionary.json"
+    service = DictionaryService(path, persistence="debounced", flush_interval_ms=100, flush_max_dirty=100)
+    calls = writes(service)
+
+    service.add_word(Word(english="cat", thai="แมว"))
+    service.add_word(Word(english="dog", thai="หมา"))
+    assert calls == []
+    wait_for(calls, 1)
+    assert len(calls) == 1
+    assert stored_words(path) == ["cat", "dog"]
+    service.close()
+
+
+def test_debounced_persistence_flushes_once_enough_changes_are_pending(tmp_path, writes):
+    path = tmp_path / "dictionary.json"
+    service = DictionaryService(path, persistence="debounced", flush_interval_ms=60000, flush_max_dirty=3)
+    calls = writes(service)
+
+    service.add_word(Word(english="cat", thai="แมว"))
+    service.add_word(Word(english="dog", thai="หมา"))
+    time.sleep(0.1)
+    assert calls == []
+    service.add_word(Word(english="fish", thai="ปลา"))
+    wait_for(calls, 1)
+    assert stored_words(path) == ["cat", "dog", "fish"]
+    service.close()
+
+
+def test_on_shutdown_persistence_writes_only_when_closed(tmp_path, writes):
+    path = tmp_path / "dictionary.json"
+    service = DictionaryService(path, persistence="on-shutdown")
+    calls = writes(service)
+    for i in range(3):
+        service.add_word(Word(english=f"word{i}", thai="คำ"))
+    service.delete_word("word1")
+    # Reads see the changes before they are written
+    assert [word.english for word in service.search_words("word")] == ["word0", "word2"]
+    assert calls == []
+
+    service.close()
+    assert len(calls) == 1
+    assert stored_words(path) == ["word0", "word2"]